@@ -16,6 +16,14 @@
  *  - Team 2 LED: GPIO19 (D19) -> LED+ -> 220R -> GND
  *
  * Serial: 9600 baud, sends: READY, WINNER:1, WINNER:2, TIMING:T1:123
+ * Binary framed protocol after the server sends "PROTO:BIN1":
+ *   0xA5 | type | seq | len | payload[len] | CRC-8 (poly 0x07 over type..payload)
+ *   READY 0x01, WINNER 0x02 (team), TIMING 0x03 (winner 1|2, uint32 micros LE)
+ *   Lost frames are resent on "RETX:<seq>"
+ * Baud negotiation: "BAUD:<rate>" is acknowledged and applied; unless "PING"
+ * arrives at the new rate within 1 s the board falls back to the old rate.
+ * "PING" is answered with an ASCII "PONG" in either protocol and returns the
+ * board to ASCII, so a server reconnecting without a reboot can resync.
  */
 
 const int BUTTON_1 = 13;     // Team 1 button (D13)
@@ -43,8 +51,24 @@ unsigned long resetButtonFirstPress = 0;
 const unsigned long DEBOUNCE_MICROS = 30000;    // 30ms debounce (faster)
 const unsigned long RESET_HOLD_MICROS = 300000; // 300ms for reset (faster)
 
+// Binary framed protocol state
+const uint8_t FRAME_START  = 0xA5;
+const uint8_t FRAME_READY  = 0x01;
+const uint8_t FRAME_WINNER = 0x02;
+const uint8_t FRAME_TIMING = 0x03;
+const int     FRAME_HISTORY = 8;   // frames kept for RETX:<seq>
+struct SentFrame { uint8_t len; uint8_t data[21]; };
+SentFrame sentFrames[FRAME_HISTORY];
+bool    binaryProto = false;
+uint8_t txSeq = 0;
+
+// Baud negotiation state
+unsigned long baudRate = 9600;
+unsigned long fallbackBaud = 0;
+unsigned long baudConfirmBy = 0;
+
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(baudRate);
   delay(1000);  // Reduced startup delay
   
   // Configure pins
@@ -58,20 +82,80 @@ void setup() {
   digitalWrite(LED_1, LOW);
   digitalWrite(LED_2, LOW);
   
-  // Send ready immediately - atomic message
+  // Send ready immediately - atomic message (always ASCII: a fresh boot is never in binary mode)
   Serial.println("READY");
   Serial.flush(); // Ensure message is sent immediately
 }
 
+uint8_t crc8(const uint8_t* data, uint8_t len) {
+  uint8_t crc = 0;
+  while (len--) {
+    crc ^= *data++;
+    for (int b = 0; b < 8; b++) crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t type, const uint8_t* payload, uint8_t len) {
+  SentFrame &f = sentFrames[txSeq % FRAME_HISTORY];
+  f.data[0] = FRAME_START;
+  f.data[1] = type;
+  f.data[2] = txSeq;
+  f.data[3] = len;
+  for (int i = 0; i < len; i++) f.data[4 + i] = payload[i];
+  f.data[4 + len] = crc8(f.data + 1, 3 + len);
+  f.len = 5 + len;
+  Serial.write(f.data, f.len);  // whole frame in one write - atomic
+  Serial.flush();
+  txSeq++;
+}
+
+void resendFrame(uint8_t seq) {
+  SentFrame &f = sentFrames[seq % FRAME_HISTORY];
+  if (f.len && f.data[2] == seq) {
+    Serial.write(f.data, f.len);
+    Serial.flush();
+  }
+}
+
 void loop() {
-  // Fast serial check
+  // Unconfirmed baud switch - go back to the previous rate
+  if (baudConfirmBy && (long)(millis() - baudConfirmBy) >= 0) {
+    baudRate = fallbackBaud;
+    Serial.updateBaudRate(baudRate);
+    baudConfirmBy = 0;
+  }
+  
+  // Fast serial check - one command per line
   if (Serial.available()) {
-    String cmd = Serial.readString();
+    String cmd = Serial.readStringUntil('\n');
     cmd.trim();
     if (cmd == "RESET") {
       fastReset();
       return; // Exit loop immediately after reset
     }
+    if (cmd == "PING") {
+      Serial.println("PONG");
+      Serial.flush();
+      baudConfirmBy = 0;  // New rate confirmed
+      binaryProto = false;  // Only sent while (re)connecting, which always starts in ASCII
+    } else if (cmd.startsWith("BAUD:")) {
+      unsigned long rate = cmd.substring(5).toInt();
+      if (rate == 115200 || rate == 230400 || rate == 460800 || rate == 921600) {
+        Serial.println("BAUD:" + String(rate));
+        Serial.flush();  // Acknowledge at the old rate before switching
+        fallbackBaud = baudRate;
+        baudRate = rate;
+        Serial.updateBaudRate(rate);
+        baudConfirmBy = millis() + 1000;
+      }
+    } else if (cmd == "PROTO:BIN1") {
+      Serial.println("PROTO:BIN1");  // acknowledge in ASCII, then switch
+      Serial.flush();
+      binaryProto = true;
+    } else if (cmd.startsWith("RETX:")) {
+      resendFrame((uint8_t)cmd.substring(5).toInt());
+    }
   }
   
   // Fast reset button check
@@ -165,18 +249,21 @@ void fastDetermineWinner(unsigned long currentMicros) {
   
   int winningTeam = 0;
   String timingMsg = "";
+  unsigned long timingMicros = 0;
   
   // Fast winner determination with atomic timing messages
   if (button1FirstPress > 0 && button2FirstPress > 0) {
     // Both pressed - check timing
     if (button1FirstPress <= button2FirstPress) {
       winningTeam = 1;
+      timingMicros = button2FirstPress - button1FirstPress;
       // Create atomic timing message
-      timingMsg = "TIMING:T1:" + String(button2FirstPress - button1FirstPress);
+      timingMsg = "TIMING:T1:" + String(timingMicros);
     } else {
       winningTeam = 2;
+      timingMicros = button1FirstPress - button2FirstPress;
       // Create atomic timing message  
-      timingMsg = "TIMING:T2:" + String(button1FirstPress - button2FirstPress);
+      timingMsg = "TIMING:T2:" + String(timingMicros);
     }
   } else if (button1FirstPress > 0) {
     winningTeam = 1;
@@ -185,11 +272,11 @@ void fastDetermineWinner(unsigned long currentMicros) {
   }
   
   if (winningTeam > 0) {
-    fastTeamWins(winningTeam, timingMsg);
+    fastTeamWins(winningTeam, timingMsg, timingMicros);
   }
 }
 
-void fastTeamWins(int team, String timingMessage) {
+void fastTeamWins(int team, String timingMessage, unsigned long timingMicros) {
   winner = team;
   
   // Immediate LED update
@@ -201,6 +288,18 @@ void fastTeamWins(int team, String timingMessage) {
     digitalWrite(LED_2, HIGH);
   }
   
+  if (binaryProto) {
+    if (timingMessage.length() > 0) {
+      uint8_t timing[5] = {(uint8_t)team,
+                           (uint8_t)(timingMicros), (uint8_t)(timingMicros >> 8),
+                           (uint8_t)(timingMicros >> 16), (uint8_t)(timingMicros >> 24)};
+      sendFrame(FRAME_TIMING, timing, 5);
+    }
+    uint8_t winnerTeam = team;
+    sendFrame(FRAME_WINNER, &winnerTeam, 1);
+    return;
+  }
+  
   // Send timing message first (if we have one) - atomic
   if (timingMessage.length() > 0) {
     Serial.println(timingMessage);
@@ -233,6 +332,10 @@ void fastReset() {
   digitalWrite(LED_2, LOW);
   
   // Send ready immediately - atomic message
+  if (binaryProto) {
+    sendFrame(FRAME_READY, NULL, 0);
+    return;
+  }
   Serial.println("READY");
   Serial.flush(); // Ensure message is sent immediately
 }
\ No newline at end of file
@@ -28,8 +28,26 @@ unsigned long firstPress[6] = {0},
 int   soundTeam        = 0;
 bool  soundOn          = false;
 
+// Binary framed protocol (enabled when the server sends "PROTO:BIN1")
+// Frame: 0xA5 | type | seq | len | payload[len] | CRC-8 (poly 0x07 over type..payload)
+const uint8_t FRAME_START  = 0xA5;
+const uint8_t FRAME_READY  = 0x01;
+const uint8_t FRAME_WINNER = 0x02;
+const int     FRAME_HISTORY = 8;   // frames kept for RETX:<seq>
+struct SentFrame { uint8_t len; uint8_t data[21]; };
+SentFrame sentFrames[FRAME_HISTORY];
+bool    binaryProto = false;
+uint8_t txSeq       = 0;
+
+// Baud negotiation: BAUD:<rate> switches, PING at the new rate confirms,
+// otherwise fall back to the previous rate after 1 s. PING gets an ASCII PONG
+// in either protocol and returns to ASCII (a server reconnecting without a reboot)
+unsigned long baudRate          = 9600,
+              fallbackBaud      = 0,
+              baudConfirmBy     = 0;
+
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(baudRate);
   delay(200);
 
   // buzz-in buttons
@@ -50,11 +68,82 @@ void setup() {
   Serial.println("READY");
 }
 
+uint8_t crc8(const uint8_t* data, uint8_t len){
+  uint8_t crc = 0;
+  while(len--){
+    crc ^= *data++;
+    for(int b=0;b<8;b++) crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t type, const uint8_t* payload, uint8_t len){
+  SentFrame &f = sentFrames[txSeq % FRAME_HISTORY];
+  f.data[0] = FRAME_START;
+  f.data[1] = type;
+  f.data[2] = txSeq;
+  f.data[3] = len;
+  for(int i=0;i<len;i++) f.data[4+i] = payload[i];
+  f.data[4+len] = crc8(f.data+1, 3+len);
+  f.len = 5+len;
+  Serial.write(f.data, f.len);
+  txSeq++;
+}
+
+void resendFrame(uint8_t seq){
+  SentFrame &f = sentFrames[seq % FRAME_HISTORY];
+  if(f.len && f.data[2]==seq) Serial.write(f.data, f.len);
+}
+
+void sendReady(){
+  if(binaryProto) sendFrame(FRAME_READY, NULL, 0);
+  else Serial.println("READY");
+}
+
+void sendWinner(int team){
+  if(binaryProto){ uint8_t t = team; sendFrame(FRAME_WINNER, &t, 1); }
+  else Serial.println("WINNER:" + String(team));
+}
+
+// Returns true when the command reset the game
+bool handleCommand(String cmd){
+  cmd.trim();
+  if(cmd=="RESET") return true;
+  if(cmd=="PING"){
+    Serial.println("PONG");
+    baudConfirmBy = 0;             // new rate confirmed
+    binaryProto   = false;         // only sent while (re)connecting, which starts in ASCII
+  } else if(cmd.startsWith("BAUD:")){
+    unsigned long rate = cmd.substring(5).toInt();
+    if(rate==115200 || rate==230400 || rate==460800 || rate==921600){
+      Serial.println("BAUD:" + String(rate));
+      Serial.flush();
+      fallbackBaud  = baudRate;
+      baudRate      = rate;
+      Serial.updateBaudRate(rate);
+      baudConfirmBy = millis() + 1000;
+    }
+  } else if(cmd=="PROTO:BIN1"){
+    Serial.println("PROTO:BIN1");  // acknowledge in ASCII, then switch
+    binaryProto = true;
+  } else if(cmd.startsWith("RETX:")){
+    resendFrame((uint8_t)cmd.substring(5).toInt());
+  }
+  return false;
+}
+
 void loop(){
   unsigned long now = micros();
 
-  // 1) Serial RESET?
-  if(Serial.available() && Serial.readStringUntil('\n')=="RESET"){
+  // 0) Unconfirmed baud switch? Go back to the previous rate
+  if(baudConfirmBy && (long)(millis() - baudConfirmBy) >= 0){
+    baudRate      = fallbackBaud;
+    Serial.updateBaudRate(baudRate);
+    baudConfirmBy = 0;
+  }
+
+  // 1) Serial command (RESET, BAUD:<rate>, PING, PROTO:BIN1, RETX:<seq>)?
+  if(Serial.available() && handleCommand(Serial.readStringUntil('\n'))){
     fastReset(); return;
   }
 
@@ -121,7 +210,7 @@ void fastWin(unsigned long now){
   soundTeam  = tm;
   soundOn    = true;
 
-  Serial.println("WINNER:" + String(tm));
+  sendWinner(tm);
 }
 
 void fastReset(){
@@ -134,5 +223,5 @@ void fastReset(){
     noTone(SOUND_PIN[i]);             // ensure no tone
   }
   soundOn = false;
-  Serial.println("READY");
+  sendReady();
 }
\ No newline at end of file
@@ -5,15 +5,83 @@ Supports both HTTP (localhost) and HTTPS (secure) modes with real Arduino commun
 """
 
 import os
+import sys
+
+# Socket.IO async modes:
+#   threading - Werkzeug dev server, one OS thread per client (default)
+#   eventlet  - green threads on eventlet's WSGI server
+#   gevent    - green threads on gevent's WSGI server
+# eventlet and gevent must monkey-patch threading, socket and select before anything
+# else imports them, so the mode is chosen here rather than in main()
+ASYNC_MODES = ('threading', 'eventlet', 'gevent')
+ASYNC_MODE_ENV = 'QUIZ_ASYNC_MODE'
+
+# Server runners:
+#   dev        - whatever --async-mode selects (Werkzeug by default)
+#   production - a concurrent keep-alive WSGI server (gevent, else eventlet)
+SERVE_MODES = ('dev', 'production')
+PRODUCTION_ASYNC_MODES = ('gevent', 'eventlet')
+
+def _option_value(argv, option):
+    """Value of --option X / --option=X in argv, or None"""
+    value = None
+    for index, arg in enumerate(argv):
+        if arg == option and index + 1 < len(argv):
+            value = argv[index + 1]
+        elif arg.startswith(option + '='):
+            value = arg.split('=', 1)[1]
+    return value
+
+def _requested_async_modes(argv):
+    """Async modes to try, in order: --async-mode, else $QUIZ_ASYNC_MODE, else by --serve"""
+    mode = _option_value(argv, '--async-mode') or os.environ.get(ASYNC_MODE_ENV)
+    if mode in ASYNC_MODES:
+        return (mode,)
+    if _option_value(argv, '--serve') == 'production':
+        return PRODUCTION_ASYNC_MODES
+    return ('threading',)  # argparse reports bad values later
+
+def _activate_async_mode(candidates):
+    for mode in candidates:
+        try:
+            if mode == 'eventlet':
+                import eventlet
+                eventlet.monkey_patch()
+            elif mode == 'gevent':
+                from gevent import monkey
+                monkey.patch_all()
+            return mode
+        except ImportError:
+            print(f"⚠️  {mode} not installed. Install with: pip install {mode}")
+    print("   Falling back to threading async mode.")
+    return 'threading'
+
+# Only the server's own command line counts; scripts importing this module use the env var
+ASYNC_MODE = _activate_async_mode(_requested_async_modes(sys.argv[1:] if __name__ == '__main__' else []))
+# Worker processes (--worker-of, see become_worker) keep no game state: they start none of
+# the state store, timer and clock threads
+WORKER_PROCESS = __name__ == '__main__' and _option_value(sys.argv[1:], '--worker-of') is not None
+
 import time
 import threading
 import ssl
 import argparse
+import json
 import queue
-from flask import Flask, render_template_string, request, jsonify
-from flask_socketio import SocketIO, emit
+import copy
+import math
+import datetime
+import heapq
+from concurrent.futures import Future
+import socket
+import tempfile
+import subprocess
+from collections import deque, namedtuple
+from flask import Flask, render_template_string, request, jsonify, has_request_context
+from flask_socketio import SocketIO, emit, join_room
+from socketio import PubSubManager, RedisManager, KombuManager
 import logging
-import re # Added for partial message reconstruction
+import re # Used to recover WINNER messages from corrupted lines
 
 # Try to import serial for Arduino communication
 try:
@@ -31,39 +99,794 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='.', static_url_path='')
 app.config['SECRET_KEY'] = 'buzzer-dev-key'
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Under eventlet/gevent the serial, timer and supervisor threads below are green threads:
+# the monkey-patched select() lets the event-mode serial reader yield while it waits
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE)
+
+# Socket.IO transport policies, advertised to the pages as window.SOCKET_CONFIG:
+#   polling            - classic start on HTTP long-polling, then upgrade to WebSocket
+#   websocket-fallback - connect straight over WebSocket; retry with polling if that fails
+#   websocket-only     - WebSocket or nothing; the server refuses polling requests
+TRANSPORT_POLICIES = {
+    'polling':            {'transports': ['polling', 'websocket'], 'fallback': None, 'server': ['polling', 'websocket']},
+    'websocket-fallback': {'transports': ['websocket'], 'fallback': ['polling', 'websocket'], 'server': ['polling', 'websocket']},
+    'websocket-only':     {'transports': ['websocket'], 'fallback': None, 'server': ['websocket']},
+}
+transport_policy = 'websocket-fallback'
+
+def set_transport_policy(policy):
+    global transport_policy
+    transport_policy = policy
+    socketio.server.eio.transports = TRANSPORT_POLICIES[policy]['server']
+
+# Matches. One server hosts any number of independent matches (tournament rooms), each
+# with its own state, state store thread, log, timer and optional Arduino. A socket picks
+# its match on connect (Socket.IO auth {match}; pages pass ?match=...) and only ever sees
+# that match's events. Clients that name no match play in the default one.
+DEFAULT_MATCH = 'main'
+MATCH_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+MAX_MATCHES = 16
+UNKNOWN_MATCH_MESSAGE = f'Unknown match (ids are letters, digits, - and _; at most {MAX_MATCHES} matches)'
+
+# Client roles. Each socket joins the room of the role it declares on connect (Socket.IO
+# auth {role}; pages default to their own role, ?role=... overrides) and events are only
+# sent to the roles that consume them.
+ROLES = ('display', 'console', 'spectator', 'scoreboard')
+DEFAULT_ROLE = 'display'
+CONSOLE_ONLY_EVENTS = frozenset({'log', 'log_update', 'serial_ports', 'ports_refreshed'})
+SCOREBOARD_EVENTS = frozenset({'score_update', 'team_update', 'timer_update', 'timer_ended',
+                               'countdown_update', 'countdown_ended', 'countdown_cleared',
+                               'game_state_reset', 'game_state_update'})
+SPECTATOR_EVENTS = SCOREBOARD_EVENTS | {'buzzer_pressed', 'clear_buzzers', 'card_update', 'devil_attack',
+                                        'challenge_update', 'question_set_update', 'progress_update',
+                                        'character_update'}
+ROLE_EVENTS = {
+    'display': None,  # Everything but console-only chatter (it has the Arduino controls and hotkey relays)
+    'console': None,
+    'spectator': SPECTATOR_EVENTS,
+    'scoreboard': SCOREBOARD_EVENTS,
+}
+
+def role_room(role, match_id=DEFAULT_MATCH):
+    return f'match:{match_id}/role:{role}'
+
+def event_rooms(event, match_id=DEFAULT_MATCH):
+    """Role rooms of match_id that consume event"""
+    rooms = EVENT_ROOMS.get((event, match_id))
+    if rooms is None:
+        rooms = EVENT_ROOMS[event, match_id] = tuple(
+            role_room(role, match_id) for role, events in ROLE_EVENTS.items()
+            if (role == 'console' if event in CONSOLE_ONLY_EVENTS else events is None or event in events))
+    return rooms
+
+EVENT_ROOMS = {}
+
+def route(event, kwargs, match_id=DEFAULT_MATCH):
+    """Address an emit to the role rooms of event unless it already names its recipients"""
+    if 'to' in kwargs or 'room' in kwargs:
+        return kwargs
+    return dict(kwargs, to=event_rooms(event, match_id))
+
+def broadcast(event, *args, **kwargs):
+    """socketio.emit() to the clients of the current match whose role consumes event"""
+    current_match().broadcast(event, *args, **kwargs)
+
+# Read-only spectator feed over Server-Sent Events (/spectate/events) for phones and
+# other screens that only watch. Each spectator event is serialized once into a shared
+# ring buffer and every response streams from it in its own thread/greenlet, so the
+# buzz path pays one append per event no matter how many spectators are connected.
+# Frames are published after the Socket.IO emits, so consoles and displays go first.
+SPECTATOR_BUFFER_SIZE = 512
+SPECTATOR_KEEPALIVE = 15.0  # Seconds between comment lines on a quiet feed (keeps proxies from timing out)
+SPECTATOR_SNAPSHOT_TIMEOUT = 2.0  # Worker mode: how long a joining spectator waits for the owner's snapshot
+SPECTATOR_WAKE_DELAY = 0.01  # Streams wake this long after a publish, once the players' frames are out
+
+class SpectatorWaker:
+    """Wakes the streams of published feeds a moment later, from its own thread
+    
+    Notifying hundreds of SSE streams from the dispatcher has them all compete with the
+    sends to consoles and displays for the same command. Spectators only watch, so they
+    wait SPECTATOR_WAKE_DELAY; publishes within it share one wake-up.
+    """
+    
+    def __init__(self):
+        self.feeds = set()
+        self.condition = threading.Condition()
+        self.thread = None
+    
+    def add(self, feed):
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='spectator-waker', daemon=True)
+                self.thread.start()
+            self.feeds.add(feed)
+            self.condition.notify()
+    
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.feeds)
+            time.sleep(SPECTATOR_WAKE_DELAY)
+            with self.condition:
+                feeds, self.feeds = self.feeds, set()
+            for feed in feeds:
+                with feed.condition:
+                    feed.condition.notify_all()
+
+spectator_waker = SpectatorWaker()
+
+class SpectatorFeed:
+    """Pre-serialized broadcast buffer of SSE frames with resumable ids (one per match)"""
+    
+    def __init__(self, match, size=SPECTATOR_BUFFER_SIZE):
+        self.match = match
+        self.frames = deque(maxlen=size)  # (id, frame bytes)
+        self.last_id = 0
+        self.condition = threading.Condition()
+        self.snapshot = (None, -1, b'')  # (state version, last frame id, frame) - shared by spectators joining at once
+        self.requested = (-1, 0.0)  # Worker mode: (last frame id, time) of the pending snapshot request
+        self.stats = {'published': 0, 'clients': 0, 'peak_clients': 0, 'resyncs': 0}
+    
+    def wants(self, event, kwargs):
+        """Whether a broadcast goes to spectators"""
+        return event in SPECTATOR_EVENTS and 'to' not in kwargs and 'room' not in kwargs
+    
+    def publish(self, events):
+        """Append [(event, data), ...] and wake the streams once (runs on the store's dispatcher)"""
+        payloads = [(event, json.dumps(data)) for event, data in events]
+        with self.condition:
+            new_frames = []
+            for event, payload in payloads:
+                self.last_id += 1
+                new_frames.append((self.last_id, f"id: {self.last_id}\nevent: {event}\ndata: {payload}\n\n".encode()))
+            self.frames.extend(new_frames)
+            self.stats['published'] += len(payloads)
+        spectator_waker.add(self)
+        if process_role == 'owner' and new_frames:
+            # Worker processes serve spectators too; they get the same frames (and ids) through the queue
+            queue_publish({'method': 'spectator', 'match': self.match.id,
+                           'frames': [(frame_id, frame.decode()) for frame_id, frame in new_frames]})
+    
+    def ingest(self, message):
+        """Worker mode: take frames published by the owner"""
+        with self.condition:
+            for frame_id, frame in message['frames']:
+                if frame_id <= self.last_id:
+                    continue  # Already covered by a snapshot
+                if frame_id != self.last_id + 1:
+                    self.frames.clear()  # Started (or resynced) mid-stream: keep the buffer contiguous
+                self.frames.append((frame_id, frame.encode()))
+                self.last_id = frame_id
+            self.stats['published'] += len(message['frames'])
+        spectator_waker.add(self)
+    
+    def ingest_snapshot(self, message):
+        """Worker mode: take a snapshot the owner built on request"""
+        with self.condition:
+            if message['last_id'] > self.last_id:
+                self.frames.clear()
+                self.last_id = message['last_id']
+            if message['last_id'] >= self.snapshot[1]:
+                self.snapshot = (None, message['last_id'], message['snapshot'].encode())
+            self.condition.notify_all()
+    
+    def send_snapshot(self):
+        """Owner mode: answer a worker's snapshot request"""
+        frame = self.snapshot_frame()
+        queue_publish({'method': 'spectator_snapshot', 'match': self.match.id,
+                       'last_id': self.snapshot[1], 'snapshot': frame.decode()})
+    
+    def snapshot_frame(self):
+        """The snapshot for a joining or resyncing spectator - built on the reader's thread, never on publish"""
+        if process_role == 'worker':
+            return self.owner_snapshot()  # The state lives in the owner process
+        version, _, frame = self.snapshot
+        if version != self.match.store.version:
+            version, last_id, state = self.match.store.call(spectator_snapshot)
+            frame = f"event: snapshot\ndata: {json.dumps(state)}\n\n".encode()
+            self.snapshot = (version, last_id, frame)
+        return frame
+    
+    def owner_snapshot(self):
+        """Worker mode: the cached snapshot if no frames came since, else ask the owner for a new one"""
+        with self.condition:
+            wanted = self.last_id
+            if self.snapshot[2] and self.snapshot[1] >= wanted:
+                return self.snapshot[2]
+            ask = self.requested[0] < wanted or time.monotonic() - self.requested[1] > SPECTATOR_SNAPSHOT_TIMEOUT
+            if ask:
+                self.requested = (wanted, time.monotonic())  # Spectators joining at once share one request
+        if ask:
+            queue_publish({'method': 'spectator_resync', 'match': self.match.id})
+        with self.condition:
+            self.condition.wait_for(lambda: self.snapshot[1] >= wanted, SPECTATOR_SNAPSHOT_TIMEOUT)
+            return self.snapshot[2]
+    
+    def stream(self, last_event_id=None):
+        """Generator for one SSE response: a snapshot (unless resuming), then live frames"""
+        with self.condition:
+            self.stats['clients'] += 1
+            self.stats['peak_clients'] = max(self.stats['peak_clients'], self.stats['clients'])
+            oldest = self.frames[0][0] if self.frames else self.last_id + 1
+            resume = last_event_id is not None and oldest - 1 <= last_event_id <= self.last_id
+            position = last_event_id if resume else self.last_id
+        try:
+            retry = b'retry: 2000\n\n'  # Reconnect delay for EventSource
+            clock = f"event: clock\ndata: {json.dumps({'serverTime': server_time_ms()})}\n\n".encode()  # For the countdown
+            yield retry + clock if resume else retry + clock + self.snapshot_frame()
+            while True:
+                with self.condition:
+                    if position == self.last_id:
+                        self.condition.wait(SPECTATOR_KEEPALIVE)
+                    missed = self.last_id - position
+                    if missed > len(self.frames):
+                        self.stats['resyncs'] += 1  # Too slow: the frames it needs were overwritten
+                        pending = None
+                    else:
+                        pending = [self.frames[index][1] for index in range(-missed, 0)]
+                    position = self.last_id
+                if pending is None:
+                    yield self.snapshot_frame()
+                else:
+                    yield b''.join(pending) if pending else b': keepalive\n\n'
+        finally:
+            with self.condition:
+                self.stats['clients'] -= 1
+
+def render_page(filename, role):
+    """Read an HTML page and inject the Socket.IO client config ahead of the page scripts"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        html = f.read()
+    settings = TRANSPORT_POLICIES[transport_policy]
+    config = json.dumps({'policy': transport_policy, 'transports': settings['transports'],
+                         'fallbackTransports': settings['fallback'], 'role': role})
+    return html.replace('</head>', f'<script>window.SOCKET_CONFIG = {config};</script>\n</head>', 1)
+
+# Serial read modes:
+#   event - block in the serial driver until bytes arrive (select() on POSIX, overlapped I/O on Windows)
+#   poll  - legacy loop that checks in_waiting every 10 ms
+SERIAL_READ_MODES = ('event', 'poll')
+EVENT_READ_TIMEOUT = 0.5  # Max time a blocked read waits before re-checking the stop flag
+POLL_INTERVAL = 0.01
+MAX_LINE_BUFFER = 4096  # Bytes of unterminated data kept before it is treated as garbage
+
+class LineFramer:
+    """Split a raw serial byte stream into complete text lines.
+
+    The unterminated tail of the stream is kept as bytes and only decoded once its
+    newline arrives, so partial frames (and split UTF-8 characters) are never decoded.
+    Everything up to the last newline of a read is found with one rpartition() and
+    decoded in one pass. A read that is exactly one line with nothing pending - what
+    the event reader gets from a board sending a line at a time - is decoded directly.
+    Unterminated data beyond max_buffer is discarded so a noisy line cannot grow the
+    tail without limit (which also bounds the copy when a read is appended to it).
+    """
+    
+    def __init__(self, max_buffer=MAX_LINE_BUFFER):
+        self.pending = b''
+        self.max_buffer = max_buffer
+        self.dropped_bytes = 0
+    
+    def feed(self, data):
+        """Append raw bytes and return the complete, stripped, non-empty lines they finish"""
+        pending = self.pending
+        if 0x0a not in data:  # An int needle: much cheaper than b'\n' in data
+            pending += data
+            if len(pending) > self.max_buffer:
+                pending = self._discard(pending)
+            self.pending = pending
+            return []
+        if pending:
+            data = pending + data
+        elif data[-1] == 0x0a:
+            line = data.decode('utf-8', 'ignore').strip()
+            if '\n' not in line:
+                return [line] if line else []
+        
+        text, _, pending = data.rpartition(b'\n')
+        if len(pending) > self.max_buffer:
+            pending = self._discard(pending)
+        self.pending = pending
+        
+        text = text.decode('utf-8', 'ignore')
+        if '\n' not in text:
+            text = text.strip()
+            return [text] if text else []
+        lines = []
+        for line in text.split('\n'):
+            line = line.strip()
+            if line:
+                lines.append(line)
+        return lines
+    
+    def _discard(self, pending):
+        self.dropped_bytes += len(pending)
+        logger.warning(f"Discarding {len(pending)} bytes of unterminated serial data")
+        return b''
+
+# Typed Arduino messages produced by parse_arduino_message()
+WinnerMessage = namedtuple('WinnerMessage', ['raw', 'team'])
+TimingMessage = namedtuple('TimingMessage', ['raw', 'winner_tag', 'micros'])
+ReadyMessage = namedtuple('ReadyMessage', ['raw'])
+ResetMessage = namedtuple('ResetMessage', ['raw'])
+UnknownMessage = namedtuple('UnknownMessage', ['raw'])  # Well-formed but not a known type
+CorruptMessage = namedtuple('CorruptMessage', ['raw', 'reason'])  # Rejected; never handled
+
+MAX_MESSAGE_LENGTH = 50
+_READY = ReadyMessage('READY')
+# Every valid READY/RESET/WINNER line is known in advance, so those resolve with one dict lookup
+_EXACT_MESSAGES = {'READY': _READY, 'RESET': ResetMessage('RESET')}
+_EXACT_MESSAGES.update({f'WINNER:{team}': WinnerMessage(f'WINNER:{team}', team) for team in range(1, 7)})
+_TIMING_TAGS = ('T1', 'T2')
+_RECOVER_WINNER = re.compile(r'WINNER:([1-6])')
+_NON_PRINTABLE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _parse_winner(line, payload):
+    # The usual spellings were already matched by _EXACT_MESSAGES; this takes the rest int() accepts (WINNER:03, WINNER:+3)
+    try:
+        team = int(payload)
+    except ValueError:
+        return CorruptMessage(line, 'invalid WINNER team')
+    if 1 <= team <= 6:
+        return WinnerMessage(line, team)
+    return CorruptMessage(line, 'invalid WINNER team')
+
+def _parse_timing(line, payload):
+    # Format: TIMING:T1:123 or TIMING:T2:456
+    tag, sep, micros = payload.partition(':')
+    if not sep or tag not in _TIMING_TAGS or not micros.isdigit():
+        return CorruptMessage(line, 'invalid TIMING payload')
+    return TimingMessage(line, tag, int(micros))
+
+_PAYLOAD_PARSERS = {'WINNER': _parse_winner, 'TIMING': _parse_timing}
+
+def _parse_unrecognized(line):
+    """Classify a line that is not an exact known message, recovering partial frames where possible"""
+    if not line:
+        return CorruptMessage(line, 'empty')
+    if line.count(':') > 2:
+        return CorruptMessage(line, 'too many colons (concatenated?)')
+    if line[0] == ':' or line[-1] == ':':
+        return CorruptMessage(line, 'incomplete')
+    
+    if 'WINNER' in line:
+        winner_match = _RECOVER_WINNER.search(line)
+        if winner_match:
+            team = int(winner_match.group(1))
+            return WinnerMessage(f"WINNER:{team}", team)
+        return CorruptMessage(line, 'partial WINNER')
+    if 'READY' in line:
+        return _READY
+    
+    if len(line) > MAX_MESSAGE_LENGTH:
+        return CorruptMessage(line, 'too long (concatenated?)')
+    if _NON_PRINTABLE.search(line):
+        return CorruptMessage(line, 'non-printable characters')
+    return UnknownMessage(line)
+
+def parse_arduino_message(line):
+    """Turn one stripped serial line into a typed message in a single pass"""
+    message = _EXACT_MESSAGES.get(line)
+    if message is not None:
+        return message
+    
+    head, sep, payload = line.partition(':')
+    if sep:
+        parser = _PAYLOAD_PARSERS.get(head)
+        if parser is not None:
+            return parser(line, payload)
+    return _parse_unrecognized(line)
+
+# Binary framed protocol, negotiated on connect by sending PROTOCOL_HANDSHAKE.
+# Board-to-server frame: START | TYPE | SEQ | LEN | PAYLOAD[LEN] | CRC-8 (poly 0x07 over TYPE..PAYLOAD).
+# Server-to-board commands stay ASCII lines (RESET, RETX:<seq>).
+SERIAL_PROTOCOLS = ('ascii', 'binary')
+PROTOCOL_HANDSHAKE = 'PROTO:BIN1'
+PROTOCOL_HANDSHAKE_TIMEOUT = 0.5
+FRAME_START = 0xA5
+FRAME_HEADER_SIZE = 4  # START, TYPE, SEQ, LEN
+FRAME_MAX_PAYLOAD = 16
+FRAME_READY = 0x01
+FRAME_WINNER = 0x02  # payload: team (1 byte)
+FRAME_TIMING = 0x03  # payload: winning tag 1|2 (1 byte), microseconds (uint32 little-endian)
+RETRANSMIT_WINDOW = 8  # Frames the firmware keeps for RETX
+
+# Baud negotiation: the firmware boots at the connect baud rate, acknowledges BAUD:<rate>,
+# switches, and falls back on its own unless PING is answered at the new rate within 1 s.
+# A confirmed rate is kept until the board reboots, so a board that did not reboot when
+# the port was reopened is looked for at the negotiable rates (last negotiated one first).
+NEGOTIABLE_BAUD_RATES = (921600, 460800, 230400, 115200)
+BAUD_HANDSHAKE_TIMEOUT = 0.5
+BAUD_FALLBACK_DELAY = 1.2  # Firmware reverts after 1 s without a PING
+
+# Connect waits for the firmware's READY banner instead of sleeping for a fixed time
+READY_TIMEOUT = 3.0  # Longest boot we wait for (quiz_2teams.ino delays 1 s in setup)
+READY_PROBE_DELAY = 0.5  # No banner by then: the board did not reboot, ask it with RESET
+READY_PING_TIMEOUT = 0.5  # ...after a PING that returns it to ASCII
+HANDSHAKE_READ_TIMEOUT = 0.05  # Serial read timeout while handshaking, before the reader starts
+
+# Hot-plug supervisor: after an unexpected disconnect, watch for the board and reconnect
+RECONNECT_POLL_INTERVAL = 0.5  # How often the port list is checked for the board
+RECONNECT_INITIAL_BACKOFF = 0.5  # Wait after a failed reconnect attempt, doubled each failure
+RECONNECT_MAX_BACKOFF = 8.0
+# Error texts that mean the device itself went away (macOS, Linux, pySerial)
+DISCONNECT_ERROR_MARKERS = ("Device not configured", "Errno 6", "Errno 5", "device disconnected")
+
+# RESET acknowledgement - the firmware answers every RESET with READY
+RESET_ACK_TIMEOUT = 0.5
+RESET_MAX_ATTEMPTS = 3
+
+def _build_crc8_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+_CRC8_TABLE = _build_crc8_table()
+
+def crc8(data):
+    """CRC-8 (polynomial 0x07, initial value 0) as computed by the firmware"""
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+def encode_frame(frame_type, seq, payload=b''):
+    """Build one board-to-server frame (used by tools that stand in for the firmware)"""
+    body = bytes((frame_type, seq & 0xFF, len(payload))) + payload
+    return bytes((FRAME_START,)) + body + bytes((crc8(body),))
+
+_FRAME_WINNERS = {team: _EXACT_MESSAGES[f'WINNER:{team}'] for team in range(1, 7)}
+
+def _frame_to_message(frame_type, payload):
+    if frame_type == FRAME_WINNER and len(payload) == 1 and payload[0] in _FRAME_WINNERS:
+        return _FRAME_WINNERS[payload[0]]
+    if frame_type == FRAME_READY and not payload:
+        return _READY
+    if frame_type == FRAME_TIMING and len(payload) == 5 and payload[0] in (1, 2):
+        micros = int.from_bytes(payload[1:], 'little')
+        return TimingMessage(f"TIMING:T{payload[0]}:{micros}", f"T{payload[0]}", micros)
+    return CorruptMessage(f"FRAME:{frame_type:02X}:{payload.hex()}", 'invalid frame payload')
+
+class FrameDecoder:
+    """Decode binary frames into typed messages, tracking sequence numbers exactly.
+
+    Lost frames are detected from gaps in the sequence and reported through
+    request_retransmit(seq); a retransmitted frame is accepted once, unless a
+    READY has been received since it was sent. Any other repeat of an
+    already-seen sequence number is dropped as a duplicate.
+    """
+    
+    def __init__(self, request_retransmit=None):
+        self.buffer = bytearray()
+        self.request_retransmit = request_retransmit
+        self.expected_seq = None
+        self.last_ready_seq = None
+        self.missing = set()
+        self.stats = {'frames': 0, 'crc_errors': 0, 'duplicates': 0, 'dropped': 0, 'recovered': 0, 'stale': 0}
+    
+    def feed(self, data):
+        """Append raw bytes and return the messages carried by every complete, valid frame"""
+        buffer = self.buffer
+        buffer += data
+        
+        messages = []
+        pos = 0
+        size = len(buffer)
+        while True:
+            start = buffer.find(FRAME_START, pos)
+            if start < 0:
+                pos = size  # Nothing but noise left
+                break
+            if size - start < FRAME_HEADER_SIZE:
+                pos = start
+                break
+            length = buffer[start + 3]
+            if length > FRAME_MAX_PAYLOAD:
+                pos = start + 1  # Not a real start byte; resynchronise
+                continue
+            end = start + FRAME_HEADER_SIZE + length + 1
+            if end > size:
+                pos = start
+                break
+            if crc8(buffer[start + 1:end - 1]) != buffer[end - 1]:
+                self.stats['crc_errors'] += 1
+                pos = start + 1
+                continue
+            
+            pos = end
+            frame_type = buffer[start + 1]
+            seq = buffer[start + 2]
+            accepted = self._accept_sequence(seq)
+            if accepted == 'recovered' and self._is_before_last_ready(seq):
+                self.stats['stale'] += 1  # The round it belonged to has already been reset
+                continue
+            if accepted:
+                self.stats['frames'] += 1
+                if frame_type == FRAME_READY:
+                    self.last_ready_seq = seq
+                messages.append(_frame_to_message(frame_type, bytes(buffer[start + 4:end - 1])))
+        
+        del buffer[:pos]
+        return messages
+    
+    def _is_before_last_ready(self, seq):
+        if self.last_ready_seq is None:
+            return False
+        return 0 < (self.last_ready_seq - seq) & 0xFF < 128
+    
+    def _accept_sequence(self, seq):
+        """Return 'new' or 'recovered' for a frame to deliver, or None for a duplicate"""
+        expected = self.expected_seq
+        if expected is None or seq == expected:
+            self.expected_seq = (seq + 1) & 0xFF
+            return 'new'
+        
+        if seq in self.missing:
+            self.missing.discard(seq)
+            self.stats['recovered'] += 1
+            return 'recovered'
+        
+        gap = (seq - expected) & 0xFF
+        if gap >= 128:
+            self.stats['duplicates'] += 1  # Behind the expected sequence: already seen
+            return None
+        
+        # Frames expected..seq-1 never arrived
+        self.stats['dropped'] += gap
+        self.expected_seq = (seq + 1) & 0xFF
+        self.missing = {lost for lost in self.missing
+                        if (self.expected_seq - lost) & 0xFF <= RETRANSMIT_WINDOW}
+        for offset in range(gap):
+            lost = (expected + offset) & 0xFF
+            if (self.expected_seq - lost) & 0xFF <= RETRANSMIT_WINDOW:
+                self.missing.add(lost)
+                if self.request_retransmit:
+                    self.request_retransmit(lost)
+        return 'new'
+
+# Outgoing commands - bounded so a stuck port can't grow memory, coalesced so hotkey spam costs one write
+WRITE_QUEUE_SIZE = 32
+WRITE_ENQUEUE_TIMEOUT = 0.05  # How long a producer waits for room before the command is dropped
+WRITE_BATCH_MAX = 16
+
+class CommandQueue:
+    """Bounded FIFO of serial commands that merges identical pending commands
+    
+    A command already waiting to be written is not queued again, so several
+    RESETs fired back to back reach the board once. When the queue is full,
+    put() blocks for up to WRITE_ENQUEUE_TIMEOUT and then drops the command.
+    """
+    
+    def __init__(self, maxsize=WRITE_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self.pending = deque()  # (command, enqueued_at)
+        self.pending_commands = set()
+        self.condition = threading.Condition()
+        self.stats = {'queued': 0, 'coalesced': 0, 'dropped': 0, 'written': 0, 'batches': 0,
+                      'last_latency_ms': None, 'max_latency_ms': None, 'total_latency_ms': 0.0}
+    
+    def put(self, command, timeout=WRITE_ENQUEUE_TIMEOUT):
+        """Queue a command; returns False if it was dropped because the queue stayed full"""
+        with self.condition:
+            if command in self.pending_commands:
+                self.stats['coalesced'] += 1
+                return True
+            if len(self.pending) >= self.maxsize:
+                self.condition.wait_for(lambda: len(self.pending) < self.maxsize, timeout)
+                if len(self.pending) >= self.maxsize:
+                    self.stats['dropped'] += 1
+                    return False
+            self.pending.append((command, time.monotonic()))
+            self.pending_commands.add(command)
+            self.stats['queued'] += 1
+            self.condition.notify_all()
+            return True
+    
+    def get_batch(self, timeout, limit=WRITE_BATCH_MAX):
+        """Wait up to timeout for commands and take everything pending (up to limit)"""
+        with self.condition:
+            if not self.pending:
+                self.condition.wait(timeout)
+            batch = []
+            while self.pending and len(batch) < limit:
+                command, enqueued_at = self.pending.popleft()
+                self.pending_commands.discard(command)
+                batch.append((command, enqueued_at))
+            if batch:
+                self.condition.notify_all()
+            return batch
+    
+    def record_written(self, batch):
+        """Update latency stats once a batch has reached the port"""
+        now = time.monotonic()
+        with self.condition:
+            for _, enqueued_at in batch:
+                latency_ms = (now - enqueued_at) * 1000
+                self.stats['total_latency_ms'] += latency_ms
+                self.stats['last_latency_ms'] = round(latency_ms, 3)
+                if self.stats['max_latency_ms'] is None or latency_ms > self.stats['max_latency_ms']:
+                    self.stats['max_latency_ms'] = round(latency_ms, 3)
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+    
+    def clear(self):
+        with self.condition:
+            self.pending.clear()
+            self.pending_commands.clear()
+            self.condition.notify_all()
+    
+    def qsize(self):
+        return len(self.pending)
+    
+    def summary(self):
+        """Stats for status payloads, with the average enqueue→write latency"""
+        with self.condition:
+            summary = dict(self.stats)
+        total_ms = summary.pop('total_latency_ms')
+        summary['avg_latency_ms'] = round(total_ms / summary['written'], 3) if summary['written'] else None
+        summary['pending'] = self.qsize()
+        return summary
+
+# Port discovery - enumerating USB devices is slow on some hosts, so scans are cached briefly
+PORT_CACHE_TTL = 2.0
+ARDUINO_PORT_KEYWORDS = ('arduino', 'ch340', 'cp210', 'ftdi', 'usb serial', 'esp32')
+ARDUINO_USB_VIDS = (
+    0x10C4,  # Silicon Labs CP210x
+    0x1A86,  # WCH CH340
+    0x0403,  # FTDI
+    0x303A,  # Espressif native USB
+    0x2341,  # Arduino
+)
+
+def port_fingerprint(info):
+    """USB identity (vid, pid, serial_number) of a port, or None for non-USB ports"""
+    if info.vid is None:
+        return None
+    return (info.vid, info.pid, info.serial_number)
+
+class PortRegistry:
+    """Cached view of the serial ports plus the USB identity of the last board that connected"""
+    
+    def __init__(self, ttl=PORT_CACHE_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.cached_ports = []
+        self.scanned_at = None
+        self.last_good = None  # Fingerprint of the last board that completed a connect
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def ports(self, max_age=None):
+        """Return the port list, rescanning only if the cache is older than max_age (default ttl)"""
+        if not SERIAL_AVAILABLE:
+            return []
+        if max_age is None:
+            max_age = self.ttl
+        with self.lock:
+            now = time.monotonic()
+            if self.scanned_at is not None and now - self.scanned_at < max_age:
+                self.stats['hits'] += 1
+                return self.cached_ports
+            self.stats['misses'] += 1
+            self.cached_ports = list(serial.tools.list_ports.comports())
+            self.scanned_at = now
+            return self.cached_ports
+    
+    def invalidate(self):
+        with self.lock:
+            self.scanned_at = None
+    
+    def fingerprint(self, device):
+        for info in self.ports():
+            if info.device == device:
+                return port_fingerprint(info)
+        return None
+    
+    def find(self, fingerprint, max_age=None):
+        """Device name currently carrying the given USB identity, if plugged in"""
+        for info in self.ports(max_age):
+            if port_fingerprint(info) == fingerprint:
+                return info.device
+        return None
+    
+    def remember(self, device):
+        """Record the board on device as last known good; returns its fingerprint"""
+        fingerprint = self.fingerprint(device)
+        if fingerprint:
+            self.last_good = fingerprint
+        return fingerprint
+    
+    def find_arduino_port(self, exclude=()):
+        """Best guess at the buzzer board: last known good, then description keywords, then known USB VIDs
+        
+        Devices in exclude (boards already serving other matches) are never picked.
+        """
+        ports = [info for info in self.ports() if info.device not in exclude]
+        if self.last_good:
+            for info in ports:
+                if port_fingerprint(info) == self.last_good:
+                    return info.device
+        for info in ports:
+            if any(keyword in (info.description or '').lower() for keyword in ARDUINO_PORT_KEYWORDS):
+                return info.device
+        for info in ports:
+            if info.vid in ARDUINO_USB_VIDS:
+                return info.device
+        # Don't guess - the first port is usually a built-in UART, not the board
+        return None
+
+port_registry = PortRegistry()
+
+def is_disconnect_error(error):
+    """True if a serial exception means the device went away rather than a transient glitch"""
+    text = str(error)
+    return any(marker in text for marker in DISCONNECT_ERROR_MARKERS)
 
 # Serial communication class for optimized Arduino handling
 class ArduinoSerial:
-    def __init__(self):
+    def __init__(self, match_id=DEFAULT_MATCH):
+        self.match_id = match_id  # The match whose buzzers are wired to this board
         self.serial_port = None
         self.is_connected = False
         self.read_thread = None
-        self.write_queue = queue.Queue()
+        self.write_queue = CommandQueue()
         self.stop_threads = False
+        self.read_mode = 'event'
+        self.protocol = 'ascii'
+        self.frame_decoder = None
+        self.baudrate = None
+        self.connect_lock = threading.Lock()  # Serializes console, startup and supervisor connects
+        self.disconnect_lock = threading.Lock()
+        self.auto_reconnect = True
+        self.port_name = None
+        self.device_fingerprint = None  # (vid, pid, serial_number) of the connected USB device
+        self.connect_options = None  # Settings of the last successful connect, reused on reconnect
+        self.supervisor_thread = None
+        self.supervisor_stop = threading.Event()
+        self.reconnect_stats = {'reconnects': 0, 'last_ms': None, 'max_ms': None}
+        self.reset_lock = threading.Lock()
+        self.pending_reset = None  # The RESET still waiting for its READY
+        self.reset_stats = {'acked': 0, 'retries': 0, 'failed': 0, 'last_rtt_ms': None, 'max_rtt_ms': None}
         
+    @property
+    def match(self):
+        return matches[self.match_id]
+    
+    def ports_in_use(self):
+        """Serial ports held by the boards of other matches (connected or waiting to reconnect)"""
+        return {match.arduino.port_name for match in list(matches.values())
+                if match.arduino is not self and (match.arduino.is_connected or match.arduino.supervisor_thread
+                                                  and match.arduino.supervisor_thread.is_alive())}
+    
     def find_arduino_port(self):
         """Automatically find Arduino port"""
-        if not SERIAL_AVAILABLE:
-            return None
-            
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            # Look for common Arduino identifiers
-            if any(keyword in (port.description or '').lower() for keyword in 
-                   ['arduino', 'ch340', 'cp210', 'ftdi', 'usb serial']):
-                return port.device
-        
-        # If no Arduino found, return the first available port
-        if ports:
-            return ports[0].device
-        return None
+        return port_registry.find_arduino_port(exclude=self.ports_in_use())
     
-    def connect(self, port=None, baudrate=9600):
-        """Connect to Arduino with optimized settings"""
+    def connect(self, port=None, baudrate=9600, read_mode='event', protocol='ascii', max_baudrate=None,
+                progress=None):
+        """Connect to Arduino with optimized settings
+        
+        baudrate is the rate the firmware boots at; when max_baudrate is higher, the
+        fastest rate in NEGOTIABLE_BAUD_RATES that both sides confirm is used instead.
+        progress, if given, is called as progress(stage, message) at each step.
+        """
+        if progress is None:
+            progress = lambda stage, message: None
+        
         if not SERIAL_AVAILABLE:
             logger.warning("Serial not available - using simulation mode")
             return False
+        
+        if read_mode not in SERIAL_READ_MODES:
+            logger.error(f"Unknown serial read mode: {read_mode} (expected one of {', '.join(SERIAL_READ_MODES)})")
+            return False
+        
+        if protocol not in SERIAL_PROTOCOLS:
+            logger.error(f"Unknown serial protocol: {protocol} (expected one of {', '.join(SERIAL_PROTOCOLS)})")
+            return False
             
         try:
             if port is None:
@@ -72,39 +895,166 @@ class ArduinoSerial:
             if port is None:
                 logger.error("No serial ports found")
                 return False
+            if port in self.ports_in_use():
+                logger.error(f"{port} is already connected to another match")
+                progress('failed', f"{port} is already connected to another match")
+                return False
                 
-            logger.info(f"Connecting to Arduino on {port} at {baudrate} baud...")
+            logger.info(f"Connecting to Arduino on {port} at {baudrate} baud ({read_mode} reader)...")
+            progress('opening', f"Opening {port} at {baudrate} baud")
             
+            self.read_mode = read_mode
             self.serial_port = serial.Serial(
                 port=port,
                 baudrate=baudrate,
-                timeout=0.1,  # Non-blocking read
+                timeout=HANDSHAKE_READ_TIMEOUT,
                 write_timeout=0.1,  # Non-blocking write
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE
             )
             
-            # Wait for Arduino to initialize
-            time.sleep(2)
+            # Wait for the firmware to come up (opening the port usually reboots the ESP32)
+            progress('waiting_ready', "Waiting for firmware READY")
+            board_rate = self._wait_for_ready(baudrate, max_baudrate)
+            if board_rate is None:
+                logger.warning(f"No READY from firmware within {READY_TIMEOUT}s - continuing anyway")
+                board_rate = baudrate
             
-            # Clear any initial data
-            self.serial_port.reset_input_buffer()
-            self.serial_port.reset_output_buffer()
+            self.baudrate = board_rate
+            if max_baudrate and max_baudrate > board_rate:
+                progress('negotiating_baud', f"Negotiating baud rate up to {max_baudrate}")
+                self.baudrate = self._negotiate_baudrate(board_rate, max_baudrate)
             
+            self.protocol = 'ascii'
+            if protocol == 'binary':
+                progress('negotiating_protocol', "Negotiating binary protocol")
+                self.protocol = self._negotiate_protocol()
+            self.frame_decoder = FrameDecoder(self._request_retransmit)
+            
+            # Event mode blocks until data arrives; poll mode only reads what in_waiting reports
+            self.serial_port.timeout = EVENT_READ_TIMEOUT if read_mode == 'event' else 0.1
             self.is_connected = True
             self.stop_threads = False
             
             # Start background threads
             self.start_threads()
             
-            logger.info(f"✅ Connected to Arduino on {port}")
+            self.port_name = port
+            self.device_fingerprint = port_registry.remember(port)
+            self.connect_options = {
+                'baudrate': baudrate,
+                'read_mode': read_mode,
+                'protocol': protocol,
+                'max_baudrate': max_baudrate
+            }
+            
+            logger.info(f"✅ Connected to Arduino on {port} at {self.baudrate} baud ({self.protocol} protocol)")
             return True
             
         except Exception as e:
             logger.error(f"Failed to connect to Arduino: {e}")
+            if self.serial_port:
+                try:
+                    self.serial_port.close()
+                except Exception:
+                    pass
+                self.serial_port = None
             return False
     
+    def _read_reply(self, reply, deadline):
+        """Read lines until one equals reply or the deadline passes"""
+        pending = b''
+        while time.monotonic() < deadline:
+            # read_until stops at the newline, so anything the firmware sends after the reply stays unread
+            pending += self.serial_port.read_until(b'\n')
+            if pending.endswith(b'\n'):
+                if pending.decode('utf-8', errors='ignore').strip() == reply:
+                    return True
+                pending = b''
+        return False
+    
+    def _handshake(self, command, reply, timeout):
+        """Send one ASCII command before the reader starts and wait for an exact reply line"""
+        self.serial_port.write(f"{command}\n".encode('ascii'))
+        self.serial_port.flush()
+        return self._read_reply(reply, time.monotonic() + timeout)
+    
+    def _wait_for_ready(self, baudrate, max_baudrate=None):
+        """Wait for the boot banner; returns the rate the firmware answered at, or None
+        
+        A board that did not reboot on open is asked with RESET. It may still be on binary
+        frames from the last session, where READY would come back as a frame. PING goes
+        first: the firmware answers it with an ASCII PONG in either protocol and switches
+        back to ASCII. It may also still be at a rate negotiated earlier, which it keeps
+        until it reboots: the rate negotiated last is tried when PING gets no answer, the
+        other negotiable rates only once RESET gets none either.
+        """
+        start = time.monotonic()
+        if self._read_reply('READY', start + READY_PROBE_DELAY):
+            return baudrate
+        rates = [rate for rate in NEGOTIABLE_BAUD_RATES if baudrate < rate <= (max_baudrate or 0)]
+        # Older firmware may not answer PING; RESET decides
+        if not self._handshake('PING', 'PONG', READY_PING_TIMEOUT) and self.baudrate in rates:
+            if self._answers_at(self.baudrate, baudrate):
+                return self.baudrate
+            rates.remove(self.baudrate)
+        if self._handshake('RESET', 'READY', max(READY_PING_TIMEOUT, start + READY_TIMEOUT - time.monotonic())):
+            return baudrate
+        for rate in rates:
+            if self._answers_at(rate, baudrate):
+                return rate
+        return None
+    
+    def _answers_at(self, rate, baudrate):
+        """PING the firmware at rate and reset it if it answers; otherwise go back to baudrate"""
+        self.serial_port.baudrate = rate
+        self.serial_port.reset_input_buffer()
+        self.serial_port.write(b'\n')  # Ends the line the bytes sent at the wrong rate made
+        if self._handshake('PING', 'PONG', READY_PING_TIMEOUT):
+            logger.info(f"🔁 Firmware still at {rate} baud from an earlier session")
+            self._handshake('RESET', 'READY', READY_PING_TIMEOUT)
+            return True
+        self.serial_port.baudrate = baudrate
+        self.serial_port.reset_input_buffer()
+        return False
+    
+    def _negotiate_baudrate(self, baudrate, max_baudrate):
+        """Step down from the fastest allowed rate until the firmware confirms one"""
+        for rate in NEGOTIABLE_BAUD_RATES:
+            if rate > max_baudrate or rate <= baudrate:
+                continue
+            
+            if not self._handshake(f"BAUD:{rate}", f"BAUD:{rate}", BAUD_HANDSHAKE_TIMEOUT):
+                logger.warning(f"Firmware did not acknowledge baud negotiation - staying at {baudrate} baud")
+                return baudrate
+            
+            self.serial_port.baudrate = rate
+            if self._handshake("PING", "PONG", BAUD_HANDSHAKE_TIMEOUT):
+                logger.info(f"⚡ Negotiated {rate} baud")
+                return rate
+            
+            # Link unusable at this rate; wait for the firmware to fall back, then try the next one
+            logger.warning(f"No reply at {rate} baud - falling back")
+            self.serial_port.baudrate = baudrate
+            time.sleep(BAUD_FALLBACK_DELAY)
+            self.serial_port.reset_input_buffer()
+        
+        return baudrate
+    
+    def _negotiate_protocol(self):
+        """Ask the firmware to switch to binary frames; old firmware ignores the request"""
+        if self._handshake(PROTOCOL_HANDSHAKE, PROTOCOL_HANDSHAKE, PROTOCOL_HANDSHAKE_TIMEOUT):
+            logger.info("🔗 Firmware switched to binary framed protocol")
+            return 'binary'
+        
+        logger.warning("Firmware did not acknowledge binary protocol - staying on ASCII")
+        return 'ascii'
+    
+    def _request_retransmit(self, seq):
+        logger.warning(f"Serial frame {seq} lost - requesting retransmit")
+        self.write(f"RETX:{seq}\n")
+    
     def start_threads(self):
         """Start background read and write threads"""
         self.read_thread = threading.Thread(target=self._read_loop, daemon=True)
@@ -113,37 +1063,56 @@ class ArduinoSerial:
         self.write_thread = threading.Thread(target=self._write_loop, daemon=True)
         self.write_thread.start()
     
+    def _read_chunk(self):
+        """Return the bytes currently available from the serial port, waiting according to the read mode"""
+        if self.read_mode == 'poll':
+            if self.serial_port.in_waiting > 0:
+                data = self.serial_port.read(self.serial_port.in_waiting)
+            else:
+                data = b''
+            time.sleep(POLL_INTERVAL)  # Small delay to prevent CPU spinning
+            return data
+        
+        # Event mode: wake as soon as the first byte lands, then drain whatever else has arrived
+        data = self.serial_port.read(1)
+        if data:
+            waiting = self.serial_port.in_waiting
+            if waiting:
+                data += self.serial_port.read(waiting)
+        return data
+    
     def _read_loop(self):
-        """Optimized non-blocking read loop with message validation and disconnect detection"""
-        buffer = ""
+        """Read loop with message validation and disconnect detection"""
+        framer = LineFramer()
         consecutive_errors = 0
         max_errors = 5  # Max consecutive errors before assuming disconnect
         
         while self.is_connected and not self.stop_threads:
             try:
-                if self.serial_port and self.serial_port.in_waiting > 0:
-                    data = self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
-                    buffer += data
+                data = self._read_chunk() if self.serial_port else b''
+                if data:
                     consecutive_errors = 0  # Reset error count on successful read
                     
-                    # Process complete lines with validation
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
-                        if line:
-                            # Validate message before processing
-                            if self._validate_message(line):
-                                self._handle_arduino_message(line)
-                            else:
-                                logger.warning(f"Invalid/corrupted message ignored: {line}")
-                
-                time.sleep(0.01)  # Small delay to prevent CPU spinning
+                    if self.protocol == 'binary':
+                        # Frames are CRC-checked and sequence-tracked by the decoder
+                        for message in self.frame_decoder.feed(data):
+                            self._dispatch_message(message)
+                    else:
+                        # Process complete lines with validation
+                        for line in framer.feed(data):
+                            message = parse_arduino_message(line)
+                            if message.raw != line and type(message) is not CorruptMessage:
+                                logger.warning(f"Recovered {message.raw} from partial message: {line!r}")
+                            self._dispatch_message(message)
                 
             except Exception as e:
+                if self.stop_threads:
+                    break  # Read was cancelled by disconnect()
+                
                 consecutive_errors += 1
                 
                 # Check for device disconnection errors
-                if "Device not configured" in str(e) or "Errno 6" in str(e):
+                if is_disconnect_error(e):
                     logger.error(f"Arduino device disconnected: {e}")
                     self._handle_disconnection()
                     break
@@ -155,87 +1124,21 @@ class ArduinoSerial:
                     logger.error(f"Read error ({consecutive_errors}/{max_errors}): {e}")
                     time.sleep(0.5)  # Longer delay after errors
 
-    def _validate_message(self, message):
-        """Validate Arduino message format and integrity"""
-        if not message or len(message) == 0:
-            return False
-            
-        # Check for obvious corruption (mixed messages)
-        if message.count(':') > 2:  # Too many colons suggests concatenation
-            logger.warning(f"Message has too many colons (concatenated?): {message}")
-            return False
-            
-        # Check for incomplete messages
-        if message.endswith(':') or message.startswith(':'):
-            logger.warning(f"Message appears incomplete: {message}")
-            return False
-            
-        # Validate known message types
-        if message == "READY" or message == "RESET":
-            return True
-            
-        if message.startswith("WINNER:"):
-            parts = message.split(':')
-            if len(parts) == 2:
-                try:
-                    team = int(parts[1])
-                    return 1 <= team <= 6  # Valid team numbers
-                except ValueError:
-                    return False
-            return False
-            
-        if message.startswith("TIMING:"):
-            parts = message.split(':')
-            if len(parts) == 3:
-                # Format: TIMING:T1:123 or TIMING:T2:456
-                if parts[1] in ['T1', 'T2']:
-                    try:
-                        int(parts[2])  # Validate timing number
-                        return True
-                    except ValueError:
-                        return False
-            return False
-            
-        # Check for partial WINNER messages (common corruption)
-        if "WINNER" in message and not message.startswith("WINNER:"):
-            logger.warning(f"Partial WINNER message detected: {message}")
-            # Try to extract valid WINNER:X from corrupted message
-            winner_match = re.search(r'WINNER:([1-6])', message)
-            if winner_match:
-                logger.info(f"Extracted valid WINNER message from corruption: WINNER:{winner_match.group(1)}")
-                # Replace the corrupted message with the clean one
-                clean_message = f"WINNER:{winner_match.group(1)}"
-                # Process the clean message directly
-                self._handle_arduino_message(clean_message)
-            return False  # Don't process the original corrupted message
-            
-        # Check for partial READY messages
-        if "READY" in message and message != "READY":
-            logger.warning(f"Partial READY message detected: {message}")
-            # If it contains READY, treat it as a valid READY
-            self._handle_arduino_message("READY")
-            return False  # Don't process the original
-            
-        # Reject messages that are too long (likely concatenated)
-        if len(message) > 50:
-            logger.warning(f"Message too long (likely concatenated): {message[:50]}...")
-            return False
-            
-        # Reject messages with non-printable characters
-        if not all(ord(c) >= 32 or c in '\r\n\t' for c in message):
-            logger.warning(f"Message contains non-printable characters: {repr(message)}")
-            return False
-            
-        # Log unknown but potentially valid messages
-        logger.info(f"Unknown message format (may be valid): {message}")
-        return True
-    
+    def _dispatch_message(self, message):
+        if type(message) is CorruptMessage:
+            logger.warning(f"Invalid/corrupted message ignored ({message.reason}): {message.raw!r}")
+        else:
+            self._handle_arduino_message(message)
+
     def _handle_disconnection(self):
         """Handle Arduino disconnection gracefully"""
-        logger.warning("🔌 Arduino disconnected - cleaning up connection...")
+        with self.disconnect_lock:
+            if not self.is_connected:
+                return  # The other I/O thread already handled it
+            # Mark as disconnected to stop loops
+            self.is_connected = False
         
-        # Mark as disconnected to stop loops
-        self.is_connected = False
+        logger.warning("🔌 Arduino disconnected - cleaning up connection...")
         
         # Clean up serial port
         if self.serial_port:
@@ -246,14 +1149,91 @@ class ArduinoSerial:
             self.serial_port = None
         
         # Update game state
-        global game_state
-        game_state['arduino_connected'] = False
+        self.match.store.submit(set_state, ('arduino_connected',), False)
         
         # Notify clients
-        socketio.emit('arduino_status', {'connected': False, 'message': 'Arduino disconnected'})
-        socketio.emit('log', {'message': 'Arduino disconnected - running in simulation mode'})
+        self.match.broadcast('arduino_status', {'connected': False, 'message': 'Arduino disconnected'})
+        self.match.broadcast('log', {'message': 'Arduino disconnected - running in simulation mode'})
         
         logger.info("✅ Arduino disconnect handled - server continuing in simulation mode")
+        
+        if self.auto_reconnect and self.connect_options:
+            self._start_supervisor()
+    
+    def _find_device(self):
+        """Return the device name of the last connected board if it is plugged in"""
+        # The supervisor is waiting for a hot-plug, so always rescan
+        if self.device_fingerprint:
+            return port_registry.find(self.device_fingerprint, max_age=0)
+        # No USB identity (e.g. a built-in UART): fall back to the port name
+        ports = port_registry.ports(max_age=0)
+        if any(info.device == self.port_name for info in ports) or os.path.exists(self.port_name):
+            return self.port_name
+        return None
+    
+    def _start_supervisor(self):
+        if self.supervisor_thread and self.supervisor_thread.is_alive():
+            return
+        self.supervisor_stop.clear()
+        self.supervisor_thread = threading.Thread(target=self._supervise_reconnect, args=(time.monotonic(),),
+                                                  daemon=True)
+        self.supervisor_thread.start()
+    
+    def _supervise_reconnect(self, lost_at):
+        """Poll for the board to come back and reconnect, backing off after failed attempts"""
+        logger.info("🔍 Watching for the Arduino to come back...")
+        backoff = RECONNECT_INITIAL_BACKOFF
+        next_attempt = 0
+        attempts = 0
+        
+        while not self.supervisor_stop.wait(RECONNECT_POLL_INTERVAL):
+            if self.is_connected:
+                return  # Reconnected from the console
+            if time.monotonic() < next_attempt:
+                continue
+            
+            try:
+                device = self._find_device()
+            except Exception as e:
+                logger.error(f"Port scan failed: {e}")
+                continue
+            if device is None or not self.connect_lock.acquire(blocking=False):
+                continue
+            
+            try:
+                attempts += 1
+                connected = not self.supervisor_stop.is_set() and self.connect(device, **self.connect_options)
+            finally:
+                self.connect_lock.release()
+            
+            if connected:
+                self._on_reconnected(lost_at, attempts)
+                return
+            
+            next_attempt = time.monotonic() + backoff
+            logger.warning(f"Reconnect attempt {attempts} failed - retrying in {backoff:.1f}s")
+            backoff = min(backoff * 2, RECONNECT_MAX_BACKOFF)
+    
+    def _on_reconnected(self, lost_at, attempts):
+        elapsed_ms = round((time.monotonic() - lost_at) * 1000)
+        stats = self.reconnect_stats
+        stats['reconnects'] += 1
+        stats['last_ms'] = elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'] or 0, elapsed_ms)
+        
+        # Re-arm the buzzers; the board may have rebooted mid-question
+        self.request_reset('reconnect')
+        
+        self.match.store.submit(set_state, ('arduino_connected',), True)
+        logger.info(f"✅ Arduino reconnected after {elapsed_ms} ms ({attempts} attempt(s))")
+        self.match.broadcast('arduino_status', {
+            'connected': True,
+            'message': f'Arduino reconnected in {elapsed_ms} ms',
+            'protocol': self.protocol,
+            'baudrate': self.baudrate,
+            'reconnectMs': elapsed_ms
+        })
+        self.match.broadcast('log', {'message': f'Arduino reconnected automatically in {elapsed_ms} ms'})
 
     def _write_loop(self):
         """Non-blocking write loop with queue and disconnect detection"""
@@ -262,25 +1242,23 @@ class ArduinoSerial:
         
         while self.is_connected and not self.stop_threads:
             try:
-                # Wait for data to write (with timeout)
-                data = self.write_queue.get(timeout=0.1)
+                # Take everything queued so a burst of commands goes out in one write
+                batch = self.write_queue.get_batch(timeout=0.1)
+                if not batch:
+                    continue
                 
                 if self.serial_port and self.is_connected:
-                    logger.info(f"📤 Writing to Arduino: '{data.strip()}'")
-                    self.serial_port.write(data.encode('utf-8'))
-                    self.serial_port.flush()
-                    logger.info(f"✅ Successfully wrote to Arduino: '{data.strip()}'")
+                    # No flush(): waiting for the UART to drain only delays the next batch
+                    self.serial_port.write(''.join(command for command, _ in batch).encode('utf-8'))
+                    self.write_queue.record_written(batch)
+                    logger.info(f"📤 Wrote to Arduino: {[command.strip() for command, _ in batch]}")
                     consecutive_errors = 0  # Reset on successful write
-                    
-                self.write_queue.task_done()
                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 consecutive_errors += 1
                 
                 # Check for device disconnection errors
-                if "Device not configured" in str(e) or "Errno 6" in str(e):
+                if is_disconnect_error(e):
                     logger.error(f"Arduino device disconnected during write: {e}")
                     self._handle_disconnection()
                     break
@@ -293,54 +1271,93 @@ class ArduinoSerial:
                     time.sleep(0.5)
     
     def _handle_arduino_message(self, message):
-        """Handle incoming Arduino messages with improved validation"""
-        logger.info(f"Arduino: {message}")
+        """Handle a parsed Arduino message"""
+        logger.info(f"Arduino: {message.raw}")
         
         # Broadcast to all connected clients
-        socketio.emit('buzzer_data', message)
+        self.match.broadcast('buzzer_data', message.raw)
         
-        # Update game state based on message type
-        if message.startswith('WINNER:'):
-            try:
-                team = int(message.split(':')[1])
-                if game_state['winner'] is None and 1 <= team <= 6:
-                    game_state['winner'] = team
-                    logger.info(f"🏆 Team {team} wins!")
-                    
-                    # Emit buzzer press event for Among Us interface
-                    socketio.emit('buzzer_pressed', {'teamId': team})
-                    add_log(f"Team {team} win the buzz")
-                else:
-                    if team < 1 or team > 6:
-                        logger.warning(f"Invalid team number: {team}")
-                    else:
-                        logger.warning(f"Team {team} winner ignored - Team {game_state['winner']} already won")
-                        add_log(f"Team {team} buzzed (too late)")
-            except (ValueError, IndexError):
-                logger.warning(f"Invalid winner message format: {message}")
-        elif message.startswith('TIMING:'):
-            # Handle timing messages (T1:123 or T2:456)
-            try:
-                parts = message.split(':')
-                if len(parts) == 3:
-                    team_part = parts[1]  # T1 or T2
-                    timing = parts[2]     # microsecond difference
-                    logger.info(f"⏱️ Timing data - {team_part}: {timing} microseconds")
-            except (ValueError, IndexError):
-                logger.warning(f"Invalid timing message format: {message}")
-        elif message in ['RESET', 'READY']:
-            game_state['winner'] = None
-            logger.info(f"🔄 Game reset: {message}")
-            socketio.emit('clear_buzzers')
-        else:
-            logger.info(f"ℹ️ Other message: {message}")
+        self._MESSAGE_HANDLERS[type(message)](self, message)
+    
+    def _on_winner(self, message):
+        # Hand off to the state store; the reader goes straight back to the port
+        self.match.store.submit(claim_buzz, message.team)
+    
+    def _on_timing(self, message):
+        logger.info(f"⏱️ Timing data - {message.winner_tag}: {message.micros} microseconds")
+    
+    def _on_reset(self, message):
+        logger.info(f"🔄 Game reset: {message.raw}")
+        
+        with self.reset_lock:
+            pending, self.pending_reset = self.pending_reset, None
+            if pending:
+                pending['timer'].cancel()
+        
+        armed = {'armed': True, 'source': pending['source'] if pending else 'board'}
+        if pending:
+            # Measured from the first request, so retries show up in the armed latency
+            rtt_ms = round((time.monotonic() - pending['requested_at']) * 1000, 3)
+            stats = self.reset_stats
+            stats['acked'] += 1
+            stats['last_rtt_ms'] = rtt_ms
+            stats['max_rtt_ms'] = max(stats['max_rtt_ms'] or 0, rtt_ms)
+            armed.update(rttMs=rtt_ms, attempts=pending['attempts'])
+            logger.info(f"✅ Buzzers armed - RESET acknowledged in {rtt_ms} ms ({pending['attempts']} attempt(s))")
+        self.match.store.submit(arm_buzzers, armed)
+    
+    def _on_unknown(self, message):
+        logger.info(f"ℹ️ Other message: {message.raw}")
+    
+    _MESSAGE_HANDLERS = {
+        WinnerMessage: _on_winner,
+        TimingMessage: _on_timing,
+        ReadyMessage: _on_reset,
+        ResetMessage: _on_reset,
+        UnknownMessage: _on_unknown,
+    }
+    
+    def request_reset(self, source):
+        """Send RESET and arm the buzzers once the board answers READY
+        
+        Only one RESET is outstanding at a time; requests made while it is in
+        flight share its acknowledgement. Unanswered RESETs are resent every
+        RESET_ACK_TIMEOUT, up to RESET_MAX_ATTEMPTS in total.
+        """
+        with self.reset_lock:
+            self.match.store.submit(set_state, ('buzzers_armed',), False)
+            if self.pending_reset is None:
+                self.pending_reset = {'source': source, 'requested_at': time.monotonic(), 'attempts': 0}
+                self._send_reset(self.pending_reset)
+    
+    def _send_reset(self, pending):
+        pending['attempts'] += 1
+        self.write('RESET\n')
+        pending['timer'] = threading.Timer(RESET_ACK_TIMEOUT, self._on_reset_timeout, args=(pending,))
+        pending['timer'].daemon = True
+        pending['timer'].start()
+    
+    def _on_reset_timeout(self, pending):
+        with self.reset_lock:
+            if self.pending_reset is not pending:
+                return  # Acknowledged just in time
+            if self.is_connected and pending['attempts'] < RESET_MAX_ATTEMPTS:
+                self.reset_stats['retries'] += 1
+                logger.warning(f"⚠️ No READY after RESET attempt {pending['attempts']} - resending")
+                self._send_reset(pending)
+                return
+            self.pending_reset = None
+            self.reset_stats['failed'] += 1
+        
+        logger.error(f"❌ Board never acknowledged RESET ({pending['attempts']} attempt(s)) - buzzers not armed")
+        self.match.broadcast('buzzers_armed', {'armed': False, 'source': pending['source'], 'attempts': pending['attempts']})
+        self.match.broadcast('log', {'message': 'Buzzer reset was not acknowledged by the Arduino'})
     
     def write(self, data):
         """Queue data for writing to Arduino"""
         if self.is_connected:
-            logger.info(f"📝 Queuing data for Arduino: '{data.strip()}'")
-            self.write_queue.put(data)
-            logger.info(f"✅ Data queued successfully, queue size: {self.write_queue.qsize()}")
+            if not self.write_queue.put(data):
+                logger.warning(f"⚠️ Write queue full, dropped: {data.strip()}")
         else:
             logger.warning(f"Arduino not connected, cannot send: {data.strip()}")
     
@@ -348,16 +1365,24 @@ class ArduinoSerial:
         """Disconnect from Arduino"""
         logger.info("Disconnecting from Arduino...")
         
+        # A deliberate disconnect is not a hot-unplug: stop watching for the board
+        self.supervisor_stop.set()
         self.stop_threads = True
         self.is_connected = False
         
-        # Clear write queue
-        try:
-            while not self.write_queue.empty():
-                self.write_queue.get_nowait()
-                self.write_queue.task_done()
-        except:
-            pass
+        # Wake a reader blocked in event mode so it can exit immediately
+        if self.serial_port and hasattr(self.serial_port, 'cancel_read'):
+            try:
+                self.serial_port.cancel_read()
+            except Exception:
+                pass
+        
+        # Clear write queue and forget any RESET still waiting for READY
+        self.write_queue.clear()
+        with self.reset_lock:
+            if self.pending_reset:
+                self.pending_reset['timer'].cancel()
+                self.pending_reset = None
         
         # Wait for threads to finish
         if hasattr(self, 'read_thread') and self.read_thread and self.read_thread.is_alive():
@@ -376,36 +1401,702 @@ class ArduinoSerial:
             
         logger.info("✅ Arduino disconnected cleanly")
 
-# Initialize Arduino communication
-arduino = ArduinoSerial()
-
 # Enhanced game state for Among Us Quiz Bowl
-game_state = {
-    'winner': None,
-    'connected_clients': 0,
-    'arduino_connected': False,
-    'teams': {
-        1: {'name': 'Team A', 'score': 0, 'color': 'red', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
-        2: {'name': 'Team B', 'score': 0, 'color': 'blue', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
-        3: {'name': 'Team C', 'score': 0, 'color': 'lime', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
-        4: {'name': 'Team D', 'score': 0, 'color': 'orange', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
-        5: {'name': 'Team E', 'score': 0, 'color': 'pink', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
-        6: {'name': 'Team F', 'score': 0, 'color': 'yellow', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0}
-    },
-    'timer': {
-        'value': 15,
-        'running': False,
-        'default': 15
-    },
-    'question_set': {
-        'current': 1,
-        'subject': 'general',
-        'title': 'General Knowledge',
-        'sub_question': 0
-    },
-    'challenge_2x': False,
-    'logs': []
-}
+def new_game_state():
+    """Initial state of a match"""
+    return {
+        'winner': None,
+        'connected_clients': 0,
+        'arduino_connected': False,
+        'buzzers_armed': False,  # True once the board has acknowledged the last RESET
+        'teams': {
+            1: {'name': 'Team A', 'score': 0, 'color': 'red', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
+            2: {'name': 'Team B', 'score': 0, 'color': 'blue', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
+            3: {'name': 'Team C', 'score': 0, 'color': 'lime', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
+            4: {'name': 'Team D', 'score': 0, 'color': 'orange', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
+            5: {'name': 'Team E', 'score': 0, 'color': 'pink', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0},
+            6: {'name': 'Team F', 'score': 0, 'color': 'yellow', 'cards': {'angel': False, 'devil': False, 'cross': False, 'angelUsed': False, 'devilUsed': False}, 'rank': 0}
+        },
+        'timer': {
+            'value': 15,
+            'running': False,
+            'default': 15,
+            'deadline': None  # Server-clock ms at which a running timer ends
+        },
+        'timers': {},  # Named countdowns (question, devil challenge, ...): name -> value/running/deadline
+        'question_set': {
+            'current': 1,
+            'subject': 'general',
+            'title': 'General Knowledge',
+            'sub_question': 0
+        },
+        'challenge_2x': False
+    }
+
+# Game state store - a match's state has exactly one writer. Socket.IO handlers, the serial
+# reader and the timer submit commands; a dispatcher thread applies them one at a time,
+# so check-then-set sequences (e.g. claiming the winner slot) can't interleave.
+STATE_COMMAND_TIMEOUT = 2.0  # How long a handler waits for a command's result
+EMIT_BATCH_WINDOW = 0.0  # Seconds to keep collecting emits across commands (0 = one frame set per command)
+BATCH_EVENT = 'batch'
+
+class StateTransaction:
+    """What a state command works with: the live state plus buffers for changes and emits"""
+    
+    def __init__(self, state, match):
+        self.state = state
+        self.match = match
+        self.changes = []  # ('set', path, value) in the order they happened
+        self.emits = []
+    
+    def set(self, path, value):
+        """Set the value at path (a tuple of keys), creating intermediate dicts"""
+        target = self.state
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+        self.changes.append(('set', path, value))
+    
+    def emit(self, event, *args, **kwargs):
+        """Queue a Socket.IO emit; it is sent once the command has been applied"""
+        self.emits.append((event, args, kwargs))
+    
+    def log(self, message, type='info'):
+        """Add entry to the match's game log; it reaches the consoles with the next log batch"""
+        self.match.log.add(message, type)
+
+# Game log. Each match keeps its newest entries in a fixed-size ring buffer outside the
+# state dict (logs were never part of the delta sync). Entries hold time.monotonic() and
+# become ISO timestamps only when sent. The store's dispatcher sends new entries every
+# LOG_BATCH_WINDOW as one frame, to the roles that show logs (see CONSOLE_ONLY_EVENTS),
+# so a burst of commands costs the consoles a frame per window rather than one per line.
+MAX_LOG_ENTRIES = 100
+LOG_BATCH_WINDOW = 0.1  # Seconds new entries wait for more before they are sent (0 = after every command)
+LOG_CLOCK_BASE = time.time() - time.monotonic()  # Turns an entry's monotonic time into wall-clock time
+
+class LogEntry(namedtuple('LogEntry', ['at', 'message', 'type'])):
+    __slots__ = ()
+    
+    def to_dict(self):
+        return {
+            'timestamp': datetime.datetime.fromtimestamp(LOG_CLOCK_BASE + self.at).isoformat(),
+            'message': self.message,
+            'type': self.type
+        }
+
+class GameLog:
+    """Ring buffer of a match's log entries plus the ones not broadcast yet
+    
+    Only the match's store thread touches it: commands add entries, the dispatcher flushes.
+    """
+    
+    def __init__(self, match, capacity=MAX_LOG_ENTRIES, window=LOG_BATCH_WINDOW):
+        self.match = match
+        self.entries = deque(maxlen=capacity)
+        self.pending = []
+        self.window = window
+        self.flush_at = None  # When the pending entries are sent
+        self.stats = {'entries': 0, 'frames': 0}
+    
+    @property
+    def capacity(self):
+        return self.entries.maxlen
+    
+    def resize(self, capacity):
+        self.entries = deque(self.entries, maxlen=max(1, capacity))
+    
+    def add(self, message, type='info'):
+        entry = LogEntry(time.monotonic(), message, type)
+        self.entries.append(entry)
+        if not self.pending:
+            self.flush_at = entry.at + self.window
+        self.pending.append(entry)
+        self.stats['entries'] += 1
+    
+    def wait_time(self):
+        """Seconds until the pending entries are due, or None if there are none"""
+        if not self.pending:
+            return None
+        return max(0.0, self.flush_at - time.monotonic())
+    
+    def flush(self):
+        """Send the pending entries: one log_update, or a batch of them"""
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        rooms = event_rooms('log_update', self.match.id)
+        if len(pending) == 1:
+            socketio.emit('log_update', pending[0].to_dict(), to=rooms)
+        else:
+            socketio.emit(BATCH_EVENT, [['log_update', entry.to_dict()] for entry in pending], to=rooms)
+        self.stats['frames'] += 1
+    
+    def snapshot(self):
+        return [entry.to_dict() for entry in self.entries]
+
+class EmitBatcher:
+    """Collects the emits of state commands and sends them in as few frames as possible
+    
+    Emits are grouped by recipient room: every room gets one `batch` event carrying
+    [[event, *args], ...] with all the events it receives, in the order they were
+    made, so a client sees a console action as a single frame. A room with one event
+    gets it as a normal event. An event emitted with skip_sid stays in the room's
+    frame; the skipped client gets its own frame without it. The browser's
+    createSocket() unpacks batches.
+    """
+    
+    def __init__(self, match):
+        self.match = match
+        self.pending = {}  # (room, other emit options) -> (kwargs, [([event, *args], skip_sid), ...])
+        self.spectator_events = []
+        self.stats = {'events': 0, 'frames': 0, 'batches': 0}
+    
+    def add(self, event, args, kwargs):
+        if self.match.feed.wants(event, kwargs):
+            self.spectator_events.append((event, args[0] if args else None))
+        kwargs = dict(route(event, kwargs, self.match.id))
+        rooms = kwargs.pop('to', None) or kwargs.pop('room', None)
+        skip_sid = kwargs.pop('skip_sid', None)
+        options = tuple(sorted(kwargs.items()))
+        for room in (rooms if isinstance(rooms, (list, tuple)) else (rooms,)):
+            key = (room, options)
+            if key not in self.pending:
+                self.pending[key] = (dict(kwargs, to=room), [])
+            self.pending[key][1].append(([event, *args], skip_sid))
+        self.stats['events'] += 1
+    
+    def flush(self):
+        pending, self.pending = self.pending, {}
+        for kwargs, entries in pending.values():
+            skipped = {skip_sid for _, skip_sid in entries if skip_sid}
+            if skipped:
+                kwargs = dict(kwargs, skip_sid=sorted(skipped))
+            self._send([event for event, _ in entries], kwargs)
+            for sid in skipped:
+                if client_rooms.get(sid) == kwargs['to']:
+                    self._send([event for event, skip_sid in entries if skip_sid != sid],
+                               dict(kwargs, to=sid, skip_sid=None))
+        if self.spectator_events:
+            spectator_events, self.spectator_events = self.spectator_events, []
+            self.match.feed.publish(spectator_events)
+    
+    def _send(self, events, kwargs):
+        if not events:
+            return
+        if len(events) == 1:
+            socketio.emit(*events[0], **kwargs)
+        else:
+            socketio.emit(BATCH_EVENT, events, **kwargs)
+            self.stats['batches'] += 1
+        self.stats['frames'] += 1
+
+class GameStateStore:
+    """Single-writer owner of a state dict
+    
+    submit(command, *args) queues command(tx, *args) and returns a Future for its
+    result; call() waits for it. Every command that changes something bumps
+    `version`, then listeners see (version, changes) and the command's emits are
+    sent, so clients observe events in the order the state changed.
+    """
+    
+    def __init__(self, state, match):
+        self.state = state
+        self.match = match
+        self.version = 0
+        self.commands = queue.Queue()
+        self.listeners = []
+        self.thread = None
+        self.stats = {'commands': 0, 'errors': 0, 'max_backlog': 0}
+        self.batcher = EmitBatcher(match)
+        self.emit_window = EMIT_BATCH_WINDOW
+    
+    def start(self):
+        self.thread = threading.Thread(target=self._dispatch_loop, name=f'game-state-{self.match.id}', daemon=True)
+        self.thread.start()
+    
+    def submit(self, command, *args):
+        done = Future()
+        if threading.current_thread() is self.thread:
+            # A command (or a listener) submitting more work: run it right after, in order
+            self._apply(command, args, done)
+            return done
+        self.commands.put((command, args, done))
+        return done
+    
+    def call(self, command, *args, timeout=STATE_COMMAND_TIMEOUT):
+        return self.submit(command, *args).result(timeout)
+    
+    def _dispatch_loop(self):
+        log = self.match.log
+        while True:
+            try:
+                command, args, done = self.commands.get(timeout=log.wait_time())
+            except queue.Empty:
+                log.flush()
+                continue
+            backlog = self.commands.qsize()
+            if backlog > self.stats['max_backlog']:
+                self.stats['max_backlog'] = backlog
+            self._apply(command, args, done)
+            
+            # Commands arriving within the window share the same frames
+            flush_at = time.monotonic() + self.emit_window
+            while self.batcher.pending and time.monotonic() < flush_at:
+                try:
+                    command, args, done = self.commands.get(timeout=flush_at - time.monotonic())
+                except queue.Empty:
+                    break
+                self._apply(command, args, done)
+            self.batcher.flush()
+            if log.wait_time() == 0:
+                log.flush()
+    
+    def _apply(self, command, args, done):
+        tx = StateTransaction(self.state, self.match)
+        self.stats['commands'] += 1
+        try:
+            result = command(tx, *args)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.exception(f"❌ State command {command.__name__} failed: {e}")
+            result, error = None, e
+        else:
+            error = None
+        
+        # Changes made before a failure are still real, so they are published either way
+        if tx.changes:
+            self.version += 1
+            for listener in self.listeners:
+                try:
+                    listener(self.version, tx.changes)
+                except Exception as e:
+                    logger.error(f"❌ State listener failed: {e}")
+        for event, event_args, kwargs in tx.emits:
+            self.batcher.add(event, event_args, kwargs)
+        
+        if error:
+            done.set_exception(error)
+        else:
+            done.set_result(result)
+
+# State commands shared by handlers, the serial reader and the timer
+
+def set_state(tx, path, value):
+    tx.set(path, value)
+
+def snapshot_state(tx):
+    """Deep copy of the state (with the game log) and the version it corresponds to"""
+    state = copy.deepcopy(tx.state)
+    state['logs'] = tx.match.log.snapshot()
+    return state, tx.match.store.version
+
+def spectator_snapshot(tx):
+    """What a spectator screen shows, for the first frame of its feed"""
+    state = tx.state
+    return tx.match.store.version, tx.match.feed.last_id, {
+        'teams': {team_id: {key: team[key] for key in ('name', 'score', 'color')}
+                  for team_id, team in state['teams'].items()},
+        'timer': {key: state['timer'].get(key) for key in ('value', 'running', 'deadline')},
+        'timers': {name: timer for name, timer in state['timers'].items() if timer},
+        'question_set': state['question_set'],
+        'winner': state['winner']
+    }
+
+def state_sync_payload(tx, since=None, epoch=None):
+    """What a (re)connecting client needs: the deltas after `since`, else a compact snapshot"""
+    history = tx.match.history
+    payload = {'epoch': tx.match.epoch, 'version': history.last_version}
+    deltas = history.since(since) if epoch == tx.match.epoch and since is not None else None
+    if deltas is not None:
+        payload['deltas'] = deltas
+    else:
+        payload['snapshot'] = {key: copy.deepcopy(value) for key, value in tx.state.items()
+                               if key not in SYNC_EXCLUDED_KEYS}
+    return payload
+
+def claim_buzz(tx, team):
+    """A buzz from the board: the first team since the last reset wins"""
+    if tx.state['winner'] is None:
+        tx.set(('winner',), team)
+        logger.info(f"🏆 Team {team} wins!")
+        
+        # Emit buzzer press event for Among Us interface
+        tx.emit('buzzer_pressed', {'teamId': team, 'playAt': play_at()})
+        tx.log(f"Team {team} win the buzz")
+        return True
+    logger.warning(f"Team {team} winner ignored - Team {tx.state['winner']} already won")
+    tx.log(f"Team {team} buzzed (too late)")
+    return False
+
+def force_buzz(tx, team_id, log_message):
+    """A simulated, test or console buzz: takes the winner slot unconditionally"""
+    tx.set(('winner',), team_id)
+    tx.emit('buzzer_pressed', {'teamId': team_id, 'playAt': play_at()})
+    tx.log(log_message)
+
+def arm_buzzers(tx, armed):
+    tx.set(('winner',), None)
+    tx.set(('buzzers_armed',), True)
+    tx.emit('clear_buzzers')
+    tx.emit('buzzers_armed', armed)
+
+def append_log(tx, message, type='info'):
+    tx.log(message, type)
+
+# Versioned delta sync - every synced change carries the store version. Clients remember
+# the last version they applied and, after a reconnect, fetch only the deltas they missed
+# (or a compact snapshot if those have already left the history)
+STATE_HISTORY_SIZE = 256
+STATE_SYNC_ROOM = 'state_sync'
+SYNC_EXCLUDED_KEYS = ('connected_clients',)  # The client count churns on reconnects
+STATE_EPOCH = os.urandom(4).hex()  # Versions restart with the server, so clients must not resume across restarts
+
+class DeltaHistory:
+    """Ring buffer of recent synced changes, fed by the match's state store"""
+    
+    def __init__(self, match, size=STATE_HISTORY_SIZE):
+        self.match = match
+        self.entries = deque(maxlen=size)  # (version, changes)
+        self.floor = 0  # Clients at or above this version can be caught up from entries
+        self.last_version = 0  # Version of the newest synced change
+    
+    def record(self, version, changes):
+        synced = [[op, [str(key) for key in path], copy.deepcopy(value)]
+                  for op, path, value in changes if path[0] not in SYNC_EXCLUDED_KEYS]
+        if not synced:
+            return
+        if len(self.entries) == self.entries.maxlen:
+            self.floor = self.entries[0][0]
+        previous, self.last_version = self.last_version, version
+        self.entries.append((version, synced))
+        self.match.store.batcher.add('state_delta', ({'epoch': self.match.epoch, 'v': version, 'prev': previous,
+                                                      'c': synced},), {'to': self.match.sync_room})
+    
+    def since(self, version):
+        """Deltas after version, or None if some of them are no longer kept"""
+        if not self.floor <= version <= self.last_version:
+            return None
+        return [[entry_version, changes] for entry_version, changes in self.entries if entry_version > version]
+
+# Countdown timers. A running countdown is a time.monotonic() deadline rather than a value
+# a loop decrements: the seconds on screen are derived from it, so late ticks never add
+# up to drift, starting mid-second costs nothing, and pause/resume keep the exact time left.
+# Clients are not sent the seconds as they pass: timer events carry the deadline on the
+# server clock and each page counts down locally, using its clock offset from the
+# clock service below. The server still ends the countdown (timer_ended). With --timer-updates ticks
+# it also broadcasts every second, as older pages expect.
+# Besides the match clock (state['timer'], timer_update/timer_ended) a match can run any
+# number of named countdowns - a question clock, a devil-challenge clock - kept in
+# state['timers'] and announced with countdown_update/countdown_ended/countdown_cleared.
+# One scheduler thread services every countdown of every match from a heap of deadlines.
+TIMER_UPDATE_MODES = ('deadline', 'ticks')
+timer_updates = 'deadline'
+MATCH_TIMER = 'match'  # Name of the match clock; the named countdowns can't use it
+TIMER_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+MAX_TIMERS = 32  # Named countdowns per match
+
+def server_time_ms():
+    """The clock deadlines are given in: wall-clock ms, the same in every process on the host"""
+    return time.time() * 1000
+
+class Countdown:
+    """Deadline-based countdown with sub-second resolution
+    
+    Only the match's state commands change it. Starting it hands the scheduler the
+    moment it next needs a tick.
+    """
+    
+    def __init__(self, seconds, match_id=DEFAULT_MATCH, name=MATCH_TIMER):
+        self.match_id = match_id
+        self.name = name
+        self.remaining = float(seconds)  # Seconds left while paused
+        self.deadline = None  # time.monotonic() at which the running countdown reaches zero
+        self.deadline_ms = None  # The same moment on the server clock, for clients
+        self.token = 0  # Changes whenever the countdown does, retiring its scheduled ticks
+    
+    @property
+    def running(self):
+        return self.deadline is not None
+    
+    def left(self, now=None):
+        """Seconds remaining, never negative"""
+        if self.deadline is None:
+            return self.remaining
+        return max(0.0, self.deadline - (time.monotonic() if now is None else now))
+    
+    def display(self, now=None):
+        """Whole seconds to show: 14.2 s left reads 15, so every second on screen lasts a full second"""
+        return math.ceil(self.left(now))
+    
+    def next_change(self):
+        """When display() next changes (the deadline itself for the last second), or None if paused"""
+        deadline = self.deadline
+        if deadline is None:
+            return None
+        return deadline - max(0, self.display() - 1)
+    
+    def start(self):
+        if self.deadline is None:
+            self.deadline = time.monotonic() + self.remaining
+            self.deadline_ms = round(server_time_ms() + self.remaining * 1000)
+            self.token += 1
+            self.schedule()
+    
+    def pause(self):
+        if self.deadline is not None:
+            self.remaining = self.left()
+            self.deadline = self.deadline_ms = None
+            self.token += 1
+    
+    def set(self, seconds):
+        """Put seconds on the clock, still running if it was"""
+        running = self.running
+        self.deadline = self.deadline_ms = None
+        self.token += 1
+        self.remaining = max(0.0, float(seconds))
+        if running:
+            self.start()
+    
+    def schedule(self):
+        """Have the scheduler tick the running countdown at its deadline (the match clock in ticks mode: every second)"""
+        if self.deadline is not None:
+            ticks = timer_updates == 'ticks' and self.name == MATCH_TIMER
+            timer_scheduler.add(self.next_change() if ticks else self.deadline, self)
+    
+    def fields(self):
+        """What clients are told about the countdown"""
+        return {'value': self.display(), 'running': self.running, 'deadline': self.deadline_ms}
+
+class TimerScheduler:
+    """One thread that ticks the countdowns of every match when they are due
+    
+    Due times sit in a heap, so starting a countdown costs O(log n) however many
+    run. Entries are never taken out: a countdown paused, set or restarted since has
+    a new token and its old entry is dropped when it comes up.
+    """
+    
+    def __init__(self):
+        self.heap = []  # (time.monotonic() due, sequence, countdown, token)
+        self.sequence = 0
+        self.condition = threading.Condition()
+        self.stats = {'scheduled': 0, 'ticks': 0, 'stale': 0}
+    
+    def add(self, when, countdown):
+        with self.condition:
+            self.sequence += 1
+            self.stats['scheduled'] += 1
+            heapq.heappush(self.heap, (when, self.sequence, countdown, countdown.token))
+            if self.heap[0][1] == self.sequence:
+                self.condition.notify()  # New earliest entry: the thread re-plans its sleep
+    
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.heap or self.heap[0][0] > time.monotonic():
+                    self.condition.wait(self.heap[0][0] - time.monotonic() if self.heap else None)
+                _, _, countdown, token = heapq.heappop(self.heap)
+            match = matches.get(countdown.match_id)
+            if token != countdown.token or match is None:
+                self.stats['stale'] += 1
+                continue
+            self.stats['ticks'] += 1
+            match.store.submit(tick_timer, countdown, token)
+
+timer_scheduler = TimerScheduler()
+
+# Client clocks. The server pings every connected client NTP-style (a quick burst right
+# after it connects, then every CLOCK_SYNC_INTERVAL) and keeps the offset of its clock
+# from the round trip with the least delay, where the network adds the least error.
+# Each client gets its estimate back in clock_sync. Buzz and scoring events carry
+# a playAt time on the server clock, a little ahead, and every screen starts the
+# effect at that moment rather than whenever its packet happened to arrive.
+CLOCK_SYNC_INTERVAL = 10.0  # Seconds between pings once a client is synced
+CLOCK_SYNC_BURST = 8  # Pings right after connecting...
+CLOCK_SYNC_BURST_SPACING = 0.1  # ...this many seconds apart
+CLOCK_SAMPLES = 8  # Round trips the estimate is taken from
+CLOCK_PENDING_PINGS = 4  # Unanswered pings a pong may still answer
+PLAY_AT_LEAD_MS = 100  # Default lead of playAt: long enough for a broadcast to reach every screen
+play_at_lead_ms = PLAY_AT_LEAD_MS
+
+def play_at():
+    """Server time at which screens should start the effect of an event sent now (None when disabled)"""
+    return round(server_time_ms() + play_at_lead_ms) if play_at_lead_ms > 0 else None
+
+class ClientClock:
+    """NTP-style estimate of one client's clock: offset is server time minus client time"""
+    
+    def __init__(self, number, match_id, role):
+        self.number = number  # Shown on the diagnostics page instead of the session id
+        self.match_id = match_id
+        self.role = role
+        self.samples = deque(maxlen=CLOCK_SAMPLES)  # (delay, offset) in ms
+        self.pending = deque(maxlen=CLOCK_PENDING_PINGS)  # t1 of pings not answered yet
+        self.pings = 0
+        self.next_ping = time.monotonic()
+        self.synced_at = None
+    
+    def add_sample(self, t1, t2, t3, t4):
+        """t1/t4: ping sent/pong received on the server clock; t2/t3: ping received/pong sent on the client's"""
+        delay = max(0.0, (t4 - t1) - (t3 - t2))
+        offset = ((t1 - t2) + (t4 - t3)) / 2
+        self.samples.append((delay, offset))
+        self.synced_at = time.monotonic()
+    
+    def estimate(self):
+        """(offset, delay, jitter) in ms, or None before the first sample
+        
+        Jitter is the RMS distance of the other samples' offsets from the chosen one.
+        """
+        if not self.samples:
+            return None
+        delay, offset = min(self.samples)
+        jitter = math.sqrt(sum((other - offset) ** 2 for _, other in self.samples) / len(self.samples))
+        return offset, delay, jitter
+    
+    def summary(self):
+        estimate = self.estimate()
+        offset, delay, jitter = estimate if estimate else (None, None, None)
+        return {
+            'client': self.number,
+            'match': self.match_id,
+            'role': self.role,
+            'offsetMs': None if offset is None else round(offset, 2),
+            'delayMs': None if delay is None else round(delay, 2),
+            'jitterMs': None if jitter is None else round(jitter, 2),
+            'samples': len(self.samples),
+            'syncedAgoS': None if self.synced_at is None else round(time.monotonic() - self.synced_at, 1)
+        }
+
+class ClockService:
+    """Pings the connected clients from one thread and keeps a ClientClock per session"""
+    
+    def __init__(self):
+        self.clients = {}  # sid -> ClientClock
+        self.lock = threading.Condition()  # Also wakes run() when a client connects
+        self.connections = 0
+    
+    def add(self, sid, match_id, role):
+        with self.lock:
+            self.connections += 1
+            self.clients[sid] = ClientClock(self.connections, match_id, role)
+            self.lock.notify()
+    
+    def remove(self, sid):
+        with self.lock:
+            self.clients.pop(sid, None)
+    
+    def pong(self, sid, data):
+        """Record a clock_pong; returns the client's updated estimate, or None if the pong is not usable"""
+        t4 = server_time_ms()
+        try:
+            t1, t2, t3 = (float(data[key]) for key in ('t1', 't2', 't3'))
+        except (TypeError, KeyError, ValueError):
+            return None
+        with self.lock:
+            client = self.clients.get(sid)
+            if client is None or t1 not in client.pending:
+                return None
+            client.pending.remove(t1)
+            client.add_sample(t1, t2, t3, t4)
+            return client.estimate()
+    
+    def run(self):
+        while True:
+            with self.lock:
+                while True:
+                    # Due pings and the next wake-up are worked out under the lock that add() notifies
+                    # through, so a client connecting in between is never missed
+                    now = time.monotonic()
+                    due = []
+                    for sid, client in self.clients.items():
+                        if client.next_ping <= now:
+                            client.pings += 1
+                            burst = client.pings < CLOCK_SYNC_BURST
+                            client.next_ping = now + (CLOCK_SYNC_BURST_SPACING if burst else CLOCK_SYNC_INTERVAL)
+                            due.append((sid, client))
+                    if due:
+                        break
+                    wake_at = min((client.next_ping for client in self.clients.values()), default=now + CLOCK_SYNC_INTERVAL)
+                    self.lock.wait(wake_at - now)
+            for sid, client in due:
+                t1 = round(server_time_ms(), 3)
+                client.pending.append(t1)
+                socketio.emit('clock_ping', {'t1': t1}, to=sid)
+    
+    def report(self, match_id=None):
+        with self.lock:
+            clients = [client.summary() for client in self.clients.values()
+                       if match_id is None or client.match_id == match_id]
+        return {'serverTime': server_time_ms(), 'playAtLeadMs': play_at_lead_ms, 'clients': clients}
+
+clock_service = ClockService()
+
+class Match:
+    """One match: its state, the store that owns it, sync history, spectator feed, timers and Arduino
+    
+    Each match has its own dispatcher thread, so a backlog in one room never delays
+    the buzzes of another.
+    """
+    
+    def __init__(self, match_id, state=None):
+        self.id = match_id
+        self.epoch = f'{STATE_EPOCH}-{match_id}'
+        self.sync_room = f'match:{match_id}/{STATE_SYNC_ROOM}'
+        self.state = state if state is not None else new_game_state()
+        self.log = GameLog(self)
+        self.store = GameStateStore(self.state, self)
+        self.history = DeltaHistory(self)
+        self.feed = SpectatorFeed(self)
+        self.arduino = ArduinoSerial(match_id)
+        self.countdown = Countdown(self.state['timer']['value'], match_id)  # The match clock
+        self.timers = {}  # name -> Countdown, the named countdowns
+        self.store.listeners.append(self.history.record)
+    
+    def broadcast(self, event, *args, **kwargs):
+        """socketio.emit() to the clients of this match whose role consumes event"""
+        socketio.emit(event, *args, **route(event, kwargs, self.id))
+        if self.feed.wants(event, kwargs):
+            self.feed.publish([(event, args[0] if args else None)])
+
+matches = {}  # match id -> Match
+client_matches = {}  # sid -> match id
+client_rooms = {}  # sid -> role room (also for worker clients, which socketio.server.rooms() can't see)
+matches_lock = threading.Lock()
+
+def get_match(match_id, create=False):
+    """The match with match_id (started on first use if create), or None"""
+    match = matches.get(match_id)
+    if match is None and create and MATCH_ID_PATTERN.match(match_id or ''):
+        with matches_lock:
+            match = matches.get(match_id)
+            if match is None and len(matches) < MAX_MATCHES:
+                match = matches[match_id] = Match(match_id)
+                match.store.emit_window = main_match.store.emit_window
+                match.log.window = main_match.log.window
+                match.log.resize(main_match.log.capacity)
+                match.arduino.auto_reconnect = main_match.arduino.auto_reconnect
+                if not WORKER_PROCESS:
+                    match.store.start()
+                logger.info(f"🏟️ Match {match_id} started ({len(matches)} running)")
+    return match
+
+def current_match():
+    """The match of the client whose event is being handled (the default match elsewhere)"""
+    if has_request_context():
+        match = matches.get(client_matches.get(getattr(request, 'sid', None)))
+        if match:
+            return match
+    return matches[DEFAULT_MATCH]
+
+# The default match keeps the module-level names used by the tools in tests/
+main_match = matches[DEFAULT_MATCH] = Match(DEFAULT_MATCH)
+game_state = main_match.state
+state_store = main_match.store
+delta_history = main_match.history
+spectator_feed = main_match.feed
+arduino = main_match.arduino
+if not WORKER_PROCESS:
+    state_store.start()
 
 def create_self_signed_cert(cert_path="ssl/server.crt", key_path="ssl/server.key"):
     """Create a self-signed certificate for HTTPS development"""
@@ -415,7 +2106,6 @@ def create_self_signed_cert(cert_path="ssl/server.crt", key_path="ssl/server.key
         from cryptography.hazmat.primitives import hashes
         from cryptography.hazmat.primitives.asymmetric import rsa
         from cryptography.hazmat.primitives import serialization
-        import datetime
         
         logger.info(f"🔧 Generating self-signed certificate: {cert_path}, {key_path}")
         
@@ -526,84 +2216,194 @@ def serve_assets(filename):
 def index():
     """Serve the unified Among Us interface"""
     try:
-        with open('main.html', 'r') as f:
-            return f.read()
+        return render_page('main.html', 'display')
     except FileNotFoundError:
         return "<h1>Error: main.html not found</h1>", 404
 
 @app.route('/console')
 def console():
     """Serve the console page"""
-    with open('console.html', 'r', encoding='utf-8') as f:
-        return f.read()
+    return render_page('console.html', 'console')
+
+@app.route('/spectate')
+def spectate():
+    """Serve the read-only spectator scoreboard (?match=... picks the match)"""
+    from flask import send_from_directory
+    return send_from_directory('.', 'spectator.html')
+
+@app.route('/spectate/events')
+def spectate_events():
+    """Server-Sent Events feed of spectator events (EventSource resumes with Last-Event-ID)"""
+    from flask import Response
+    match = get_match(request.args.get('match', DEFAULT_MATCH), create=True)
+    if match is None:
+        return "Unknown match", 404
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    return Response(match.feed.stream(int(last_event_id) if last_event_id.isdigit() else None),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/diagnostics/clocks')
+def clock_diagnostics():
+    """Measured clock offset, delay and jitter of every connected client (?match=... narrows it)"""
+    return jsonify(clock_service.report(request.args.get('match')))
 
 
 
 
 
 @socketio.on('connect')
-def handle_connect():
+def handle_connect(auth=None):
     """Handle client connection"""
-    game_state['connected_clients'] += 1
-    logger.info(f'Client connected. Total: {game_state["connected_clients"]}')
-    emit('log', {'message': f'Client connected'}, broadcast=True)
+    auth = auth if isinstance(auth, dict) else {}
+    role = auth.get('role')
+    if role not in ROLES:
+        role = DEFAULT_ROLE
+    match = get_match(auth.get('match') or DEFAULT_MATCH, create=True)
+    if match is None:
+        raise ConnectionRefusedError(UNKNOWN_MATCH_MESSAGE)
+    client_matches[request.sid] = match.id
+    client_rooms[request.sid] = role_room(role, match.id)
+    join_room(client_rooms[request.sid])
+    clock_service.add(request.sid, match.id, role)
+    match.store.submit(count_client, 1)
+    match.broadcast('log', {'message': f'Client connected ({role})'})
+
+def count_client(tx, delta):
+    tx.set(('connected_clients',), max(0, tx.state['connected_clients'] + delta))
+    logger.info(f'Client {"connected" if delta > 0 else "disconnected"}. Total: {tx.state["connected_clients"]}')
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
-    game_state['connected_clients'] = max(0, game_state['connected_clients'] - 1)
-    logger.info(f'Client disconnected. Total: {game_state["connected_clients"]}')
+    client_rooms.pop(request.sid, None)
+    match = matches.get(client_matches.pop(request.sid, None))
+    if match is None:
+        return  # Refused when it connected (worker clients are only dropped after the owner refuses them)
+    match.store.submit(count_client, -1)
+    clock_service.remove(request.sid)
+
+def connect_arduino_in_background(port=None, baudrate=9600, read_mode='event', protocol='ascii',
+                                  max_baudrate=None, match=None):
+    """Start connecting the Arduino of match (default: the current one) without blocking the caller
+    
+    Progress is broadcast as 'arduino_connect_progress' and the outcome as 'arduino_status'.
+    Returns False if a connection attempt is already running.
+    """
+    match = match or current_match()
+    if not match.arduino.connect_lock.acquire(blocking=False):
+        match.broadcast('arduino_connect_progress', {'stage': 'busy', 'message': 'Arduino connection already in progress'})
+        return False
+    
+    socketio.start_background_task(_connect_arduino_task, match, port, baudrate, read_mode, protocol, max_baudrate)
+    return True
+
+def _connect_arduino_task(match, port, baudrate, read_mode, protocol, max_baudrate):
+    arduino = match.arduino
+    started = time.monotonic()
+    
+    def progress(stage, message):
+        match.broadcast('arduino_connect_progress', {
+            'stage': stage,
+            'message': message,
+            'elapsedMs': round((time.monotonic() - started) * 1000)
+        })
+    
+    try:
+        connected = arduino.connect(port, baudrate, read_mode, protocol, max_baudrate, progress=progress)
+        # What this connect picked (port may have been None); a disconnect can drop serial_port any time
+        device, rate, link = arduino.port_name, arduino.baudrate, arduino.protocol
+    finally:
+        arduino.connect_lock.release()
+    
+    if connected:
+        match.store.submit(set_state, ('arduino_connected',), True)
+        progress('connected', f"Arduino connected on {device} at {rate} baud")
+        match.broadcast('arduino_status', {
+            'connected': True,
+            'message': 'Arduino connected',
+            'protocol': link,
+            'baudrate': rate
+        })
+        match.broadcast('log', {'message': 'Arduino connected successfully'})
+    else:
+        match.store.submit(set_state, ('arduino_connected',), False)
+        logger.warning(f"⚠️ Arduino connection failed for match {match.id} - running in simulation mode")
+        progress('failed', 'Arduino connection failed')
+        match.broadcast('arduino_status', {'connected': False, 'message': 'Arduino connection failed'})
+        match.broadcast('log', {'message': 'Arduino connection failed'})
 
 @socketio.on('connect_arduino')
 def handle_connect_arduino(data):
     """Handle Arduino connection request"""
     port = data.get('port') if data else None
     baudrate = data.get('baudrate', 9600) if data else 9600
+    read_mode = data.get('readMode', 'event') if data else 'event'
+    protocol = data.get('protocol', 'ascii') if data else 'ascii'
+    max_baudrate = data.get('maxBaudrate') if data else None
     
-    if arduino.connect(port, baudrate):
-        game_state['arduino_connected'] = True
-        socketio.emit('arduino_status', {'connected': True, 'message': 'Arduino connected'})
-        socketio.emit('log', {'message': 'Arduino connected successfully'})
-    else:
-        game_state['arduino_connected'] = False
-        socketio.emit('arduino_status', {'connected': False, 'message': 'Arduino connection failed'})
-        socketio.emit('log', {'message': 'Arduino connection failed'})
+    connect_arduino_in_background(port, baudrate, read_mode, protocol, max_baudrate)
 
 @socketio.on('disconnect_arduino')
 def handle_disconnect_arduino():
     """Handle Arduino disconnection request"""
-    arduino.disconnect()
-    game_state['arduino_connected'] = False
-    socketio.emit('arduino_status', {'connected': False, 'message': 'Arduino disconnected'})
-    socketio.emit('log', {'message': 'Arduino disconnected'})
+    match = current_match()
+    match.arduino.disconnect()
+    match.store.submit(set_state, ('arduino_connected',), False)
+    broadcast('arduino_status', {'connected': False, 'message': 'Arduino disconnected'})
+    broadcast('log', {'message': 'Arduino disconnected'})
 
 @socketio.on('get_arduino_status')
 def handle_get_arduino_status():
     """Send current Arduino connection status to client"""
+    match = current_match()
+    arduino = match.arduino
     logger.info('📊 Arduino status request received')
     status = {
         'connected': arduino.is_connected,
-        'message': 'Arduino connected' if arduino.is_connected else 'Arduino not connected'
+        'message': 'Arduino connected' if arduino.is_connected else 'Arduino not connected',
+        'protocol': arduino.protocol,
+        'baudrate': arduino.baudrate if arduino.is_connected else None,
+        'reconnecting': bool(arduino.supervisor_thread and arduino.supervisor_thread.is_alive()),
+        'reconnects': dict(arduino.reconnect_stats),
+        'portCache': dict(port_registry.stats),
+        'writes': arduino.write_queue.summary(),
+        'resets': dict(arduino.reset_stats)
     }
-    socketio.emit('arduino_status', status)
+    status['stateStore'] = dict(match.store.stats, version=match.store.version, emits=dict(match.store.batcher.stats))
+    status['spectators'] = dict(match.feed.stats)
+    if arduino.is_connected and arduino.protocol == 'binary':
+        status['link'] = dict(arduino.frame_decoder.stats)
+    broadcast('arduino_status', status)
+
+def emit_simulated_armed(source, ready=False, message=None):
+    """Without a board there is nothing to confirm, so the buzzers are armed immediately"""
+    current_match().store.submit(simulated_armed, source, ready, message)
+
+def simulated_armed(tx, source, ready, message):
+    tx.set(('buzzers_armed',), True)
+    if ready:
+        tx.emit('buzzer_data', 'READY')
+    tx.emit('buzzers_armed', {'armed': True, 'source': source, 'simulated': True})
+    if message:
+        tx.emit('log', {'message': message})
 
 @socketio.on('reset_buzzers')
 def handle_reset(data=None):
     """Handle reset command - send to Arduino if connected"""
+    match = current_match()
     logger.info('🔄 Reset command received from client')
     
-    if arduino.is_connected:
+    if match.arduino.is_connected:
         # Send reset to real Arduino
         logger.info('📤 Sending RESET command to Arduino...')
-        arduino.write('RESET\n')
-        socketio.emit('log', {'message': 'Reset sent to Arduino'})
-        logger.info('✅ RESET command sent to Arduino successfully')
+        match.arduino.request_reset('reset_buzzers')
+        broadcast('log', {'message': 'Reset sent to Arduino'})
     else:
         # Simulate reset if no Arduino
         logger.warning('⚠️ Arduino not connected, simulating reset')
-        game_state['winner'] = None
-        socketio.emit('buzzer_data', 'READY')
-        socketio.emit('log', {'message': 'System reset (simulated)'})
+        match.store.submit(set_state, ('winner',), None)
+        emit_simulated_armed('reset_buzzers', True, 'System reset (simulated)')
         logger.info('✅ Simulated reset completed')
 
 @socketio.on('simulate_buzzer')
@@ -611,73 +2411,70 @@ def handle_simulate_buzzer(data):
     """Handle buzzer simulation for teams 1-6"""
     team_id = data.get('teamId', data.get('team', 1))
     
-    # Reset winner if it's been cleared
-    if game_state['winner'] is not None:
-        game_state['winner'] = None
-    
-    # Set new winner
-    game_state['winner'] = team_id
-    
-    # Broadcast to all clients
-    socketio.emit('buzzer_pressed', {'teamId': team_id})
-    add_log(f"Team {team_id} simulated buzz-in")
+    # Set new winner and broadcast to all clients
+    current_match().store.submit(force_buzz, team_id, f"Team {team_id} simulated buzz-in")
     
     logger.info(f"✅ Simulated Team {team_id} buzzed in successfully")
 
 @socketio.on('admin_reset')
 def handle_admin_reset(data=None):
     """Handle admin reset - Complete game state reset"""
+    match = current_match()
     logger.info('🔄 Admin reset - clearing all game state including cards and scores')
+    simulated = not match.arduino.is_connected
+    match.store.submit(reset_game, request.sid, simulated)  # One command, so clients get one frame
     
+    # Reset Arduino if connected
+    if not simulated:
+        match.arduino.request_reset('admin_reset')
+        broadcast('log', {'message': '🔄 Admin reset sent to Arduino - Complete game reset'})
+    
+    logger.info('✅ Admin reset completed - all game state cleared')
+
+def reset_game(tx, initiator_sid, simulated=False):
     # Reset all team scores and card states
-    for team_id in game_state['teams']:
-        game_state['teams'][team_id]['score'] = 0
-        game_state['teams'][team_id]['cards'] = {
+    for team_id in tx.state['teams']:
+        tx.set(('teams', team_id, 'score'), 0)
+        tx.set(('teams', team_id, 'cards'), {
             'angel': True,  # Reset to available
             'devil': True,  # Reset to available
             'cross': False, # Reset to not active
             'angelUsed': False, 
             'devilUsed': False
-        }
+        })
         logger.info(f'✅ Reset Team {team_id}: score=0, cards=available')
     
     # Reset game progress
-    game_state['current_set'] = 1
-    game_state['current_question'] = 1
-    game_state['current_team'] = 0
-    game_state['challenge_2x'] = False
-    game_state['winner'] = None
-    game_state['angel_team'] = 0
-    game_state['attack_team'] = 0
-    game_state['victim_team'] = 0
+    tx.set(('current_set',), 1)
+    tx.set(('current_question',), 1)
+    tx.set(('current_team',), 0)
+    tx.set(('challenge_2x',), False)
+    tx.set(('winner',), None)
+    tx.set(('angel_team',), 0)
+    tx.set(('attack_team',), 0)
+    tx.set(('victim_team',), 0)
     
     # Reset timer
-    game_state['timer_value'] = 15
-    game_state['timer_running'] = False
+    tx.set(('timer_value',), 15)
+    tx.set(('timer_running',), False)
     
     # Clear all Q1 failure tracking
     for set_number in range(1, 11):
-        game_state[f'q1_failed_teams_{set_number}'] = []
-        game_state[f'q1_attempts_{set_number}'] = 0
+        tx.set((f'q1_failed_teams_{set_number}',), [])
+        tx.set((f'q1_attempts_{set_number}',), 0)
     
     # Broadcast complete reset to all OTHER clients (not the one that initiated it)
-    socketio.emit('game_state_reset', {
-        'teams': game_state['teams'],
-        'current_set': game_state['current_set'],
-        'current_question': game_state['current_question'],
-        'timer_value': game_state['timer_value'],
-        'timer_running': game_state['timer_running']
-    }, skip_sid=request.sid)  # Skip the client that initiated the reset
-    
-    # Reset Arduino if connected
-    if arduino.is_connected:
-        arduino.write('RESET\n')
-        socketio.emit('log', {'message': '🔄 Admin reset sent to Arduino - Complete game reset'})
-    else:
-        socketio.emit('buzzer_data', 'READY')
-        socketio.emit('log', {'message': '🔄 Admin reset (simulated) - Complete game reset'})
-    
-    logger.info('✅ Admin reset completed - all game state cleared')
+    tx.emit('game_state_reset', {
+        'teams': tx.state['teams'],
+        'current_set': tx.state['current_set'],
+        'current_question': tx.state['current_question'],
+        'timer_value': tx.state['timer_value'],
+        'timer_running': tx.state['timer_running']
+    }, skip_sid=initiator_sid)  # Skip the client that initiated the reset
+    
+    # Without a board the buzzers are armed right away, in the same frame
+    if simulated:
+        simulated_armed(tx, 'admin_reset', True, '🔄 Admin reset (simulated) - Complete game reset')
 
 @socketio.on('get_serial_ports')
 def handle_get_serial_ports():
@@ -685,25 +2482,26 @@ def handle_get_serial_ports():
     ports = []
     if SERIAL_AVAILABLE:
         try:
-            import serial.tools.list_ports
-            for port in serial.tools.list_ports.comports():
+            for port in port_registry.ports():
                 ports.append({
                     'device': port.device,
                     'description': port.description or 'Unknown',
-                    'hwid': port.hwid or ''
+                    'hwid': port.hwid or '',
+                    'lastKnownGood': port_registry.last_good is not None and port_fingerprint(port) == port_registry.last_good
                 })
         except Exception as e:
             logger.error(f"Error listing ports: {e}")
     
-    socketio.emit('serial_ports', {'ports': ports, 'available': SERIAL_AVAILABLE})
+    broadcast('serial_ports', {'ports': ports, 'available': SERIAL_AVAILABLE, 'cache': dict(port_registry.stats)})
 
 # Among Us Quiz Bowl Event Handlers
 
 @socketio.on('refresh_ports')
 def handle_refresh_ports():
     """Refresh and send available serial ports"""
+    port_registry.invalidate()  # An explicit refresh always rescans; the TTL is for implicit lookups
     handle_get_serial_ports()
-    emit('ports_refreshed', {'ports': []})
+    broadcast('ports_refreshed', {'ports': []})
 
 @socketio.on('team_update')
 def handle_team_update(data):
@@ -712,23 +2510,26 @@ def handle_team_update(data):
     updates = data.get('updates', {})
     
     logger.info(f"🔄 Team update received: Team {team_id}, Updates: {updates}")
-    
-    if team_id in game_state['teams']:
-        old_state = game_state['teams'][team_id].copy()
-        game_state['teams'][team_id].update(updates)
-        logger.info(f"✅ Team {team_id} updated: {old_state} → {game_state['teams'][team_id]}")
+    current_match().store.submit(update_team, team_id, updates)
+
+def update_team(tx, team_id, updates):
+    if team_id in tx.state['teams']:
+        old_state = tx.state['teams'][team_id].copy()
+        for key, value in updates.items():
+            tx.set(('teams', team_id, key), value)
+        logger.info(f"✅ Team {team_id} updated: {old_state} → {tx.state['teams'][team_id]}")
         
         # Broadcast update to all clients
-        socketio.emit('team_update', {
+        tx.emit('team_update', {
             'teamId': team_id,
             'updates': updates
         })
         
         # Log the update
         if 'name' in updates:
-            add_log(f"Team {team_id} name changed to '{updates['name']}'")
+            tx.log(f"Team {team_id} name changed to '{updates['name']}'")
         if 'color' in updates:
-            add_log(f"Team {team_id} color changed to {updates['color']}")
+            tx.log(f"Team {team_id} color changed to {updates['color']}")
     else:
         logger.error(f"❌ Team {team_id} not found in game state")
 
@@ -740,12 +2541,14 @@ def handle_score_update(data):
     adjustment = data.get('adjustment', 0)
     correct = data.get('correct', adjustment > 0)
     reset = data.get('reset', False)
-    
-    if team_id in game_state['teams']:
-        game_state['teams'][team_id]['score'] = score
+    current_match().store.submit(update_score, team_id, score, adjustment, correct, reset)
+
+def update_score(tx, team_id, score, adjustment, correct, reset):
+    if team_id in tx.state['teams']:
+        tx.set(('teams', team_id, 'score'), score)
         
         # Broadcast score update
-        socketio.emit('score_update', {
+        tx.emit('score_update', {
             'teamId': team_id,
             'score': score,
             'adjustment': adjustment,
@@ -755,81 +2558,156 @@ def handle_score_update(data):
         
         # Log the score change
         if reset:
-            add_log(f"Team {team_id} score reset to 0")
+            tx.log(f"Team {team_id} score reset to 0")
         else:
             action = "correct" if correct else "incorrect"
-            challenge_text = " (2x Challenge)" if game_state['challenge_2x'] and adjustment != 0 else ""
-            add_log(f"Team {team_id} answered {action} and got {'+' if adjustment > 0 else ''}{adjustment}{challenge_text}")
+            challenge_text = " (2x Challenge)" if tx.state['challenge_2x'] and adjustment != 0 else ""
+            tx.log(f"Team {team_id} answered {action} and got {'+' if adjustment > 0 else ''}{adjustment}{challenge_text}")
 
 @socketio.on('set_timer')
 def handle_set_timer(data):
     """Set timer value"""
-    value = data.get('value', 15)
-    game_state['timer']['value'] = value
-    game_state['timer']['default'] = value
+    current_match().store.submit(set_timer, data.get('value', 15))
+
+def set_timer(tx, value):
+    tx.match.countdown.set(value)
+    tx.set(('timer', 'default'), value)
     
-    socketio.emit('timer_update', {
-        'value': value,
-        'running': game_state['timer']['running']
-    })
+    tx.emit('timer_update', sync_timer(tx))
     
-    add_log(f"Timer set to {format_time(value)}")
+    tx.log(f"Timer set to {format_time(value)}")
 
 @socketio.on('start_timer')
 def handle_start_timer():
     """Start the timer"""
-    game_state['timer']['running'] = True
-    
-    socketio.emit('timer_update', {
-        'value': game_state['timer']['value'],
-        'running': True
-    })
-    
-    add_log("Timer started")
+    current_match().store.submit(run_timer, True, "Timer started")
 
 @socketio.on('pause_timer')
 def handle_pause_timer():
     """Pause the timer"""
-    game_state['timer']['running'] = False
-    
-    socketio.emit('timer_update', {
-        'value': game_state['timer']['value'],
-        'running': False
-    })
-    
-    add_log("Timer paused")
+    current_match().store.submit(run_timer, False, "Timer paused")
 
 @socketio.on('stop_timer')
 def handle_stop_timer():
     """Stop the timer"""
-    game_state['timer']['running'] = False
+    current_match().store.submit(run_timer, False, "Timer stopped")
+
+def run_timer(tx, running, log_message):
+    countdown = tx.match.countdown
+    if running:
+        countdown.start()
+    else:
+        countdown.pause()
     
-    socketio.emit('timer_update', {
-        'value': game_state['timer']['value'],
-        'running': False
-    })
+    tx.emit('timer_update', sync_timer(tx))
     
-    add_log("Timer stopped")
+    tx.log(log_message)
 
 @socketio.on('reset_timer')
 def handle_reset_timer(data):
     """Reset timer to default or specified value"""
-    value = data.get('value', game_state['timer']['default'])
-    game_state['timer']['value'] = value
-    game_state['timer']['running'] = False
+    current_match().store.submit(reset_timer, data.get('value'))
+
+def reset_timer(tx, value):
+    if value is None:
+        value = tx.state['timer']['default']
+    tx.match.countdown.pause()
+    tx.match.countdown.set(value)
     
-    socketio.emit('timer_update', {
-        'value': value,
-        'running': False
-    })
+    tx.emit('timer_update', sync_timer(tx))
     
-    add_log("Timer reset")
+    tx.log("Timer reset")
 
 @socketio.on('timer_ended')
 def handle_timer_ended():
     """Handle timer reaching zero"""
-    game_state['timer']['running'] = False
-    add_log("Timer ended")
+    current_match().store.submit(end_timer)
+
+def end_timer(tx):
+    tx.match.countdown.pause()
+    sync_timer(tx)
+    tx.log("Timer ended")
+
+def sync_timer(tx):
+    """Copy the countdown into state['timer'] and return it as a timer_update payload"""
+    fields = tx.match.countdown.fields()
+    timer = tx.state['timer']
+    for key, value in fields.items():
+        if timer.get(key) != value:
+            tx.set(('timer', key), value)
+    return fields
+
+@socketio.on('set_countdown')
+def handle_set_countdown(data):
+    """Put seconds on a named countdown (created on first use); {'start': true} also starts it"""
+    current_match().store.submit(set_countdown, data.get('name'), data.get('value', 15), bool(data.get('start')))
+
+@socketio.on('start_countdown')
+def handle_start_countdown(data):
+    """Start or resume a named countdown"""
+    current_match().store.submit(run_countdown, data.get('name'), True)
+
+@socketio.on('pause_countdown')
+def handle_pause_countdown(data):
+    """Pause a named countdown"""
+    current_match().store.submit(run_countdown, data.get('name'), False)
+
+@socketio.on('clear_countdown')
+def handle_clear_countdown(data):
+    """Stop a named countdown and remove it"""
+    current_match().store.submit(clear_countdown, data.get('name'))
+
+def set_countdown(tx, name, value, start):
+    countdown = tx.match.timers.get(name)
+    if countdown is None:
+        if not isinstance(name, str) or name == MATCH_TIMER or not TIMER_NAME_PATTERN.match(name):
+            logger.warning(f"⚠️ Invalid countdown name: {name!r}")
+            return
+        if len(tx.match.timers) >= MAX_TIMERS:
+            logger.warning(f"⚠️ Countdown {name} not created - {MAX_TIMERS} already exist")
+            return
+        countdown = tx.match.timers[name] = Countdown(value, tx.match.id, name)
+    countdown.set(value)
+    if start:
+        countdown.start()
+    
+    tx.emit('countdown_update', sync_countdown(tx, name))
+    
+    tx.log(f"Countdown {name} set to {format_time(countdown.display())}")
+
+def run_countdown(tx, name, running):
+    countdown = tx.match.timers.get(name)
+    if countdown is None:
+        return
+    if running:
+        countdown.start()
+    else:
+        countdown.pause()
+    
+    tx.emit('countdown_update', sync_countdown(tx, name))
+    
+    tx.log(f"Countdown {name} {'started' if running else 'paused'}")
+
+def clear_countdown(tx, name):
+    countdown = tx.match.timers.pop(name, None)
+    if countdown is None:
+        return
+    countdown.pause()
+    tx.set(('timers', name), None)
+    
+    tx.emit('countdown_cleared', {'name': name})
+
+def sync_countdown(tx, name):
+    """Copy a named countdown into state['timers'] and return it as a countdown_update payload"""
+    fields = tx.match.timers[name].fields()
+    timer = tx.state['timers'].get(name)
+    if timer is None:
+        tx.set(('timers', name), dict(fields))
+    else:
+        for key, value in fields.items():
+            if timer.get(key) != value:
+                tx.set(('timers', name, key), value)
+    return dict(fields, name=name)
 
 @socketio.on('question_set_update')
 def handle_question_set_update(data):
@@ -839,19 +2717,24 @@ def handle_question_set_update(data):
     title = data.get('title', '')
     sub_question = data.get('subQuestion', 0)
     
-    game_state['question_set'].update({
+    current_match().store.submit(update_question_set, {
         'current': set_number,
         'subject': subject,
         'title': title,
         'sub_question': sub_question
-    })
-    
-    socketio.emit('question_set_update', {
+    }, ('question_set_update', {
         'setNumber': set_number,
         'subject': subject,
         'title': title,
         'subQuestion': sub_question
-    })
+    }))
+
+def update_question_set(tx, fields, broadcast, log_message=None):
+    for key, value in fields.items():
+        tx.set(('question_set', key), value)
+    tx.emit(*broadcast)
+    if log_message:
+        tx.log(log_message)
 
 @socketio.on('start_question_set')
 def handle_start_question_set(data):
@@ -859,32 +2742,31 @@ def handle_start_question_set(data):
     set_number = data.get('setNumber', 1)
     subject = data.get('subject', 'general')
     
-    game_state['question_set'].update({
+    current_match().store.submit(update_question_set, {
         'current': set_number,
         'subject': subject,
         'sub_question': 0
-    })
-    
-    socketio.emit('question_set_update', {
+    }, ('question_set_update', {
         'setNumber': set_number,
         'subject': subject,
         'subQuestion': 0
-    })
-    
-    add_log(f"Started Question Set {set_number}")
+    }), f"Started Question Set {set_number}")
 
 @socketio.on('reset_question_set')
 def handle_reset_question_set():
     """Reset question set to beginning"""
-    game_state['question_set']['sub_question'] = 0
+    current_match().store.submit(reset_question_set)
+
+def reset_question_set(tx):
+    tx.set(('question_set', 'sub_question'), 0)
     
-    socketio.emit('question_set_update', {
-        'setNumber': game_state['question_set']['current'],
-        'subject': game_state['question_set']['subject'],
+    tx.emit('question_set_update', {
+        'setNumber': tx.state['question_set']['current'],
+        'subject': tx.state['question_set']['subject'],
         'subQuestion': 0
     })
     
-    add_log("Question set reset")
+    tx.log("Question set reset")
 
 @socketio.on('action_card_used')
 def handle_action_card_used(data):
@@ -892,18 +2774,20 @@ def handle_action_card_used(data):
     team_id = data.get('teamId')
     card_type = data.get('cardType')
     used = data.get('used', True)
-    
-    if team_id in game_state['teams'] and card_type in ['angel', 'devil', 'cross']:
-        game_state['teams'][team_id]['cards'][card_type] = used
+    current_match().store.submit(use_action_card, team_id, card_type, used)
+
+def use_action_card(tx, team_id, card_type, used):
+    if team_id in tx.state['teams'] and card_type in ['angel', 'devil', 'cross']:
+        tx.set(('teams', team_id, 'cards', card_type), used)
         
-        socketio.emit('action_card_used', {
+        tx.emit('action_card_used', {
             'teamId': team_id,
             'cardType': card_type,
             'used': used
         })
         
         action = "used" if used else "reset"
-        add_log(f"Team {team_id} {card_type} card {action}")
+        tx.log(f"Team {team_id} {card_type} card {action}")
 
 @socketio.on('card_update')
 def handle_card_update(data):
@@ -912,22 +2796,25 @@ def handle_card_update(data):
     card_type = data.get('cardType')
     active = data.get('active', False)
     used = data.get('used', False)
-    
-    if team_id in game_state['teams']:
+    current_match().store.submit(update_card, team_id, card_type, active, used)
+
+def update_card(tx, team_id, card_type, active, used):
+    if team_id in tx.state['teams']:
+        cards = ('teams', team_id, 'cards')
         if card_type == 'angel':
             if used:
-                game_state['teams'][team_id]['cards']['angelUsed'] = True
-                game_state['teams'][team_id]['cards']['angel'] = False
+                tx.set(cards + ('angelUsed',), True)
+                tx.set(cards + ('angel',), False)
             else:
-                game_state['teams'][team_id]['cards']['angel'] = active
+                tx.set(cards + ('angel',), active)
         elif card_type == 'devil':
             if used:
-                game_state['teams'][team_id]['cards']['devilUsed'] = True
+                tx.set(cards + ('devilUsed',), True)
         elif card_type == 'cross':
-            game_state['teams'][team_id]['cards']['cross'] = active
+            tx.set(cards + ('cross',), active)
         
         # Broadcast to all clients
-        socketio.emit('card_update', {
+        tx.emit('card_update', {
             'teamId': team_id,
             'cardType': card_type,
             'active': active,
@@ -935,7 +2822,7 @@ def handle_card_update(data):
         })
         
         action_text = "used" if used else ("activated" if active else "deactivated")
-        add_log(f"Team {team_id} {card_type} card {action_text}")
+        tx.log(f"Team {team_id} {card_type} card {action_text}")
 
 @socketio.on('devil_attack')
 def handle_devil_attack(data):
@@ -943,46 +2830,48 @@ def handle_devil_attack(data):
     attacker_id = data.get('attackerId')
     target_id = data.get('targetId')
     new_score = data.get('newScore')
-    
-    if attacker_id in game_state['teams'] and target_id in game_state['teams']:
+    current_match().store.submit(devil_attack, attacker_id, target_id, new_score)
+
+def devil_attack(tx, attacker_id, target_id, new_score):
+    if attacker_id in tx.state['teams'] and target_id in tx.state['teams']:
         # Mark devil as used for attacker
-        game_state['teams'][attacker_id]['cards']['devilUsed'] = True
+        tx.set(('teams', attacker_id, 'cards', 'devilUsed'), True)
         
         # Update target score
-        game_state['teams'][target_id]['score'] = new_score
+        tx.set(('teams', target_id, 'score'), new_score)
         
         # Activate cross protection for target
-        game_state['teams'][target_id]['cards']['cross'] = True
+        tx.set(('teams', target_id, 'cards', 'cross'), True)
         
         # Broadcast devil attack to all clients
-        socketio.emit('devil_attack', {
+        tx.emit('devil_attack', {
             'attackerId': attacker_id,
             'targetId': target_id,
             'newScore': new_score
         })
         
         # Broadcast card updates
-        socketio.emit('card_update', {
+        tx.emit('card_update', {
             'teamId': attacker_id,
             'cardType': 'devil',
             'used': True
         })
         
-        socketio.emit('card_update', {
+        tx.emit('card_update', {
             'teamId': target_id,
             'cardType': 'cross',
             'active': True
         })
         
         # Broadcast score update
-        socketio.emit('score_update', {
+        tx.emit('score_update', {
             'teamId': target_id,
             'score': new_score,
             'adjustment': -1,
             'correct': False
         })
         
-        add_log(f"Team {attacker_id} devil attacked Team {target_id} (-1 point, cross activated)")
+        tx.log(f"Team {attacker_id} devil attacked Team {target_id} (-1 point, cross activated)")
 
 @socketio.on('resolve_devil_challenge')
 def handle_resolve_devil_challenge(data):
@@ -990,9 +2879,9 @@ def handle_resolve_devil_challenge(data):
     target_team_id = data.get('targetTeamId')
     answered_correctly = data.get('answeredCorrectly', False)
     
-    if target_team_id in game_state['teams']:
+    if target_team_id in current_match().state['teams']:  # Team ids never change, so no command needed
         # Broadcast to all clients to resolve the challenge
-        socketio.emit('resolve_devil_challenge', {
+        broadcast('resolve_devil_challenge', {
             'targetTeamId': target_team_id,
             'answeredCorrectly': answered_correctly
         })
@@ -1006,38 +2895,38 @@ def handle_resolve_devil_challenge(data):
 def handle_challenge_update(data):
     """Handle 2x challenge toggle"""
     enabled = data.get('enabled', False)
-    game_state['challenge_2x'] = enabled
+    current_match().store.submit(set_challenge, enabled)
+
+def set_challenge(tx, enabled):
+    tx.set(('challenge_2x',), enabled)
     
-    socketio.emit('challenge_update', {'enabled': enabled})
+    tx.emit('challenge_update', {'enabled': enabled})
     
-    add_log(f"2x Challenge {'enabled' if enabled else 'disabled'}")
+    tx.log(f"2x Challenge {'enabled' if enabled else 'disabled'}")
 
 @socketio.on('clear_buzzers')
 def handle_clear_buzzers():
     """Clear all buzzers"""
-    game_state['winner'] = None
-    
-    if arduino.is_connected:
-        arduino.write('RESET\n')
+    match = current_match()
+    match.store.submit(clear_buzzers)
     
-    socketio.emit('clear_buzzers')
-    add_log("All buzzers cleared")
+    if match.arduino.is_connected:
+        match.arduino.request_reset('clear_buzzers')
+    else:
+        emit_simulated_armed('clear_buzzers')
+
+def clear_buzzers(tx):
+    tx.set(('winner',), None)
+    tx.emit('clear_buzzers')
+    tx.log("All buzzers cleared")
 
 @socketio.on('buzzer_pressed')
 def handle_buzzer_pressed(data):
     """Handle buzzer press from Arduino or simulation"""
     team_id = data.get('teamId')
     
-    # Reset winner if it's been cleared
-    if game_state['winner'] is not None:
-        game_state['winner'] = None
-    
-    # Set new winner
-    game_state['winner'] = team_id
-    
-    # Broadcast to all clients
-    socketio.emit('buzzer_pressed', {'teamId': team_id})
-    add_log(f"Team {team_id} buzzed in!")
+    # Set new winner and broadcast to all clients
+    current_match().store.submit(force_buzz, team_id, f"Team {team_id} buzzed in!")
     
     logger.info(f"✅ Team {team_id} buzzed in successfully")
 
@@ -1051,24 +2940,21 @@ def handle_progress_update(data):
     progress_percentage = data.get('progressPercentage', 0)
     animate_run = data.get('animateRun', False)
     
-    # Update game state
-    game_state['question_set'].update({
+    # Update game state and broadcast to all clients
+    current_match().store.submit(update_question_set, {
         'current': set_number,
         'question_number': question_number,
         'title': title,
         'subject': subject,
         'progress': progress_percentage
-    })
-    
-    # Broadcast to all clients
-    socketio.emit('progress_update', {
+    }, ('progress_update', {
         'setNumber': set_number,
         'questionNumber': question_number,
         'title': title,
         'subject': subject,
         'progressPercentage': progress_percentage,
         'animateRun': animate_run
-    })
+    }))
 
 @socketio.on('character_update')
 def handle_character_update(data):
@@ -1082,7 +2968,7 @@ def handle_character_update(data):
     # Handle character position updates (from console navigation)
     if set_number is not None and question_number is not None:
         # Broadcast to all clients for character movement
-        socketio.emit('character_update', {
+        broadcast('character_update', {
             'setNumber': set_number,
             'questionNumber': question_number,
             'animateRun': animate_run
@@ -1092,30 +2978,25 @@ def handle_character_update(data):
     
     # Handle character color updates (from team selection)
     elif team_id is not None and color is not None:
-        if team_id in game_state['teams']:
-            game_state['teams'][team_id]['color'] = color
-            
-            # Broadcast to all clients
-            socketio.emit('character_update', {
-                'teamId': team_id,
-                'color': color
-            })
+        current_match().store.submit(set_team_color, team_id, color)
+
+def set_team_color(tx, team_id, color):
+    if team_id in tx.state['teams']:
+        tx.set(('teams', team_id, 'color'), color)
+        
+        # Broadcast to all clients
+        tx.emit('character_update', {
+            'teamId': team_id,
+            'color': color
+        })
 
 @socketio.on('test_buzzer')
 def handle_test_buzzer(data):
     """Handle test buzzer press from keyboard shortcuts"""
     team_id = data.get('teamId')
     
-    # Reset winner if it's been cleared
-    if game_state['winner'] is not None:
-        game_state['winner'] = None
-    
-    # Set new winner
-    game_state['winner'] = team_id
-    
-    # Broadcast to all clients
-    socketio.emit('buzzer_pressed', {'teamId': team_id})
-    add_log(f"Team {team_id} test buzz-in")
+    # Set new winner and broadcast to all clients
+    current_match().store.submit(force_buzz, team_id, f"Team {team_id} test buzz-in")
     
     logger.info(f"✅ Test Team {team_id} buzzed in successfully")
 
@@ -1127,10 +3008,11 @@ def handle_scoring_action(data):
     action = data.get('action', 'correct')
     
     # Broadcast to all clients to trigger animations
-    socketio.emit('scoring_action', {
+    broadcast('scoring_action', {
         'teamId': team_id,
         'isPositive': is_positive,
-        'action': action
+        'action': action,
+        'playAt': play_at()
     })
     
     add_log(f"Scoring action: Team {team_id} {action}")
@@ -1143,7 +3025,7 @@ def handle_angel_card_action(data):
     action = data.get('action', 'toggle')
     
     # Broadcast to all clients
-    socketio.emit('angel_card_action', {
+    broadcast('angel_card_action', {
         'teamId': team_id,
         'action': action
     })
@@ -1158,7 +3040,7 @@ def handle_devil_card_action(data):
     action = data.get('action', 'toggle')
     
     # Broadcast to all clients
-    socketio.emit('devil_card_action', {
+    broadcast('devil_card_action', {
         'teamId': team_id,
         'action': action
     })
@@ -1174,7 +3056,7 @@ def handle_challenge_mode_action(data):
     action = data.get('action', 'toggle')
     
     # Broadcast to all clients
-    socketio.emit('challenge_mode_action', {
+    broadcast('challenge_mode_action', {
         'enabled': enabled,
         'teamId': team_id,
         'action': action
@@ -1193,7 +3075,7 @@ def handle_navigation_action(data):
     to_question = data.get('toQuestion', 1)
     
     # Broadcast to all clients
-    socketio.emit('navigation_action', {
+    broadcast('navigation_action', {
         'direction': direction,
         'fromSet': from_set,
         'fromQuestion': from_question,
@@ -1211,7 +3093,7 @@ def handle_buzzer_reset_action(data):
     reason = data.get('reason', 'manual_reset')
     
     # Broadcast to all clients
-    socketio.emit('buzzer_reset_action', {
+    broadcast('buzzer_reset_action', {
         'action': action,
         'reason': reason
     })
@@ -1224,7 +3106,7 @@ def handle_buzzer_reset_action(data):
 def handle_angel_card_toggle(data):
     """Handle angel card toggle from console"""
     team_id = data.get('teamId')
-    socketio.emit('angel_card_toggle', {'teamId': team_id})
+    broadcast('angel_card_toggle', {'teamId': team_id})
     add_log(f"Angel card toggle: Team {team_id}")
     logger.info(f"✅ Angel card toggle broadcast: Team {team_id}")
 
@@ -1232,7 +3114,7 @@ def handle_angel_card_toggle(data):
 def handle_devil_card_toggle(data):
     """Handle devil card toggle from console"""
     team_id = data.get('teamId')
-    socketio.emit('devil_card_toggle', {'teamId': team_id})
+    broadcast('devil_card_toggle', {'teamId': team_id})
     add_log(f"Devil card toggle: Team {team_id}")
     logger.info(f"✅ Devil card toggle broadcast: Team {team_id}")
 
@@ -1240,21 +3122,21 @@ def handle_devil_card_toggle(data):
 def handle_challenge_mode_toggle(data):
     """Handle challenge mode toggle from console"""
     team_id = data.get('teamId')
-    socketio.emit('challenge_mode_toggle', {'teamId': team_id})
+    broadcast('challenge_mode_toggle', {'teamId': team_id})
     add_log(f"Challenge mode toggle: Team {team_id}")
     logger.info(f"✅ Challenge mode toggle broadcast: Team {team_id}")
 
 @socketio.on('navigation_previous')
 def handle_navigation_previous():
     """Handle navigation previous from console"""
-    socketio.emit('navigation_previous')
+    broadcast('navigation_previous')
     add_log("Navigation: Previous question")
     logger.info("✅ Navigation previous broadcast")
 
 @socketio.on('navigation_next')
 def handle_navigation_next():
     """Handle navigation next from console"""
-    socketio.emit('navigation_next')
+    broadcast('navigation_next')
     add_log("Navigation: Next question")
     logger.info("✅ Navigation next broadcast")
 
@@ -1262,7 +3144,7 @@ def handle_navigation_next():
 def handle_scoring_correct(data):
     """Handle scoring correct from console"""
     team_id = data.get('teamId')
-    socketio.emit('scoring_correct', {'teamId': team_id})
+    broadcast('scoring_correct', {'teamId': team_id})
     add_log(f"Scoring correct: Team {team_id}")
     logger.info(f"✅ Scoring correct broadcast: Team {team_id}")
 
@@ -1270,7 +3152,7 @@ def handle_scoring_correct(data):
 def handle_scoring_incorrect(data):
     """Handle scoring incorrect from console"""
     team_id = data.get('teamId')
-    socketio.emit('scoring_incorrect', {'teamId': team_id})
+    broadcast('scoring_incorrect', {'teamId': team_id})
     add_log(f"Scoring incorrect: Team {team_id}")
     logger.info(f"✅ Scoring incorrect broadcast: Team {team_id}")
 
@@ -1281,54 +3163,75 @@ def handle_game_state_update(data):
     value = data.get('value')
     
     if path and value is not None:
-        # Update game state
-        keys = path.split('.')
-        current = game_state
-        
-        for key in keys[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
-        
-        current[keys[-1]] = value
-        
-        # Broadcast to all clients
-        socketio.emit('game_state_update', {
-            'path': path,
-            'value': value
-        })
-        
-        add_log(f"Game state updated: {path} = {value}")
+        # Update game state and broadcast to all clients
+        current_match().store.submit(update_path, path, value)
         logger.info(f"✅ Game state update broadcast: {path} = {value}")
 
+def update_path(tx, path, value):
+    tx.set(tuple(path.split('.')), value)
+    
+    tx.emit('game_state_update', {
+        'path': path,
+        'value': value
+    })
+    
+    # Keep the countdown in step with console edits of the timer
+    if path in ('timer.value', 'timer.running'):
+        countdown = tx.match.countdown
+        if path == 'timer.value':
+            countdown.set(value)
+        elif value:
+            countdown.start()
+        else:
+            countdown.pause()
+        tx.emit('timer_update', sync_timer(tx))
+    
+    tx.log(f"Game state updated: {path} = {value}")
+
 @socketio.on('get_server_state')
 def handle_get_server_state(data):
-    """Return current server state to client"""
+    """Return current server state to client
+    
+    Clients that send {'since': version, 'epoch': epoch} get a 'state_sync' with just the
+    changes they missed and then receive live 'state_delta's; others get the full state.
+    """
+    match = current_match()
+    if data and 'since' in data:
+        join_room(match.sync_room)
+        payload = match.store.call(state_sync_payload, data.get('since'), data.get('epoch'))
+        emit('state_sync', payload)
+        kind = f"{len(payload['deltas'])} delta(s)" if 'deltas' in payload else 'snapshot'
+        logger.info(f"📤 State sync to client: {kind} up to version {payload['version']}")
+        return
+    
     logger.info("📤 Sending server state to client")
-    logger.info(f"📊 Current teams: {game_state['teams']}")
+    state, version = match.store.call(snapshot_state)
+    logger.info(f"📊 Current teams: {state['teams']}")
     
     # Emit the current game state back to the requesting client
-    emit('server_state_response', game_state)
+    emit('server_state_response', state)
     logger.info("✅ Server state sent successfully")
 
-def add_log(message, type='info'):
-    """Add entry to game logs"""
-    import datetime
-    
-    log_entry = {
-        'timestamp': datetime.datetime.now().isoformat(),
-        'message': message,
-        'type': type
-    }
-    
-    game_state['logs'].append(log_entry)
+@socketio.on('time_sync')
+def handle_time_sync(data=None):
+    """Clock handshake: echo the client's send time with the server clock (see server_time_ms)
     
-    # Keep only last 100 log entries
-    if len(game_state['logs']) > 100:
-        game_state['logs'] = game_state['logs'][-100:]
-    
-    # Broadcast to all clients
-    socketio.emit('log_update', log_entry)
+    For scripts and older pages; the pages answer the clock service's clock_ping instead.
+    The client takes the offset from the round trip with the smallest delay.
+    """
+    emit('time_sync', {'clientTime': (data or {}).get('clientTime'), 'serverTime': server_time_ms()})
+
+@socketio.on('clock_pong')
+def handle_clock_pong(data=None):
+    """A client's answer to clock_ping: update its offset estimate and send it back"""
+    estimate = clock_service.pong(request.sid, data if isinstance(data, dict) else {})
+    if estimate is not None:
+        offset, delay, jitter = estimate
+        emit('clock_sync', {'offset': round(offset, 2), 'delay': round(delay, 2), 'jitter': round(jitter, 2)})
+
+def add_log(message, type='info'):
+    """Add entry to game logs (applied and broadcast by the state store)"""
+    current_match().store.submit(append_log, message, type)
 
 def format_time(seconds):
     """Format seconds into MM:SS format"""
@@ -1336,32 +3239,302 @@ def format_time(seconds):
     secs = seconds % 60
     return f"{mins}:{secs:02d}"
 
-# Timer background thread
-def timer_thread():
-    """Background thread to handle timer countdown"""
-    while True:
-        time.sleep(1)
-        if game_state['timer']['running'] and game_state['timer']['value'] > 0:
-            game_state['timer']['value'] -= 1
-            
-            # Broadcast timer update
-            socketio.emit('timer_update', {
-                'value': game_state['timer']['value'],
-                'running': game_state['timer']['running']
-            })
-            
-            # Check if timer reached zero
-            if game_state['timer']['value'] == 0:
-                game_state['timer']['running'] = False
-                socketio.emit('timer_ended')
-                add_log("Timer ended")
+def tick_timer(tx, countdown, token):
+    """A countdown's scheduled moment has come: end it at zero (in ticks mode, the match clock also shows each second)"""
+    if countdown.token != token or not countdown.running:
+        return
+    value = countdown.display()
+    if countdown.name != MATCH_TIMER:
+        if value == 0:
+            countdown.pause()
+            tx.emit('countdown_ended', sync_countdown(tx, countdown.name))
+            tx.log(f"Countdown {countdown.name} ended")
+        else:
+            countdown.schedule()
+        return
+    if timer_updates == 'ticks' and value != tx.state['timer']['value']:
+        tx.set(('timer', 'value'), value)
+        
+        # Broadcast timer update
+        tx.emit('timer_update', {
+            'value': value,
+            'running': True,
+            'deadline': countdown.deadline_ms
+        })
+    
+    # Check if timer reached zero
+    if value == 0:
+        countdown.pause()
+        sync_timer(tx)
+        tx.emit('timer_ended')
+        tx.log("Timer ended")
+    else:
+        countdown.schedule()
 
 # Start timer thread
-timer_bg_thread = threading.Thread(target=timer_thread, daemon=True)
-timer_bg_thread.start()
+timer_bg_thread = threading.Thread(target=timer_scheduler.run, name='timer-scheduler', daemon=True)
+clock_bg_thread = threading.Thread(target=clock_service.run, name='clock-sync', daemon=True)
+if not WORKER_PROCESS:
+    timer_bg_thread.start()
+    clock_bg_thread.start()
+
+def _disable_nagle(sock):
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (OSError, AttributeError):
+        pass
+
+# Multi-process mode (--workers N). The process started by hand is the owner: it alone
+# holds the matches (state, timer, ArduinoSerial devices) and publishes buzz events.
+# Workers on the following ports only terminate connections: every Socket.IO event they
+# receive is relayed to the owner over the message queue, and the owner's emits (replies,
+# room joins, broadcasts) reach their clients through python-socketio's pub/sub manager
+# on the same channel. Put a load balancer with sticky sessions in front, or use
+# --websocket-only so every client is a single connection.
+process_role = 'single'  # single | owner | worker
+LOCAL_QUEUE_SCHEME = 'unix://'
+DEFAULT_LOCAL_QUEUE = LOCAL_QUEUE_SCHEME + os.path.join(tempfile.gettempdir(), 'quiz-buzzer-queue.sock')
+OWNER_CHECK_INTERVAL = 1.0
+
+class LocalQueueBroker:
+    """Stand-in for a Redis server: relays each newline-delimited message to every other
+    connection on a Unix socket"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.connections = []
+        self.lock = threading.Lock()
+    
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        self.listener.listen(64)
+        threading.Thread(target=self._accept_loop, name='queue-broker', daemon=True).start()
+    
+    def _accept_loop(self):
+        while True:
+            connection, _ = self.listener.accept()
+            with self.lock:
+                self.connections.append(connection)
+            threading.Thread(target=self._relay_loop, args=(connection,), daemon=True).start()
+    
+    def _relay_loop(self, connection):
+        try:
+            for line in connection.makefile('rb'):
+                with self.lock:  # Also keeps concurrent messages from interleaving on a subscriber
+                    for subscriber in self.connections:
+                        if subscriber is not connection:
+                            try:
+                                subscriber.sendall(line)
+                            except OSError:
+                                pass
+        finally:
+            with self.lock:
+                self.connections.remove(connection)
+            connection.close()
+
+class LocalQueueManager(PubSubManager):
+    """python-socketio client manager for a LocalQueueBroker (unix:///path/to/socket)"""
+    
+    name = 'localqueue'
+    
+    def __init__(self, url=DEFAULT_LOCAL_QUEUE, channel='socketio', write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.path = url[len(LOCAL_QUEUE_SCHEME):]
+        self.connection = None
+        self.send_lock = threading.Lock()
+    
+    def _connected(self):
+        with self.send_lock:
+            if self.connection is None:
+                self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.connection.connect(self.path)
+            return self.connection
+    
+    def _publish(self, data):
+        line = (self.json.dumps(data) + '\n').encode()
+        connection = self._connected()
+        with self.send_lock:
+            connection.sendall(line)
+    
+    def _listen(self):
+        yield from self._connected().makefile('rb')
+
+class QueueBridge:
+    """Client manager mixin: handles this server's own messages on the Socket.IO channel
+    (relayed events, spectator frames) and passes the rest on to python-socketio"""
+    
+    def _listen(self):
+        for message in super()._listen():
+            try:
+                data = message if isinstance(message, dict) else json.loads(message)
+            except ValueError:
+                yield message
+                continue
+            if not isinstance(data, dict) or data.get('method') not in BRIDGE_METHODS:
+                yield message
+                continue
+            handler = BRIDGE_METHODS[data['method']].get(process_role)
+            if handler:
+                try:
+                    handler(data)
+                except Exception as e:
+                    logger.error(f"❌ Queue message {data['method']} failed: {e}")
+
+def queue_manager(url):
+    """Client manager for a message queue URL: unix:// (LocalQueueBroker), redis:// or a kombu URL"""
+    if url.startswith(LOCAL_QUEUE_SCHEME):
+        base = LocalQueueManager
+    elif url.startswith(('redis://', 'rediss://')):
+        base = RedisManager
+    else:
+        base = KombuManager
+    return type(f'Bridged{base.__name__}', (QueueBridge, base), {})(url)
+
+def attach_message_queue(url, role):
+    global process_role
+    process_role = role
+    manager = queue_manager(url)
+    manager.set_server(socketio.server)
+    socketio.server.manager = manager
+    socketio.server.manager_initialized = True
+    manager.initialize()
+
+def queue_publish(message):
+    socketio.server.manager._publish(message)
+
+CONNECT_VERDICT_TIMEOUT = 5.0  # Worker mode: how long a connecting client waits for the owner's handler
+connect_verdicts = {}  # Worker mode: sid -> [Event, refusal reason] of relayed connects
+
+def relay_event(event, sid, *args):
+    """Worker mode: hand a client's event to the owner process"""
+    if event == 'connect':
+        args = args[1:]  # (environ, auth) - only the auth payload travels
+    elif event == 'disconnect':
+        args = ()
+    queue_publish({'method': 'relay', 'event': event, 'sid': sid, 'args': list(args)})
+
+def relay_connect(sid, environ, auth=None):
+    """Worker mode: relay a connect and refuse the client if the owner's connect handler does"""
+    match_id = auth.get('match') if isinstance(auth, dict) else None
+    if not MATCH_ID_PATTERN.match(match_id or DEFAULT_MATCH):
+        raise ConnectionRefusedError(UNKNOWN_MATCH_MESSAGE)  # No need to ask the owner
+    verdict = connect_verdicts[sid] = [threading.Event(), None]
+    relay_event('connect', sid, environ, auth)
+    verdict[0].wait(CONNECT_VERDICT_TIMEOUT)  # No answer yet: accept, a late refusal still drops the client
+    connect_verdicts.pop(sid, None)
+    if verdict[1]:
+        raise ConnectionRefusedError(verdict[1])
+
+def connect_verdict(message):
+    """Worker mode: the owner's answer to a relayed connect (reason is None if it accepted)"""
+    verdict = connect_verdicts.get(message['sid'])
+    if verdict is not None:
+        verdict[1] = message['reason']
+        verdict[0].set()
+    elif message['reason'] and socketio.server.manager.is_connected(message['sid'], '/'):
+        logger.warning(f"🚫 Client refused by the owner after connecting: {message['reason']}")
+        socketio.server.disconnect(message['sid'])
+
+def run_relayed_event(message):
+    """Owner mode: run a worker client's event through the regular handler, as that client"""
+    handler = socketio.server.handlers['/'].get(message['event'])
+    if handler is None:
+        return
+    with app.test_request_context('/socket.io/'):
+        request.sid = message['sid']
+        request.namespace = '/'
+        request.event = {'message': message['event'], 'args': message['args']}
+        if message['event'] != 'connect':
+            getattr(handler, '__wrapped__', handler)(*message['args'])
+            return
+        try:
+            getattr(handler, '__wrapped__', handler)(*message['args'])
+            reason = None
+        except ConnectionRefusedError as e:
+            reason = str(e)
+        queue_publish({'method': 'connect_verdict', 'sid': message['sid'], 'reason': reason})
+
+# Queue methods of this server -> what each process role does with them
+BRIDGE_METHODS = {
+    'relay': {'owner': run_relayed_event},
+    'connect_verdict': {'worker': connect_verdict},
+    'spectator': {'worker': lambda message: get_match(message['match'], create=True).feed.ingest(message)},
+    'spectator_snapshot': {'worker': lambda message: get_match(message['match'], create=True).feed.ingest_snapshot(message)},
+    'spectator_resync': {'owner': lambda message: socketio.start_background_task(
+        get_match(message['match'], create=True).feed.send_snapshot)},
+}
+
+def become_worker(queue_url, owner_pid):
+    """Relay every Socket.IO event to the owner and exit when the owner does"""
+    attach_message_queue(queue_url, 'worker')
+    handlers = socketio.server.handlers['/']
+    for event in list(handlers):
+        handlers[event] = lambda sid, *args, event=event: relay_event(event, sid, *args)
+    handlers['connect'] = relay_connect
+    
+    def watch_owner():
+        while os.getppid() == owner_pid:
+            time.sleep(OWNER_CHECK_INTERVAL)
+        os._exit(0)
+    
+    threading.Thread(target=watch_owner, name='owner-watch', daemon=True).start()
+
+def start_workers(args, queue_url, count):
+    """Launch count worker processes on the ports after args.port"""
+    command = [sys.executable, os.path.abspath(__file__), '--worker-of', str(os.getpid()),
+               '--message-queue', queue_url, '--host', args.host, '--no-arduino',
+               '--async-mode', ASYNC_MODE, '--serve', args.serve, '--transport-policy', transport_policy,
+               '--emit-batch-ms', str(args.emit_batch_ms), '--timer-updates', args.timer_updates]
+    if args.https:
+        command += ['--https', '--cert', args.cert, '--key', args.key]
+    return [subprocess.Popen(command + ['--port', str(args.port + index)], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             stdout=subprocess.DEVNULL)
+            for index in range(1, count)]
+
+def low_latency_server_options():
+    """socketio.run() options that turn off Nagle's algorithm on client connections
+    
+    A WebSocket often sends two small frames back to back (e.g. a broadcast log line
+    and the namespace connect reply). With Nagle on, the second waits for the client's
+    delayed ACK, adding ~40 ms. None of the servers set TCP_NODELAY themselves.
+    """
+    if ASYNC_MODE == 'threading':
+        from werkzeug.serving import WSGIRequestHandler
+        
+        class NoDelayRequestHandler(WSGIRequestHandler):
+            disable_nagle_algorithm = True
+        
+        return {'request_handler': NoDelayRequestHandler}
+    if ASYNC_MODE == 'eventlet':
+        import eventlet.wsgi
+        
+        class NoDelayHttpProtocol(eventlet.wsgi.HttpProtocol):
+            minimum_chunk_size = 0  # Send streamed chunks (the spectator feed) as they are yielded, not per 4 KB
+            
+            def setup(self):
+                super().setup()
+                _disable_nagle(self.connection)
+        
+        return {'protocol': NoDelayHttpProtocol}
+    try:
+        import geventwebsocket  # noqa: F401 - Flask-SocketIO then picks the handler class itself
+        return {}
+    except ImportError:
+        from gevent import pywsgi
+        
+        class NoDelayHandler(pywsgi.WSGIHandler):
+            def __init__(self, sock, *args, **kwargs):
+                _disable_nagle(sock)
+                super().__init__(sock, *args, **kwargs)
+        
+        return {'handler_class': NoDelayHandler}
 
 def main():
     """Run the development server with HTTP or HTTPS support"""
+    global timer_updates, play_at_lead_ms
     parser = argparse.ArgumentParser(description='Quiz Buzzer Development Server')
     parser.add_argument('--https', action='store_true', help='Enable HTTPS with self-signed certificate')
     parser.add_argument('--host', default='0.0.0.0', help='Host to bind to (default: 0.0.0.0)')
@@ -1370,9 +3543,73 @@ def main():
     parser.add_argument('--key', default='ssl/server.key', help='Path to SSL private key file (default: ssl/server.key)')
     parser.add_argument('--arduino-port', help='Arduino serial port (auto-detect if not specified)')
     parser.add_argument('--arduino-baud', type=int, default=9600, help='Arduino baud rate (default: 9600)')
+    parser.add_argument('--arduino-max-baud', type=int, default=NEGOTIABLE_BAUD_RATES[0],
+                        help=f'Highest baud rate to negotiate with the firmware, 0 to disable (default: {NEGOTIABLE_BAUD_RATES[0]})')
     parser.add_argument('--no-arduino', action='store_true', help='Disable Arduino auto-connection')
+    parser.add_argument('--match', action='append', default=[], metavar='ID[=PORT]',
+                        help='Start another match at launch, optionally with its own Arduino on PORT '
+                             '(repeatable, e.g. --match room2=/dev/ttyUSB1). Matches also start when a client joins one')
+    parser.add_argument('--no-auto-reconnect', action='store_true',
+                        help='Stay in simulation mode after the Arduino is unplugged instead of reconnecting')
+    parser.add_argument('--serial-read-mode', choices=SERIAL_READ_MODES, default='event',
+                        help='Serial reader: event (wake on incoming bytes) or poll (legacy 10 ms polling) (default: event)')
+    parser.add_argument('--serial-protocol', choices=SERIAL_PROTOCOLS, default='ascii',
+                        help='Request the binary framed protocol from the firmware, falling back to ASCII (default: ascii)')
+    parser.add_argument('--async-mode', choices=ASYNC_MODES, default=ASYNC_MODE,
+                        help=f'Socket.IO async mode; eventlet/gevent serve many clients on green threads (default: ${ASYNC_MODE_ENV} or threading)')
+    parser.add_argument('--serve', choices=SERVE_MODES, default='dev',
+                        help='Server runner: dev (Werkzeug unless --async-mode says otherwise) or production '
+                             '(gevent/eventlet WSGI server with keep-alive) (default: dev)')
+    parser.add_argument('--transport-policy', choices=list(TRANSPORT_POLICIES), default=transport_policy,
+                        help=f'How browsers connect: polling (start on long-polling, then upgrade), websocket-fallback '
+                             f'(WebSocket first, polling if it fails) or websocket-only (default: {transport_policy})')
+    parser.add_argument('--websocket-only', action='store_true',
+                        help='Same as --transport-policy websocket-only: refuse HTTP long-polling')
+    parser.add_argument('--emit-batch-ms', type=float, default=EMIT_BATCH_WINDOW * 1000,
+                        help='Also batch the emits of console actions arriving within this many ms '
+                             '(default: 0, one batch per action)')
+    parser.add_argument('--log-size', type=int, default=MAX_LOG_ENTRIES,
+                        help=f'Game log entries each match keeps (default: {MAX_LOG_ENTRIES})')
+    parser.add_argument('--log-batch-ms', type=float, default=LOG_BATCH_WINDOW * 1000,
+                        help='Send new game log entries to the consoles every this many ms, as one frame '
+                             f'(0: after every command) (default: {LOG_BATCH_WINDOW * 1000:g})')
+    parser.add_argument('--timer-updates', choices=TIMER_UPDATE_MODES, default=timer_updates,
+                        help='deadline: timer events carry the deadline and pages count down themselves; '
+                             f'ticks: also broadcast timer_update every second (default: {timer_updates})')
+    parser.add_argument('--play-at-ms', type=float, default=PLAY_AT_LEAD_MS,
+                        help='Schedule buzz and scoring effects this many ms ahead on the server clock, so every '
+                             f'screen plays them together; 0 plays them on arrival (default: {PLAY_AT_LEAD_MS})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Web processes to run; this one owns the state and the Arduino, the others listen '
+                             'on the following ports behind your load balancer (default: 1)')
+    parser.add_argument('--message-queue', default=None,
+                        help=f'Queue connecting the processes: unix:///path (built-in broker), redis://... '
+                             f'or a kombu URL (default with --workers: {DEFAULT_LOCAL_QUEUE})')
+    parser.add_argument('--worker-of', type=int, metavar='PID', help=argparse.SUPPRESS)
     
     args = parser.parse_args()
+    if args.async_mode != ASYNC_MODE:
+        logger.warning(f"⚠️ {args.async_mode} unavailable - running in {ASYNC_MODE} mode")
+    if args.serve == 'production' and ASYNC_MODE == 'threading':
+        logger.error("❌ Production mode needs gevent or eventlet: pip install gevent")
+        return
+    
+    set_transport_policy('websocket-only' if args.websocket_only else args.transport_policy)
+    state_store.emit_window = max(0.0, args.emit_batch_ms / 1000)
+    main_match.log.window = max(0.0, args.log_batch_ms / 1000)
+    main_match.log.resize(args.log_size)
+    timer_updates = args.timer_updates
+    play_at_lead_ms = max(0.0, args.play_at_ms)
+    
+    workers = []
+    if args.worker_of:
+        become_worker(args.message_queue, args.worker_of)
+    elif args.workers > 1 or args.message_queue:
+        queue_url = args.message_queue or DEFAULT_LOCAL_QUEUE
+        if queue_url.startswith(LOCAL_QUEUE_SCHEME):
+            LocalQueueBroker(queue_url[len(LOCAL_QUEUE_SCHEME):]).start()
+        attach_message_queue(queue_url, 'owner')
+        workers = start_workers(args, queue_url, args.workers)
     
     ssl_context = None
     protocol = "HTTP"
@@ -1406,6 +3643,10 @@ def main():
             print("   Click 'Advanced' → 'Proceed to localhost (unsafe)' to continue")
     else:
         print(f"📱 Main UI:     http://{args.host}:{args.port}")
+    print(f"⚙️  Async mode:  {ASYNC_MODE} ({args.serve} server"
+          f", {transport_policy} transport)")
+    if workers:
+        print(f"🧩 Workers:     ports {args.port + 1}-{args.port + len(workers)} via {args.message_queue or DEFAULT_LOCAL_QUEUE}")
     
     print("=" * 70)
     print("✅ Updated for your ESP32 board GPIO pins:")
@@ -1413,15 +3654,25 @@ def main():
     print("   LEDs:    D18, D19, D23, D25, D26, D27")
     print("=" * 70)
     
-    # Try to connect to Arduino if not disabled
+    arduino.auto_reconnect = not args.no_auto_reconnect
+    
+    for spec in [] if args.worker_of else args.match:
+        match_id, _, match_port = spec.partition('=')
+        match = get_match(match_id, create=True)
+        if match is None:
+            print(f"❌ Match {match_id!r} not started (ids are letters, digits, - and _; at most {MAX_MATCHES} matches)")
+            continue
+        print(f"🏟️  Match {match_id}: /?match={match_id}, /console?match={match_id}"
+              f"{f', Arduino on {match_port}' if match_port else ''}")
+        if match_port and not args.no_arduino and SERIAL_AVAILABLE:
+            connect_arduino_in_background(match_port, args.arduino_baud, args.serial_read_mode,
+                                          args.serial_protocol, args.arduino_max_baud, match=match)
+    
+    # Try to connect to Arduino if not disabled (in the background, so the server starts immediately)
     if not args.no_arduino and SERIAL_AVAILABLE:
-        print("🔌 Attempting to connect to Arduino...")
-        if arduino.connect(args.arduino_port, args.arduino_baud):
-            print(f"✅ Arduino connected on {arduino.serial_port.port} at {args.arduino_baud} baud")
-            game_state['arduino_connected'] = True
-        else:
-            print("⚠️  Arduino not found - running in simulation mode")
-            print("   Check your Arduino connection and try again")
+        print("🔌 Connecting to Arduino in the background...")
+        connect_arduino_in_background(args.arduino_port, args.arduino_baud, args.serial_read_mode,
+                                      args.serial_protocol, args.arduino_max_baud)
     elif args.no_arduino:
         print("🚫 Arduino auto-connection disabled")
     else:
@@ -1430,8 +3681,20 @@ def main():
     
     print("=" * 70)
     
+    server_options = low_latency_server_options()
     try:
-        if ssl_context:
+        if ssl_context and ASYNC_MODE != 'threading':
+            # eventlet and gevent wrap the listening socket themselves
+            socketio.run(
+                app, 
+                host=args.host, 
+                port=args.port, 
+                debug=False, 
+                certfile=args.cert,
+                keyfile=args.key,
+                **server_options
+            )
+        elif ssl_context:
             # For HTTPS, use Flask-SocketIO's SSL support
             socketio.run(
                 app, 
@@ -1439,7 +3702,8 @@ def main():
                 port=args.port, 
                 debug=False, 
                 ssl_context=(args.cert, args.key),
-                allow_unsafe_werkzeug=True
+                allow_unsafe_werkzeug=True,
+                **server_options
             )
         else:
             # For HTTP, no SSL parameters needed
@@ -1448,13 +3712,17 @@ def main():
                 host=args.host, 
                 port=args.port, 
                 debug=False, 
-                allow_unsafe_werkzeug=True
+                allow_unsafe_werkzeug=True,
+                **server_options
             )
     except Exception as e:
         logger.error(f"❌ Server failed to start: {e}")
         if ssl_context:
             logger.info("💡 Try running without --https flag for HTTP mode")
             logger.info("💡 Check certificate files exist and have correct permissions")
+    finally:
+        for worker in workers:
+            worker.terminate()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
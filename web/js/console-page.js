@@ -12,7 +12,7 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('🎮 Console page initializing...');
     
     // Initialize Socket.IO connection
-    socket = io();
+    socket = createSocket();
     
     // Initialize game state from localStorage
     gameState = window.gameState;
@@ -26,12 +26,8 @@ document.addEventListener('DOMContentLoaded', function() {
     // Set up socket event listeners
     setupSocketListeners();
     
-    // Setup server state response listener after socket connects
-    socket.on('connect', () => {
-        console.log('🔌 Socket connected, setting up server state listener');
-        setupServerStateListener();
-        loadServerState();
-    });
+    // Keep in sync with the server; reconnects only fetch the changes missed while offline
+    loadServerState();
     
     // Update initial displays
     updateTeamsTable();
@@ -747,18 +743,10 @@ function getColorValue(color) {
 // ========== SERVER STATE SYNC ==========
 function loadServerState() {
     console.log('🔄 Loading server state...');
-    socket.emit('get_server_state', {});
-}
-
-function setupServerStateListener() {
-    socket.on('server_state_response', (serverState) => {
-        if (serverState) {
-            console.log('📥 Received server state:', serverState);
-            syncClientStateWithServer(serverState);
-        } else {
-            console.log('⚠️ No server state received, using localStorage');
-        }
-    });
+    new StateSync(socket, (serverState) => {
+        console.log('📥 Received server state:', serverState);
+        syncClientStateWithServer(serverState);
+    }).start();
 }
 
 function syncClientStateWithServer(serverState) {
@@ -134,39 +134,18 @@ class MainPageApp {
     loadServerState() {
         console.log('🔄 Loading server state for main page...');
         
-        // Setup server state listener after socket connects
+        // Sync on connect; reconnects only fetch the changes missed while offline
         if (window.socketManager && window.socketManager.socket) {
-            window.socketManager.socket.on('connect', () => {
-                console.log('🔌 Main page socket connected, setting up server state listener');
-                this.setupServerStateListener();
-                this.requestServerState();
+            this.stateSync = new StateSync(window.socketManager.socket, (serverState) => {
+                console.log('📥 Received server state for main page:', serverState);
+                this.syncClientStateWithServer(serverState);
             });
+            this.stateSync.start();
         } else {
             console.warn('⚠️ Socket manager not available for server state loading');
         }
     }
     
-    // Request server state
-    requestServerState() {
-        if (window.socketManager && window.socketManager.socket) {
-            window.socketManager.socket.emit('get_server_state', {});
-        }
-    }
-    
-    // Add event listener for server state response
-    setupServerStateListener() {
-        if (window.socketManager && window.socketManager.socket) {
-            window.socketManager.socket.on('server_state_response', (serverState) => {
-                if (serverState) {
-                    console.log('📥 Received server state for main page:', serverState);
-                    this.syncClientStateWithServer(serverState);
-                } else {
-                    console.log('⚠️ No server state received for main page, using defaults');
-                }
-            });
-        }
-    }
-    
     // Sync client state with server state
     syncClientStateWithServer(serverState) {
         // Sync team data
@@ -208,6 +187,9 @@ class MainPageApp {
                 window.gameState.state.timerRunning = serverState.timer.running;
                 console.log(`🔄 Main page synced timer running: ${window.gameState.state.timerRunning} → ${serverState.timer.running}`);
             }
+            
+            // A countdown that is already running continues locally from its deadline
+            window.socketManager?.countdown?.update(serverState.timer);
         }
         
         // Sync question set data
@@ -3,6 +3,202 @@
  * Handles all real-time communication between main page and console
  */
 
+// Open a Socket.IO connection using the transport policy the server injected as
+// window.SOCKET_CONFIG (WebSocket first by default, long-polling as a fallback).
+// The role (display, console, spectator, scoreboard) decides which events the server
+// sends; it defaults to the page's own role and can be overridden with ?role=...
+// ?match=... joins one of several matches hosted by the same server.
+function currentMatch() {
+    return new URLSearchParams(window.location.search).get('match') || 'main';
+}
+
+function createSocket() {
+    const config = window.SOCKET_CONFIG || {};
+    const role = new URLSearchParams(window.location.search).get('role') || config.role;
+    const socket = io({
+        transports: config.transports || ['polling', 'websocket'],
+        auth: { role, match: currentMatch() }
+    });
+    
+    if (config.fallbackTransports) {
+        socket.on('connect_error', () => {
+            if (socket.io.opts.transports.join() !== config.fallbackTransports.join()) {
+                // WebSocket blocked (proxy, firewall) - retry the classic polling + upgrade way
+                console.warn('⚠️ WebSocket connection failed - falling back to long-polling');
+                socket.io.opts.transports = config.fallbackTransports;
+            }
+        });
+    }
+
+    // The server frames all events of one console action as a single 'batch';
+    // replay them to the regular listeners in order so the UI updates at once
+    socket.on('batch', (events) => {
+        events.forEach(([event, ...args]) => {
+            socket.listeners(event).forEach(listener => listener(...args));
+        });
+    });
+    return socket;
+}
+
+// Mirrors the server's game state from versioned deltas. After a reconnect (or a page
+// reload) only the changes missed while offline are fetched; the server falls back to a
+// compact snapshot if the client is too far behind or the server has restarted.
+class StateSync {
+    constructor(socket, onState) {
+        this.socket = socket;
+        this.onState = onState;  // Called with the full mirrored state after each sync
+        this.epoch = null;
+        this.version = 0;
+        this.state = {};
+        this.syncing = false;
+        this.load();
+    }
+    
+    start() {
+        this.socket.on('connect', () => this.request());
+        this.socket.on('state_sync', (payload) => this.handleSync(payload));
+        this.socket.on('state_delta', (delta) => this.handleDelta(delta));
+        if (this.socket.connected) {
+            this.request();
+        }
+    }
+    
+    request() {
+        this.syncing = true;
+        this.socket.emit('get_server_state', { since: this.version, epoch: this.epoch });
+    }
+    
+    handleSync(payload) {
+        if (payload.snapshot) {
+            this.state = payload.snapshot;
+        } else {
+            payload.deltas.forEach(([, changes]) => this.applyChanges(changes));
+        }
+        console.log(`🔄 State sync: ${payload.snapshot ? 'snapshot' : `${payload.deltas.length} delta(s)`}` +
+            ` → version ${payload.version}`);
+        this.epoch = payload.epoch;
+        this.version = payload.version;
+        this.syncing = false;
+        this.save();
+        this.onState(this.state);
+    }
+    
+    handleDelta(delta) {
+        if (this.syncing || delta.epoch !== this.epoch || delta.v <= this.version) {
+            return;  // A sync in flight (or already applied) covers it
+        }
+        if (delta.prev !== this.version) {
+            console.warn(`⚠️ Missed state changes (have ${this.version}, got ${delta.prev} → ${delta.v}) - resyncing`);
+            this.request();
+            return;
+        }
+        this.applyChanges(delta.c);
+        this.version = delta.v;
+        this.save();
+    }
+    
+    applyChanges(changes) {
+        changes.forEach(([, path, value]) => {
+            let target = this.state;
+            path.slice(0, -1).forEach(key => {
+                if (typeof target[key] !== 'object' || target[key] === null) {
+                    target[key] = {};
+                }
+                target = target[key];
+            });
+            target[path[path.length - 1]] = value;
+        });
+    }
+    
+    load() {
+        try {
+            const saved = JSON.parse(localStorage.getItem(`quizServerStateSync:${currentMatch()}`));
+            if (saved) {
+                Object.assign(this, { epoch: saved.epoch, version: saved.version, state: saved.state });
+            }
+        } catch (error) {
+            console.warn('⚠️ Error loading synced server state:', error);
+        }
+    }
+    
+    save() {
+        try {
+            localStorage.setItem(`quizServerStateSync:${currentMatch()}`,
+                JSON.stringify({ epoch: this.epoch, version: this.version, state: this.state }));
+        } catch (error) {
+            console.warn('⚠️ Error saving synced server state:', error);
+        }
+    }
+}
+
+// Offset between this page's clock and the server's. The server pings each page NTP-style
+// (clock_ping) and sends back its estimate from the round trip with the least delay
+// (clock_sync), re-measuring after every (re)connect and every few seconds after that.
+class ServerClock {
+    constructor(socket) {
+        this.offset = 0;  // Server clock minus Date.now()
+        this.delay = null;
+        this.jitter = null;
+        socket.on('clock_ping', ({ t1 }) => {
+            const t2 = Date.now();
+            socket.emit('clock_pong', { t1, t2, t3: Date.now() });
+        });
+        socket.on('clock_sync', (data) => {
+            this.offset = data.offset;
+            this.delay = data.delay;
+            this.jitter = data.jitter;
+        });
+    }
+    
+    // Current time on the server clock
+    now() {
+        return Date.now() + this.offset;
+    }
+    
+    // Run callback when the server clock reaches serverTime (right away if it has passed or is missing),
+    // so an effect stamped with playAt starts at the same moment on every screen
+    at(serverTime, callback) {
+        const wait = serverTime == null ? 0 : serverTime - this.now();
+        if (wait > 0) {
+            setTimeout(callback, wait);
+        } else {
+            callback();
+        }
+    }
+}
+
+// Counts a running timer down locally from the deadline in the server's timer events,
+// waking only when the displayed second turns. It holds at 1 until the server's own
+// timer_ended says time is up, so every screen ends on the same authoritative event.
+class CountdownRenderer {
+    constructor(clock, onTick) {
+        this.clock = clock;
+        this.onTick = onTick;  // Called with the seconds to display
+        this.deadline = null;
+        this.handle = null;
+    }
+    
+    update(timer) {
+        clearTimeout(this.handle);
+        this.deadline = timer && timer.running ? timer.deadline : null;
+        if (this.deadline) {
+            this.tick();
+        }
+    }
+    
+    stop() {
+        this.update(null);
+    }
+    
+    tick() {
+        const left = this.deadline - this.clock.now();
+        this.onTick(Math.max(1, Math.ceil(left / 1000)));
+        if (left > 1000) {
+            this.handle = setTimeout(() => this.tick(), (left % 1000 || 1000) + 5);
+        }
+    }
+}
+
 class SocketManager {
     constructor() {
         this.socket = null;
@@ -19,12 +215,30 @@ class SocketManager {
             return;
         }
         
-        this.socket = io();
+        this.socket = createSocket();
+        this.clock = new ServerClock(this.socket);
+        this.countdowns = {};  // name -> CountdownRenderer of a named countdown
+        this.countdown = new CountdownRenderer(this.clock, (value) => {
+            if (window.gameState && window.gameState.get('timerValue') !== value) {
+                window.gameState.set('timerValue', value);
+                window.gameState.updateTimerDisplay();
+            }
+        });
         this.setupEventHandlers();
         window.socket = this.socket; // For backward compatibility
         console.log('🔗 Socket manager initialized');
     }
     
+    // Renderer of a named countdown, created on first use
+    namedCountdown(name) {
+        if (!this.countdowns[name]) {
+            this.countdowns[name] = new CountdownRenderer(this.clock, (value) => {
+                this.emit('local:countdown_tick', { name, value });
+            });
+        }
+        return this.countdowns[name];
+    }
+    
     // Setup core socket event handlers
     setupEventHandlers() {
         this.socket.on('connect', () => {
@@ -84,15 +298,18 @@ class SocketManager {
 
 
         
+        // Sent on set/start/pause/reset; the seconds in between are rendered locally
         this.socket.on('timer_update', (data) => {
             window.gameState?.set('timerValue', data.value);
             window.gameState?.set('timerRunning', data.running);
             window.gameState?.updateTimerDisplay();
+            this.countdown.update(data);
             this.emit('local:timer_update', data);
         });
         
         this.socket.on('timer_ended', () => {
             // Handle timer reaching zero
+            this.countdown.stop();
             if (window.gameState) {
                 window.gameState.set('timerRunning', false);
                 window.gameState.set('timerValue', 0);
@@ -100,6 +317,25 @@ class SocketManager {
             }
         });
         
+        // Named countdowns (question clock, devil challenge, ...): counted down locally like the
+        // match timer; pages listen for local:countdown_tick with { name, value }
+        this.socket.on('countdown_update', (data) => {
+            this.namedCountdown(data.name).update(data);
+            this.emit('local:countdown_update', data);
+        });
+        
+        this.socket.on('countdown_ended', (data) => {
+            this.namedCountdown(data.name).stop();
+            this.emit('local:countdown_tick', { name: data.name, value: 0 });
+            this.emit('local:countdown_ended', data);
+        });
+        
+        this.socket.on('countdown_cleared', (data) => {
+            this.namedCountdown(data.name).stop();
+            delete this.countdowns[data.name];
+            this.emit('local:countdown_cleared', data);
+        });
+        
         this.socket.on('game_state_reset', (data) => {
             console.log('🔄 SocketManager: game_state_reset received:', data);
             
@@ -150,6 +386,23 @@ class SocketManager {
             document.dispatchEvent(event);
         });
         
+        // Background Arduino connection progress (opening, waiting_ready, negotiating_*, connected, failed)
+        this.socket.on('arduino_connect_progress', (data) => {
+            console.log(`🔌 Arduino connect [${data.stage}] ${data.message}` +
+                (data.elapsedMs !== undefined ? ` (${data.elapsedMs} ms)` : ''));
+            this.emit('local:arduino_connect_progress', data);
+        });
+        
+        // Sent once the board answers RESET with READY (armed: false if it never did)
+        this.socket.on('buzzers_armed', (data) => {
+            if (data.armed) {
+                console.log(`🟢 Buzzers armed (${data.source})` + (data.rttMs !== undefined ? ` in ${data.rttMs} ms` : ''));
+            } else {
+                console.warn(`⚠️ Buzzer reset not acknowledged after ${data.attempts} attempt(s)`);
+            }
+            this.emit('local:buzzers_armed', data);
+        });
+        
         this.emit('local:timer_ended');
         
         this.socket.on('score_update', (data) => {
@@ -157,7 +410,7 @@ class SocketManager {
             this.emit('local:score_update', data);
         });
         
-        this.socket.on('buzzer_pressed', (data) => {
+        this.socket.on('buzzer_pressed', (data) => this.clock.at(data.playAt, () => {
             // Update game state currentTeam when buzzer is pressed
             if (data.teamId && window.gameState) {
                 window.gameState.set('currentTeam', data.teamId);
@@ -170,7 +423,11 @@ class SocketManager {
             }
             
             this.emit('local:buzzer_pressed', data);
-        });
+        }));
+        
+        this.socket.on('scoring_action', (data) => this.clock.at(data.playAt, () => {
+            this.emit('local:scoring_action', data);
+        }));
         
         this.socket.on('clear_buzzers', () => {
             // Reset currentTeam and currentChallenge when buzzers are cleared
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Clock Sync Benchmark for Quiz Buzzer System
+Connects 20 display clients that each have their own clock error and a random network
+delay on every packet, in both directions. The clients answer the server's clock_ping
+the way the pages do. The benchmark checks how close each offset estimate gets to the
+real error, and whether /diagnostics/clocks lists every client. It then buzzes and
+reports how far apart the screens start the overlay: on arrival (the old behaviour) and
+at the playAt time stamped on buzzer_pressed.
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.request
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server, percentile
+
+WATCHED = ('clock_ping', 'clock_sync', 'buzzer_pressed', 'batch')
+
+
+class DisplayClient:
+    """A screen whose clock is off by skew_ms, behind a link that delays each packet by up to jitter_ms"""
+
+    def __init__(self, url, skew_ms, jitter_ms):
+        self.skew = skew_ms
+        self.jitter = jitter_ms
+        self.lock = threading.Lock()
+        self.offset = None  # Server clock minus local clock, from clock_sync
+        self.buzzes = []  # (true arrival ms, playAt)
+        self.client = RawSocketIOClient(url, watch=WATCHED, on_event=self.on_event, auth={'role': 'display'})
+
+    def local_now(self):
+        return time.time() * 1000 + self.skew
+
+    def delayed(self, callback, *args):
+        threading.Timer(random.uniform(0, self.jitter) / 1000, callback, args).start()
+
+    def on_event(self, client, name, data, received_at):
+        self.delayed(self.deliver, name, data)  # Downlink delay
+
+    def deliver(self, name, data):
+        arrived = time.time() * 1000
+        for event, *args in (data if name == 'batch' else [[name, data]]):
+            if event == 'clock_ping':
+                t2 = self.local_now()
+                self.delayed(self.send, 'clock_pong', {'t1': args[0]['t1'], 't2': t2, 't3': self.local_now()})
+            elif event == 'clock_sync':
+                with self.lock:
+                    self.offset = args[0]['offset']
+            elif event == 'buzzer_pressed':
+                with self.lock:
+                    self.buzzes.append((arrived, args[0].get('playAt')))
+
+    def send(self, event, data):
+        with self.lock:
+            self.client.emit(event, data)
+
+    def fired_at(self, arrived, play_at):
+        """True time (ms) the page starts the overlay: at playAt on its clock estimate, or on arrival if that passed"""
+        if play_at is None or self.offset is None:
+            return arrived
+        local_time = play_at - self.offset
+        return max(arrived, local_time - self.skew)
+
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def main():
+    """Measure offset estimates and the buzz effect spread across screens"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer clock sync benchmark')
+    parser.add_argument('--clients', type=int, default=20, help='Display clients (default: 20)')
+    parser.add_argument('--rounds', type=int, default=20, help='Buzzes to measure (default: 20)')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='Largest random delay per packet and direction (default: 20)')
+    parser.add_argument('--play-at-ms', type=float, default=100, help="Server's playAt lead (default: 100)")
+    args = parser.parse_args()
+
+    print(f"🚀 Clock Sync Benchmark ({args.clients} displays, clocks off by up to ±3 s, "
+          f"0-{args.jitter_ms:g} ms delay per packet, playAt +{args.play_at_ms:g} ms)")
+    print("=" * 78)
+    port = free_port()
+    process, _ = start_server(port, ['--play-at-ms', str(args.play_at_ms)])
+    url = f"http://127.0.0.1:{port}"
+    console = RawSocketIOClient(url, watch=(), auth={'role': 'console'})
+    displays = [DisplayClient(url, random.uniform(-3000, 3000), args.jitter_ms) for _ in range(args.clients)]
+    try:
+        console.connected.wait(5)
+        for display in displays:
+            display.client.connected.wait(5)
+        time.sleep(2)  # The burst of pings after connecting
+
+        errors = sorted(abs(display.offset + display.skew) for display in displays if display.offset is not None)
+        report = fetch_json(f"{url}/diagnostics/clocks")
+        reported = [client for client in report['clients'] if client['role'] == 'display' and client['samples']]
+        jitters = sorted(client['jitterMs'] for client in reported)
+        print(f"📊 offset error: p50 {percentile(errors, 0.5):7.2f} ms | max {errors[-1]:7.2f} ms "
+              f"({len(errors)}/{args.clients} synced)")
+        print(f"📊 diagnostics : {len(reported)} displays listed | jitter p50 {percentile(jitters, 0.5):7.2f} ms | "
+              f"max {jitters[-1]:7.2f} ms")
+
+        on_arrival, scheduled, late = [], [], 0
+        for round_number in range(args.rounds):
+            for display in displays:
+                with display.lock:
+                    display.buzzes.clear()
+            console.emit('simulate_buzzer', {'teamId': round_number % 6 + 1})
+            time.sleep(args.jitter_ms / 1000 + args.play_at_ms / 1000 + 0.2)
+            buzzes = [(display, display.buzzes[0]) for display in displays if display.buzzes]
+            if not buzzes:
+                continue
+            arrivals = [arrived for _, (arrived, _) in buzzes]
+            fired = [display.fired_at(arrived, play_at) for display, (arrived, play_at) in buzzes]
+            late += sum(at == arrived for at, arrived in zip(fired, arrivals))
+            on_arrival.append(max(arrivals) - min(arrivals))
+            scheduled.append(max(fired) - min(fired))
+            console.emit('clear_buzzers')
+            time.sleep(0.05)
+
+        on_arrival.sort()
+        scheduled.sort()
+        print(f"📊 on arrival  : spread p50 {percentile(on_arrival, 0.5):7.2f} ms | max {on_arrival[-1]:7.2f} ms")
+        print(f"📊 at playAt   : spread p50 {percentile(scheduled, 0.5):7.2f} ms | max {scheduled[-1]:7.2f} ms "
+              f"| {late} late arrivals")
+    finally:
+        console.close()
+        for display in displays:
+            display.client.close()
+        stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
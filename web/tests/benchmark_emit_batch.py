@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Emit Batching Benchmark for Quiz Buzzer System
+Counts the WebSocket frames one client per role receives per console action (devil
+attack, admin reset, a burst of score updates) and how many events they carry, and
+checks that a single action reaches every role room as at most one frame. Game log
+lines are left out: they reach the consoles in their own batches (--log-batch-ms).
+"""
+
+import sys
+import time
+import argparse
+import threading
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server
+
+ROLES = ('display', 'console', 'spectator', 'scoreboard')
+
+WATCHED = ('batch', 'devil_attack', 'card_update', 'score_update', 'log_update', 'game_state_reset',
+           'clear_buzzers', 'buzzers_armed', 'buzzer_data', 'log', 'timer_update', 'team_update')
+
+ACTIONS = {
+    'devil_attack': [('devil_attack', {'attackerId': 1, 'targetId': 2, 'newScore': 3})],
+    'admin_reset': [('admin_reset', {})],
+    'score burst x20': [('score_update', {'teamId': i % 6 + 1, 'score': i, 'adjustment': 1}) for i in range(20)],
+}
+SINGLE_ACTIONS = ('devil_attack', 'admin_reset')  # One command each: at most one frame per role
+
+
+class FrameCounter:
+    """Counts frames and the events inside them"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.events = 0
+
+    def on_event(self, client, name, data, received_at):
+        events = data if name == 'batch' else [[name, data]]
+        if all(event == 'log_update' for event, *_ in events):
+            return  # The game log reaches consoles in its own timed batches
+        with self.lock:
+            self.frames += 1
+            self.events += len(events)
+
+    def take(self):
+        with self.lock:
+            counts, self.frames, self.events = (self.frames, self.events), 0, 0
+            return counts
+
+
+def measure(window_ms, rounds):
+    """{action: {role: (frames, events) per round}}"""
+    port = free_port()
+    process, _ = start_server(port, ['--emit-batch-ms', str(window_ms)])
+    counters = {role: FrameCounter() for role in ROLES}
+    driver = RawSocketIOClient(f"http://127.0.0.1:{port}", watch=(), auth={'role': 'console'})
+    listeners = [RawSocketIOClient(f"http://127.0.0.1:{port}", watch=WATCHED, on_event=counters[role].on_event,
+                                   auth={'role': role}) for role in ROLES]
+    results = {}
+    try:
+        for client in (driver, *listeners):
+            client.connected.wait(5)
+        time.sleep(0.3)
+        for counter in counters.values():
+            counter.take()
+        for name, emits in ACTIONS.items():
+            totals = {role: [0, 0] for role in ROLES}
+            for _ in range(rounds):
+                for event, data in emits:
+                    driver.emit(event, data)
+                time.sleep(0.3)
+                for role, counter in counters.items():
+                    round_frames, round_events = counter.take()
+                    totals[role][0] += round_frames
+                    totals[role][1] += round_events
+                    if name in SINGLE_ACTIONS and round_frames > 1:
+                        results.setdefault('violations', []).append(f"{name}: {role} got {round_frames} frames")
+            results[name] = {role: (frames / rounds, events / rounds) for role, (frames, events) in totals.items()}
+    finally:
+        for client in (driver, *listeners):
+            client.close()
+        stop_server(process)
+    return results
+
+
+def main():
+    """Run the emit batching benchmark"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer emit batching benchmark')
+    parser.add_argument('--windows', type=float, nargs='+', default=[0, 5],
+                        help='--emit-batch-ms values to compare (default: 0 5)')
+    parser.add_argument('--rounds', type=int, default=5, help='Repetitions per action (default: 5)')
+    args = parser.parse_args()
+
+    print("🚀 Emit Batching Benchmark (frames per console action, one listening client per role)")
+    print("=" * 78)
+    violations = []
+    for window_ms in args.windows:
+        print(f"⚙️  --emit-batch-ms {window_ms:g}")
+        results = measure(window_ms, args.rounds)
+        violations += results.pop('violations', [])
+        for name, roles in results.items():
+            print(f"📊 {name:<16}: " + " | ".join(f"{role} {events:4.1f} ev/{frames:4.1f} fr"
+                                                 for role, (frames, events) in roles.items()))
+    if violations:
+        print("❌ Actions split across frames: " + "; ".join(violations))
+        sys.exit(1)
+    print("✅ Every single action reached each role room as one frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Socket.IO Fan-out Benchmark for Quiz Buzzer System
+Starts dev_server.py in each async mode, connects 1, 10, 100 and 500 WebSocket clients
+and measures how long a buzzer_pressed broadcast takes to reach every one of them
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+
+import simple_websocket
+
+SERVER_SCRIPT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dev_server.py'))
+CLIENT_COUNTS = (1, 10, 100, 500)
+ASYNC_MODES = ('threading', 'eventlet', 'gevent')
+
+
+class RawSocketIOClient:
+    """Minimal Socket.IO v5 client over a plain WebSocket (no polling, no reconnects).
+
+    Only what the benchmarks need: connect to the default namespace, answer pings,
+    emit events and timestamp the events it is told to watch for.
+    """
+
+    def __init__(self, url, watch=('buzzer_pressed',), on_event=None, auth=None):
+        self.ws = simple_websocket.Client(f"{url}/socket.io/?EIO=4&transport=websocket")
+        self.ws.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # As browsers do
+        self.watch = tuple(f'42["{name}"' for name in watch)
+        self.on_event = on_event
+        self.connected = threading.Event()
+        self.received_bytes = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ws.send('40' + (json.dumps(auth) if auth else ''))  # Join the default namespace
+
+    def _run(self):
+        try:
+            while True:
+                packet = self.ws.receive()
+                if packet is None:
+                    break
+                received_at = time.perf_counter()
+                self.received_bytes += len(packet)
+                if packet == '2':
+                    self.ws.send('3')
+                elif packet.startswith('40'):
+                    self.connected.set()
+                elif self.on_event and packet.startswith(self.watch):
+                    name, data = (json.loads(packet[2:]) + [None])[:2]  # Events may carry no data
+                    self.on_event(self, name, data, received_at)
+        except Exception:
+            pass  # Connection closed
+
+    def emit(self, event, data=None):
+        self.ws.send('42' + json.dumps([event, data] if data is not None else [event]))
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, extra_args=(), timeout=30, script=SERVER_SCRIPT):
+    """Launch dev_server.py without an Arduino and wait until it answers; returns (process, startup seconds)"""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, script, '--no-arduino', '--host', '127.0.0.1',
+                                '--port', str(port), *extra_args],
+                               cwd=os.path.dirname(script),  # Pages are opened relative to web/
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process, time.perf_counter() - started
+        except OSError:
+            time.sleep(0.02)
+    process.kill()
+    raise RuntimeError("Server did not start in time")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class FanoutProbe:
+    """Collects buzzer_pressed arrival times for the current round"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.arrivals = []
+        self.expected = 0
+        self.done = threading.Event()
+
+    def start_round(self, expected):
+        with self.lock:
+            self.arrivals = []
+            self.expected = expected
+            self.done.clear()
+
+    def on_event(self, client, name, data, received_at):
+        with self.lock:
+            self.arrivals.append(received_at)
+            if len(self.arrivals) >= self.expected:
+                self.done.set()
+
+
+def connect_clients(url, count, probe, clients):
+    """Grow the client pool to count, connecting in parallel"""
+    failures = []
+
+    def connect_one():
+        try:
+            client = RawSocketIOClient(url, on_event=probe.on_event)
+            if client.connected.wait(10):
+                clients.append(client)
+            else:
+                failures.append('timeout')
+        except Exception as e:
+            failures.append(str(e))
+
+    while len(clients) < count and len(failures) < count:
+        missing = count - len(clients)
+        threads = [threading.Thread(target=connect_one) for _ in range(min(missing, 50))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return failures
+
+
+def measure_mode(mode, rounds, counts, extra_args=()):
+    port = free_port()
+    process, startup = start_server(port, ['--async-mode', mode, *extra_args])
+    url = f"http://127.0.0.1:{port}"
+    probe = FanoutProbe()
+    clients = []
+    results = []
+    try:
+        for count in counts:
+            failures = connect_clients(url, count, probe, clients)
+            time.sleep(0.5)  # Let the connect broadcasts settle
+            driver = clients[0]
+            latencies = []
+            missed = 0
+            for round_number in range(rounds):
+                probe.start_round(len(clients))
+                sent_at = time.perf_counter()
+                driver.emit('simulate_buzzer', {'teamId': round_number % 6 + 1})
+                if not probe.done.wait(10):
+                    missed += len(clients) - len(probe.arrivals)
+                with probe.lock:
+                    latencies.extend((arrived - sent_at) * 1000 for arrived in probe.arrivals)
+                time.sleep(0.02)
+            latencies.sort()
+            results.append({
+                'clients': len(clients),
+                'failed': len(failures),
+                'p50': percentile(latencies, 0.50) if latencies else None,
+                'p99': percentile(latencies, 0.99) if latencies else None,
+                'missed': missed,
+            })
+    finally:
+        for client in clients:
+            client.close()
+        stop_server(process)
+    return startup, results
+
+
+def main():
+    """Run the fan-out benchmark for each async mode"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer Socket.IO fan-out benchmark')
+    parser.add_argument('mode', nargs='?', default='all', choices=('all',) + ASYNC_MODES,
+                        help='Async mode to benchmark (default: all)')
+    parser.add_argument('--rounds', type=int, default=20, help='Broadcasts per client count (default: 20)')
+    parser.add_argument('--clients', type=int, nargs='+', default=list(CLIENT_COUNTS),
+                        help='Client counts to measure (default: 1 10 100 500)')
+    args = parser.parse_args()
+
+    print("🚀 Socket.IO Fan-out Benchmark (simulate_buzzer → buzzer_pressed)")
+    print("=" * 70)
+    for mode in ASYNC_MODES if args.mode == 'all' else (args.mode,):
+        try:
+            startup, results = measure_mode(mode, args.rounds, sorted(args.clients))
+        except RuntimeError as e:
+            print(f"❌ {mode}: {e} (is it installed?)")
+            continue
+        print(f"⚙️  {mode} (server up in {startup:.2f}s)")
+        for result in results:
+            if result['p50'] is None:
+                print(f"   {result['clients']:>4} clients: no broadcasts received")
+                continue
+            print(f"📊 {result['clients']:>4} clients: p50 {result['p50']:8.2f} ms | p99 {result['p99']:8.2f} ms"
+                  f" | missed {result['missed']} | connect failures {result['failed']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Game Log Throughput Benchmark for Quiz Buzzer System
+Scripts a burst of console commands that each write a game log line (score updates),
+once with --log-batch-ms 0 (log lines sent after every command) and once with 100 ms
+batches. Reports how fast the burst is logged, how many frames and bytes of log
+traffic a console receives for it, and that a display receives none. It also times
+writing a log entry in-process: the ring buffer against the old path (import datetime,
+format the timestamp, append to a list trimmed to 100, emit per entry).
+"""
+
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import threading
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class LogProbe:
+    """Counts log_update entries, the frames carrying them and their bytes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = self.frames = self.bytes = 0
+        self.last_at = None
+
+    def on_event(self, client, name, data, received_at):
+        events = data if name == 'batch' else [[name, data]]
+        entries = sum(event == 'log_update' for event, *_ in events)
+        if not entries:
+            return
+        with self.lock:
+            self.entries += entries
+            self.frames += 1
+            self.bytes += len(json.dumps([name, data]))
+            self.last_at = received_at
+
+
+def measure(batch_ms, burst):
+    port = free_port()
+    process, _ = start_server(port, ['--log-batch-ms', str(batch_ms)])
+    url = f"http://127.0.0.1:{port}"
+    console_probe, display_probe = LogProbe(), LogProbe()
+    console = RawSocketIOClient(url, watch=('log_update', 'batch'), on_event=console_probe.on_event,
+                                auth={'role': 'console'})
+    display = RawSocketIOClient(url, watch=('log_update', 'batch'), on_event=display_probe.on_event,
+                                auth={'role': 'display'})
+    try:
+        console.connected.wait(5)
+        display.connected.wait(5)
+        time.sleep(0.5)
+        with console_probe.lock:
+            console_probe.entries = console_probe.frames = console_probe.bytes = 0
+        started = time.perf_counter()
+        for index in range(burst):
+            console.emit('score_update', {'teamId': index % 6 + 1, 'score': index, 'adjustment': 1})
+        deadline = time.perf_counter() + 30
+        while console_probe.entries < burst and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        elapsed = (console_probe.last_at or time.perf_counter()) - started
+    finally:
+        console.close()
+        display.close()
+        stop_server(process)
+    return console_probe, display_probe, elapsed
+
+
+def legacy_log(logs, emit, message, type='info'):
+    """The old entry path: import, format the timestamp, append, trim, emit one event"""
+    import datetime
+
+    log_entry = {
+        'timestamp': datetime.datetime.now().isoformat(),
+        'message': message,
+        'type': type
+    }
+    logs.append(log_entry)
+    if len(logs) > 100:
+        del logs[:len(logs) - 100]
+    emit('log_update', log_entry)
+
+
+def entry_costs(count):
+    """Microseconds per entry written: old path, ring buffer add, and ring buffer add + batched send"""
+    import dev_server
+
+    dev_server.socketio.emit = lambda *args, **kwargs: json.dumps(args)  # Encoding the packet, as a real emit would
+    logs = []
+    legacy = timeit.timeit(lambda: legacy_log(logs, dev_server.socketio.emit, 'Team 1 answered correct and got +1'),
+                           number=count) / count * 1e6
+
+    log = dev_server.GameLog(dev_server.main_match)
+    ring = timeit.timeit(lambda: log.add('Team 1 answered correct and got +1'), number=count) / count * 1e6
+    log.pending.clear()  # Sent with the batches below, not counted against them
+
+    def add_and_flush(batch=50):
+        for _ in range(batch):
+            log.add('Team 1 answered correct and got +1')
+        log.flush()
+
+    batched = timeit.timeit(add_and_flush, number=count // 50) / count * 1e6
+    return legacy, ring, batched
+
+
+def main():
+    """Compare per-command and batched log broadcasts under a burst"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer game log throughput benchmark')
+    parser.add_argument('--burst', type=int, default=2000, help='Console commands in the burst (default: 2000)')
+    parser.add_argument('--entries', type=int, default=100000, help='Entries for the in-process timing (default: 100000)')
+    args = parser.parse_args()
+
+    print(f"🚀 Game Log Benchmark ({args.burst} logged commands in a burst)")
+    print("=" * 78)
+    for batch_ms in (0, 100):
+        console, display, elapsed = measure(batch_ms, args.burst)
+        print(f"⚙️  --log-batch-ms {batch_ms}")
+        print(f"📊 console: {console.entries}/{args.burst} entries in {elapsed:5.2f} s "
+              f"({console.entries / elapsed:7.0f}/s) | {console.frames:5} frames | {console.bytes / 1024:7.1f} KB")
+        print(f"📊 display: {display.entries} log entries")
+
+    legacy, ring, batched = entry_costs(args.entries)
+    print(f"📊 per entry: old path {legacy:5.2f} µs | ring buffer {ring:5.2f} µs | "
+          f"ring buffer + batched send {batched:5.2f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Concurrent Matches Benchmark for Quiz Buzzer System
+Runs N simulated matches (1, 4, 8) in one dev_server.py: every match has a console
+driving it and a few display screens. Each round all consoles buzz at once and the
+benchmark measures buzzer_pressed latency per match, checks that no event crosses
+into another match, and - with --burst - floods the first match with score updates
+to show that a busy room does not hold up the buzzes of the others.
+"""
+
+import time
+import argparse
+import threading
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server, percentile
+
+MATCH_COUNTS = (1, 4, 8)
+
+
+class MatchProbe:
+    """buzzer_pressed arrivals on the displays of one match"""
+
+    def __init__(self, displays):
+        self.lock = threading.Lock()
+        self.displays = displays
+        self.arrivals = []
+        self.done = threading.Event()
+
+    def start_round(self):
+        with self.lock:
+            self.arrivals = []
+            self.done.clear()
+
+    def on_event(self, client, name, data, received_at):
+        with self.lock:
+            self.arrivals.append(received_at)
+            if len(self.arrivals) >= self.displays:
+                self.done.set()
+
+
+def run_matches(count, displays, rounds, burst):
+    """Latencies of the busy first match and the other matches, plus events seen by the wrong match"""
+    port = free_port()
+    process, _ = start_server(port)
+    url = f"http://127.0.0.1:{port}"
+    match_ids = [f"room{index + 1}" for index in range(count)]
+    probes = [MatchProbe(displays) for _ in match_ids]
+    consoles, screens = [], []
+    busy, others, leaked, missed = [], [], 0, 0
+    try:
+        for match_id, probe in zip(match_ids, probes):
+            consoles.append(RawSocketIOClient(url, watch=(), auth={'role': 'console', 'match': match_id}))
+            screens.extend(RawSocketIOClient(url, on_event=probe.on_event, auth={'role': 'display', 'match': match_id})
+                           for _ in range(displays))
+        for client in consoles + screens:
+            client.connected.wait(10)
+        time.sleep(0.5)
+
+        for round_number in range(rounds):
+            for probe in probes:
+                probe.start_round()
+            if burst:
+                for index in range(burst):
+                    consoles[0].emit('score_update', {'teamId': index % 6 + 1, 'score': index, 'adjustment': 1})
+            sent_at = []
+            for console in consoles:
+                sent_at.append(time.perf_counter())
+                console.emit('simulate_buzzer', {'teamId': round_number % 6 + 1})
+            for probe in probes:
+                probe.done.wait(10)
+            time.sleep(0.05)  # Anything from another match would arrive by now
+            for index, probe in enumerate(probes):
+                with probe.lock:
+                    arrivals = list(probe.arrivals)
+                leaked += max(0, len(arrivals) - displays)
+                missed += max(0, displays - len(arrivals))
+                latencies = [(arrived - sent_at[index]) * 1000 for arrived in arrivals[:displays]]
+                (busy if index == 0 and burst else others).extend(latencies)
+            for console in consoles:
+                console.emit('clear_buzzers')
+            time.sleep(0.2 if burst else 0.05)
+    finally:
+        for client in consoles + screens:
+            client.close()
+        stop_server(process)
+    return sorted(busy), sorted(others), leaked, missed
+
+
+def describe(latencies):
+    if not latencies:
+        return f"{'-':>8}    {'-':>8}   "
+    return f"{percentile(latencies, 0.5):8.2f} ms {percentile(latencies, 0.99):8.2f} ms"
+
+
+def main():
+    """Run N matches side by side and report per-match buzz latency and isolation"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer concurrent matches benchmark')
+    parser.add_argument('--matches', type=int, nargs='+', default=list(MATCH_COUNTS),
+                        help='Match counts to run (default: 1 4 8)')
+    parser.add_argument('--displays', type=int, default=4, help='Display screens per match (default: 4)')
+    parser.add_argument('--rounds', type=int, default=20, help='Buzz rounds per run (default: 20)')
+    parser.add_argument('--burst', type=int, default=300,
+                        help='Score updates flooded into the first match before each buzz, 0 to skip (default: 300)')
+    args = parser.parse_args()
+
+    print(f"🚀 Concurrent Matches Benchmark ({args.displays} displays + 1 console per match)")
+    print("=" * 78)
+    print(f"{'matches':>7} {'burst':>6} | {'busy match p50':>14} {'p99':>11} | {'other matches p50':>17} {'p99':>11} | leaked")
+    for count in args.matches:
+        for burst in sorted({0, args.burst}):
+            if burst and count == 1:
+                continue  # No other match to compare with
+            busy, others, leaked, missed = run_matches(count, args.displays, args.rounds, burst)
+            print(f"{count:>7} {burst:>6} | {describe(busy):>26} | {describe(others):>29} | "
+                  f"{leaked}{f' (missed {missed})' if missed else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Role Traffic Benchmark for Quiz Buzzer System
+Connects one client per role (display, console, spectator, scoreboard), plays a
+scripted match from a second console and reports how many bytes/sec each role receives.
+With --legacy REV the same match is also played against web/ as of git revision REV
+(e.g. the commit before role rooms, where every client got every event), for
+before/after numbers.
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import subprocess
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server
+
+ROLES = ('display', 'console', 'spectator', 'scoreboard')
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def scripted_match(console, questions):
+    """Roughly what an operator does per question: timer, buzz, score, cards, port checks"""
+    for question in range(questions):
+        team_id = question % 6 + 1
+        number = question % 5 + 1
+        console.emit('question_set_update', {'setNumber': 1, 'subject': 'biology', 'title': 'Cells', 'subQuestion': number})
+        console.emit('progress_update', {'setNumber': 1, 'questionNumber': number, 'title': 'Cells',
+                                         'subject': 'biology', 'progressPercentage': number * 20})
+        console.emit('start_timer')
+        time.sleep(1.1)  # A timer tick
+        console.emit('simulate_buzzer', {'teamId': team_id})
+        console.emit('pause_timer')
+        console.emit('score_update', {'teamId': team_id, 'score': question + 1, 'adjustment': 1})
+        console.emit('card_update', {'teamId': team_id, 'cardType': 'cross', 'active': question % 2 == 0})
+        console.emit('scoring_correct', {'teamId': team_id})
+        console.emit('get_serial_ports')
+        console.emit('get_arduino_status')
+        console.emit('reset_buzzers')
+        console.emit('navigation_next')
+        time.sleep(0.2)
+
+
+def export_server(revision, directory):
+    """Write web/ as of a git revision into directory; returns the path of its dev_server.py"""
+    archive = subprocess.run(['git', 'archive', revision, 'web'], cwd=REPO_ROOT, check=True, capture_output=True)
+    subprocess.run(['tar', '-x', '-C', directory], input=archive.stdout, check=True)
+    return os.path.join(directory, 'web', 'dev_server.py')
+
+
+def measure(questions, script=None):
+    """Play the scripted match; returns {role: (bytes received, seconds)}"""
+    port = free_port()
+    process, _ = start_server(port, script=script) if script else start_server(port)
+    url = f"http://127.0.0.1:{port}"
+    clients = {role: RawSocketIOClient(url, watch=(), auth={'role': role}) for role in ROLES}
+    operator = RawSocketIOClient(url, watch=(), auth={'role': 'console'})
+    try:
+        for client in (*clients.values(), operator):
+            client.connected.wait(5)
+        time.sleep(0.5)
+        baseline = {role: client.received_bytes for role, client in clients.items()}
+        started = time.perf_counter()
+        scripted_match(operator, questions)
+        time.sleep(0.5)
+        elapsed = time.perf_counter() - started
+        return {role: (client.received_bytes - baseline[role], elapsed) for role, client in clients.items()}
+    finally:
+        for client in (*clients.values(), operator):
+            client.close()
+        stop_server(process)
+
+
+def main():
+    """Play the scripted match and print bytes/sec per role"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer per-role traffic benchmark')
+    parser.add_argument('--questions', type=int, default=10, help='Questions in the scripted match (default: 10)')
+    parser.add_argument('--legacy', metavar='REV',
+                        help='Also play the match against web/ at this git revision (the before numbers)')
+    args = parser.parse_args()
+
+    print("🚀 Role Traffic Benchmark (scripted match)")
+    print("=" * 70)
+    results = {'current': measure(args.questions)}
+    if args.legacy:
+        with tempfile.TemporaryDirectory() as directory:
+            results[args.legacy] = measure(args.questions, export_server(args.legacy, directory))
+
+    for name, result in results.items():
+        print(f"⚙️  {name}")
+        for role, (received, elapsed) in result.items():
+            print(f"📊 {role:<10}: {received:>8} B | {received / elapsed:8.1f} B/s")
+    if args.legacy:
+        for role in ROLES:
+            before, after = results[args.legacy][role][0], results['current'][role][0]
+            print(f"   ⚡ {role:<10}: {after / before:.0%} of the {args.legacy} traffic")
+
+
+if __name__ == '__main__':
+    main()
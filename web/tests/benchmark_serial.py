@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Serial Path Benchmarks for Quiz Buzzer System
+  latency - buzz-to-handler latency and idle CPU of the event and poll readers,
+            against a fake board on a pty
+  framer  - line framing throughput, LineFramer against the old str path, from
+            event-reader-sized reads up to 64 KB
+  parser  - message classification on a corpus of real and corrupted lines, and lines/sec
+  baud    - RESET -> READY round trip at each negotiable baud rate (simulated board,
+            or real hardware with --port)
+  writes  - the batched serial write queue against one write + flush per command
+
+Run all of them with `python benchmark_serial.py`, or one with e.g.
+`python benchmark_serial.py framer`. latency and the simulated baud run need a POSIX pty.
+"""
+
+import os
+import sys
+import time
+import random
+import re
+import logging
+import argparse
+import queue
+import threading
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dev_server  # noqa: E402
+
+logging.getLogger('dev_server').setLevel(logging.WARNING)
+
+
+class RecordingArduinoSerial(dev_server.ArduinoSerial):
+    """ArduinoSerial that records when each message reaches the handler instead of broadcasting it"""
+
+    def __init__(self):
+        super().__init__()
+        self.received = threading.Event()
+        self.received_at = None
+        self.received_message = None
+
+    def _handle_arduino_message(self, message):
+        self.received_at = time.perf_counter()
+        self.received_message = message
+        self.received.set()
+
+
+def open_fake_device():
+    """Open a pty pair; the slave side looks like a serial device to pySerial"""
+    master_fd, slave_fd = os.openpty()
+    return master_fd, slave_fd, os.ttyname(slave_fd)
+
+
+class FakeFirmware:
+    """Answers the ASCII command set of arduino/quiz_buzzer.ino on the master side of a pty.
+
+    A pty has no real baud rate, so the time each command and reply would spend on the
+    wire at the negotiated rate (10 bits per byte) is added explicitly.
+    """
+
+    def __init__(self, master_fd, baudrate=9600):
+        self.master_fd = master_fd
+        self.baudrate = baudrate
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _wire_delay(self, nbytes):
+        time.sleep(nbytes * 10 / self.baudrate)
+
+    def _reply(self, text):
+        data = f"{text}\r\n".encode()
+        self._wire_delay(len(data))
+        os.write(self.master_fd, data)
+
+    def _run(self):
+        buffer = b''
+        while True:
+            try:
+                buffer += os.read(self.master_fd, 256)
+            except OSError:
+                return  # pty closed
+            while b'\n' in buffer:
+                raw, buffer = buffer.split(b'\n', 1)
+                self._wire_delay(len(raw) + 1)
+                self._handle(raw.decode(errors='ignore').strip())
+
+    def _handle(self, command):
+        if command == 'RESET':
+            self._reply('READY')
+        elif command == 'PING':
+            self._reply('PONG')
+        elif command.startswith('BAUD:'):
+            self._reply(command)
+            self.baudrate = int(command[5:])
+
+
+def cpu_seconds():
+    """CPU time consumed by this process (all threads)"""
+    times = os.times()
+    return times.user + times.system
+
+
+def measure_read_mode(read_mode, samples=200):
+    """Measure write-to-handler latency and idle CPU for one read mode"""
+    master_fd, slave_fd, device = open_fake_device()
+    FakeFirmware(master_fd)  # Answers the connect handshake; buzzes below are written to master_fd directly
+    reader = RecordingArduinoSerial()
+
+    try:
+        if not reader.connect(device, 9600, read_mode):
+            print(f"❌ Could not open fake device {device} in {read_mode} mode")
+            return None
+
+        # Idle cost: nothing arrives, the reader should just wait
+        idle_window = 2.0
+        cpu_start = cpu_seconds()
+        time.sleep(idle_window)
+        idle_cpu_ms = (cpu_seconds() - cpu_start) / idle_window * 1000
+
+        latencies = []
+        for i in range(samples):
+            # Random phase so polling cannot get lucky by lining up with the writes
+            time.sleep(random.uniform(0.002, 0.02))
+            reader.received.clear()
+            sent_at = time.perf_counter()
+            os.write(master_fd, f"WINNER:{(i % 6) + 1}\n".encode())
+            if reader.received.wait(timeout=1.0):
+                latencies.append((reader.received_at - sent_at) * 1000)
+
+        return latencies, idle_cpu_ms
+    finally:
+        reader.disconnect()
+        os.close(master_fd)
+        os.close(slave_fd)
+
+
+def report(read_mode, result):
+    """Print latency percentiles for one read mode"""
+    if result is None:
+        return
+    latencies, idle_cpu_ms = result
+    if not latencies:
+        print(f"❌ {read_mode}: no messages received")
+        return
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"📊 {read_mode:>5} reader: p50 {p50:.3f} ms | p99 {p99:.3f} ms | "
+          f"max {latencies[-1]:.3f} ms | idle CPU {idle_cpu_ms:.2f} ms/s | {len(latencies)} samples")
+
+
+def run_latency_benchmark():
+    """Compare the event-driven reader with the legacy polling loop"""
+    if not dev_server.SERIAL_AVAILABLE:
+        print("❌ pySerial not installed. Install with: pip install pyserial")
+        return
+    if not hasattr(os, 'openpty'):
+        print("❌ This benchmark needs a POSIX pty (Linux/macOS)")
+        return
+
+    print("🚀 Serial Reader Latency Benchmark (pty-backed fake device)")
+    print("=" * 70)
+
+    for read_mode in dev_server.SERIAL_READ_MODES:
+        print(f"🧪 Measuring {read_mode} reader...")
+        report(read_mode, measure_read_mode(read_mode))
+
+
+def build_serial_stream(total_bytes, seed=1):
+    """Build a mixed WINNER/TIMING/READY/garbage byte stream like a bursting ESP32"""
+    rng = random.Random(seed)
+    pieces = []
+    size = 0
+    while size < total_bytes:
+        kind = rng.random()
+        if kind < 0.4:
+            piece = f"WINNER:{rng.randint(1, 6)}\r\n".encode()
+        elif kind < 0.8:
+            piece = f"TIMING:T{rng.randint(1, 2)}:{rng.randint(0, 999999)}\r\n".encode()
+        elif kind < 0.9:
+            piece = b"READY\r\n"
+        else:
+            piece = bytes(rng.randint(0, 255) for _ in range(rng.randint(1, 40))) + b"\n"
+        pieces.append(piece)
+        size += len(piece)
+    return b"".join(pieces)
+
+
+def split_into_chunks(stream, max_chunk, seed=2):
+    """Cut a stream into reads of random size, as the OS would deliver them"""
+    rng = random.Random(seed)
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        step = rng.randint(1, max_chunk)
+        chunks.append(stream[pos:pos + step])
+        pos += step
+    return chunks
+
+
+def split_like_event_reader(stream):
+    """Cut a stream the way the event reader reads a board that sends a line at a time: read(1)
+    wakes on the first byte of a USB packet and in_waiting has the rest of the line"""
+    return [line + b'\n' for line in stream.split(b'\n')[:-1]]
+
+
+def legacy_frame(chunks):
+    """The original read path: decode every chunk, append to a str, split one line at a time"""
+    lines = 0
+    buffer = ""
+    for data in chunks:
+        buffer += data.decode('utf-8', errors='ignore')
+        while '\n' in buffer:
+            line, buffer = buffer.split('\n', 1)
+            if line.strip():
+                lines += 1
+    return lines
+
+
+def framer_frame(chunks):
+    """The LineFramer path"""
+    lines = 0
+    framer = dev_server.LineFramer()
+    for data in chunks:
+        lines += len(framer.feed(data))
+    return lines
+
+
+def run_framer_benchmark(megabytes=4, repeat=5):
+    """Feed megabytes of mixed traffic through the old and new line framing (best of repeat runs each)"""
+    print("🚀 Serial Line Framer Benchmark")
+    print("=" * 70)
+
+    stream = build_serial_stream(megabytes * 1024 * 1024)
+    # Event reader sizes first: a whole line per read, or a line split across short reads.
+    # The larger random reads are what a backlog after a stall looks like
+    splits = [('event reads', split_like_event_reader(stream))]
+    splits += [(f"reads ≤{max_chunk} B", split_into_chunks(stream, max_chunk)) for max_chunk in (16, 64, 4096, 65536)]
+    for label, chunks in splits:
+        results = {}
+        for name, frame in (('legacy', legacy_frame), ('framer', framer_frame)):
+            elapsed = float('inf')
+            for _ in range(repeat):  # Best run: a single one swings by ±20% on a busy machine
+                start = time.perf_counter()
+                lines = frame(chunks)
+                elapsed = min(elapsed, time.perf_counter() - start)
+            results[name] = elapsed
+            print(f"📊 {label:>14} | {name:>6}: {elapsed * 1000:8.1f} ms | "
+                  f"{len(stream) / elapsed / 1024 / 1024:7.1f} MB/s | {lines} lines")
+        print(f"   ⚡ speed-up: {results['legacy'] / results['framer']:.1f}x")
+    # Random reads of a few bytes (under one line each) come out at about 0.8-1.0x of the old
+    # inline str code: the method call and the bytes tail per read are what is left, about
+    # 0.1 µs, against a millisecond per byte on the wire at 9600 baud
+    print("ℹ️  Reads of a few bytes can still be up to ~20% slower than the old path (~0.1 µs per read)")
+
+
+# Lines seen from real boards, plus the corruption patterns the parser has to survive.
+# Each entry is (line, expected message type name).
+SERIAL_CORPUS = [
+    ("READY", 'ReadyMessage'),
+    ("RESET", 'ResetMessage'),
+    ("WINNER:1", 'WinnerMessage'),
+    ("WINNER:3", 'WinnerMessage'),
+    ("WINNER:6", 'WinnerMessage'),
+    ("TIMING:T1:123", 'TimingMessage'),
+    ("TIMING:T2:48211", 'TimingMessage'),
+    ("TIMING:T1:0", 'TimingMessage'),
+    # Corrupted or concatenated frames
+    ("WINNER:7", 'CorruptMessage'),
+    ("WINNER:0", 'CorruptMessage'),
+    ("WINNER:x", 'CorruptMessage'),
+    ("WINNER:", 'CorruptMessage'),
+    ("WINNER", 'CorruptMessage'),
+    ("WINNER:2WINNER:3", 'CorruptMessage'),
+    ("WINNER:1:WINNER:2", 'CorruptMessage'),
+    ("TIMING:T3:100", 'CorruptMessage'),
+    ("TIMING:T1:", 'CorruptMessage'),
+    ("TIMING:T1:12a", 'CorruptMessage'),
+    ("TIMING:T1", 'CorruptMessage'),
+    ("TIMING:T1:12:WINNER:1", 'CorruptMessage'),
+    (":READY", 'CorruptMessage'),
+    ("READY:", 'CorruptMessage'),
+    ("\x00\x13WIN", 'CorruptMessage'),
+    ("garbage\x01\x02", 'CorruptMessage'),
+    ("X" * 60, 'CorruptMessage'),
+    # Partial frames the parser recovers from
+    ("xxWINNER:4", 'WinnerMessage'),
+    ("\ufffdWINNER:2", 'WinnerMessage'),
+    ("REAREADY", 'ReadyMessage'),
+    ("READYREADY", 'ReadyMessage'),
+    ("READY:1", 'ReadyMessage'),
+    # Other team spellings int() has always accepted
+    ("WINNER:03", 'WinnerMessage'),
+    ("WINNER:+3", 'WinnerMessage'),
+    # Well-formed but unknown
+    ("BOOT", 'UnknownMessage'),
+    ("ESP32 v1.2", 'UnknownMessage'),
+    ("rst:0x1 (POWERON_RESET)", 'UnknownMessage'),
+]
+
+
+def legacy_parse(message):
+    """The original path: _validate_message followed by _handle_arduino_message's re-parse"""
+    if not message:
+        return None
+    if message.count(':') > 2:
+        return None
+    if message.endswith(':') or message.startswith(':'):
+        return None
+    if message == "READY" or message == "RESET":
+        return message
+    if message.startswith("WINNER:"):
+        parts = message.split(':')
+        if len(parts) == 2:
+            try:
+                team = int(parts[1])
+            except ValueError:
+                return None
+            if 1 <= team <= 6:
+                return ('WINNER', int(message.split(':')[1]))
+        return None
+    if message.startswith("TIMING:"):
+        parts = message.split(':')
+        if len(parts) == 3 and parts[1] in ['T1', 'T2']:
+            try:
+                int(parts[2])
+            except ValueError:
+                return None
+            parts = message.split(':')
+            return ('TIMING', parts[1], parts[2])
+        return None
+    if "WINNER" in message and not message.startswith("WINNER:"):
+        winner_match = re.search(r'WINNER:([1-6])', message)
+        if winner_match:
+            return ('WINNER', int(winner_match.group(1)))
+        return None
+    if "READY" in message and message != "READY":
+        return "READY"
+    if len(message) > 50:
+        return None
+    if not all(ord(c) >= 32 or c in '\r\n\t' for c in message):
+        return None
+    return message
+
+
+def run_parser_benchmark(repeat=20000):
+    """Check the parser against the corpus and compare lines/sec with the legacy path"""
+    print("🚀 Serial Message Parser Benchmark")
+    print("=" * 70)
+
+    mismatches = 0
+    for line, expected in SERIAL_CORPUS:
+        actual = type(dev_server.parse_arduino_message(line)).__name__
+        if actual != expected:
+            mismatches += 1
+            print(f"❌ {line!r}: expected {expected}, got {actual}")
+    if mismatches:
+        print(f"❌ {mismatches}/{len(SERIAL_CORPUS)} corpus lines misclassified")
+    else:
+        print(f"✅ All {len(SERIAL_CORPUS)} corpus lines classified as expected")
+
+    # Real traffic is overwhelmingly well-formed; weight the mix accordingly
+    real_lines = [line for line, expected in SERIAL_CORPUS[:8]]
+    corrupt_lines = [line for line, expected in SERIAL_CORPUS[8:]]
+    workloads = {
+        'clean': real_lines,
+        'mixed': real_lines * 3 + corrupt_lines,
+    }
+    for name, lines in workloads.items():
+        lines = lines * (repeat // len(lines) + 1)
+        for label, parse in (('legacy', legacy_parse), ('parser', dev_server.parse_arduino_message)):
+            start = time.perf_counter()
+            for line in lines:
+                parse(line)
+            elapsed = time.perf_counter() - start
+            print(f"📊 {name:>5} lines | {label:>6}: {len(lines) / elapsed:12,.0f} lines/sec")
+
+
+def measure_reset_round_trip(device, rate, samples):
+    """Negotiate one baud rate and time RESET → READY round trips at it"""
+    reader = RecordingArduinoSerial()
+    max_baudrate = rate if rate > 9600 else None
+    if not reader.connect(device, 9600, 'event', 'ascii', max_baudrate):
+        print(f"❌ Could not connect to {device}")
+        return None
+    try:
+        if reader.baudrate != rate:
+            print(f"⚠️  {rate:>6} baud: firmware settled on {reader.baudrate} baud, skipping")
+            return None
+
+        round_trips = []
+        for _ in range(samples):
+            reader.received.clear()
+            sent_at = time.perf_counter()
+            reader.write('RESET\n')
+            if reader.received.wait(timeout=1.0) and reader.received_message.raw == 'READY':
+                round_trips.append((reader.received_at - sent_at) * 1000)
+            time.sleep(0.01)
+        return round_trips
+    finally:
+        reader.disconnect()
+
+
+def run_baud_benchmark(port=None, samples=50):
+    """Measure RESET → READY round trip at each negotiable baud rate"""
+    if not dev_server.SERIAL_AVAILABLE:
+        print("❌ pySerial not installed. Install with: pip install pyserial")
+        return
+
+    print("🚀 Baud Rate Round-Trip Benchmark")
+    print("=" * 70)
+
+    fake = None
+    if port is None:
+        if not hasattr(os, 'openpty'):
+            print("❌ Pass --port to benchmark real hardware; a simulated device needs a POSIX pty")
+            return
+        master_fd, slave_fd, port = open_fake_device()
+        fake = FakeFirmware(master_fd)
+        print("🧪 No --port given: using a simulated ESP32 with modelled wire time")
+
+    try:
+        for rate in (9600,) + tuple(sorted(dev_server.NEGOTIABLE_BAUD_RATES)):
+            if fake:
+                fake.baudrate = 9600  # A fresh connection starts at the boot rate
+            round_trips = measure_reset_round_trip(port, rate, samples)
+            if round_trips:
+                round_trips.sort()
+                print(f"📊 {rate:>6} baud: RESET→READY p50 {statistics.median(round_trips):7.3f} ms | "
+                      f"max {round_trips[-1]:7.3f} ms | {len(round_trips)}/{samples} answered")
+    finally:
+        if fake:
+            os.close(master_fd)
+            os.close(slave_fd)
+
+
+class WireModelPort:
+    """Stand-in serial port: write() copies into the kernel buffer, flush() waits for the wire at baudrate"""
+
+    def __init__(self, baudrate=9600):
+        self.baudrate = baudrate
+        self.unsent = 0
+        self.write_calls = 0
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.write_calls += 1
+        self.bytes_written += len(data)
+        self.unsent += len(data)
+        return len(data)
+
+    def flush(self):
+        time.sleep(self.unsent * 10 / self.baudrate)
+        self.unsent = 0
+
+
+def console_command_bursts(bursts, seed=3):
+    """Hotkey-style traffic: RESET spam from several handlers plus the odd RETX request"""
+    rng = random.Random(seed)
+    for _ in range(bursts):
+        burst = ['RESET\n'] * rng.randint(1, 4)
+        if rng.random() < 0.3:
+            burst.append(f"RETX:{rng.randrange(256)}\n")
+        yield burst
+
+
+def legacy_write_loop(port, commands, stop):
+    """The original writer: unbounded queue, one write + flush per command"""
+    latencies = []
+    while not stop.is_set() or not commands.empty():
+        try:
+            data, enqueued_at = commands.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        port.write(data.encode('utf-8'))
+        port.flush()
+        latencies.append((time.perf_counter() - enqueued_at) * 1000)
+    return latencies
+
+
+def measure_writer(kind, bursts, burst_gap):
+    port = WireModelPort()
+    latencies = []
+    stop = threading.Event()
+    submitted = 0
+
+    if kind == 'legacy':
+        commands = queue.Queue()
+        worker = threading.Thread(target=lambda: latencies.extend(legacy_write_loop(port, commands, stop)))
+        submit = lambda data: commands.put((data, time.perf_counter()))
+    else:
+        arduino = dev_server.ArduinoSerial()
+        arduino.serial_port = port
+        arduino.is_connected = True
+        commands = arduino.write_queue
+        worker = threading.Thread(target=arduino._write_loop)
+        submit = arduino.write
+
+    worker.start()
+    started = time.perf_counter()
+    for burst in console_command_bursts(bursts):
+        for data in burst:
+            submit(data)
+            submitted += 1
+        time.sleep(burst_gap)
+
+    if kind == 'legacy':
+        stop.set()
+        worker.join()
+    else:
+        while commands.qsize():
+            time.sleep(0.01)
+        time.sleep(0.05)
+        arduino.stop_threads = True
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    if kind == 'legacy':
+        avg_ms, max_ms = statistics.mean(latencies), max(latencies)
+    else:
+        # The production writer keeps aggregate latency stats rather than samples
+        summary = commands.summary()
+        avg_ms, max_ms = summary['avg_latency_ms'], summary['max_latency_ms']
+    return {
+        'submitted': submitted,
+        'write_calls': port.write_calls,
+        'bytes': port.bytes_written,
+        'avg_ms': avg_ms,
+        'max_ms': max_ms,
+        'elapsed': elapsed,
+    }
+
+
+def run_write_benchmark(bursts=200, burst_gap=0.005):
+    """Compare the per-command flushing writer with the coalescing batch writer"""
+    print("🚀 Serial Write Queue Benchmark")
+    print("=" * 70)
+    print(f"🧪 {bursts} bursts of console commands, {burst_gap * 1000:.0f} ms apart, 9600 baud wire model")
+    for kind in ('legacy', 'batched'):
+        result = measure_writer(kind, bursts, burst_gap)
+        print(f"📊 {kind:<8}: {result['submitted']} commands → {result['write_calls']} writes, "
+              f"{result['bytes']} bytes | enqueue→write avg {result['avg_ms']:7.2f} ms, "
+              f"max {result['max_ms']:7.2f} ms | {result['elapsed']:.2f}s")
+
+
+def main():
+    """Run the selected serial benchmarks"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer serial path benchmarks')
+    parser.add_argument('benchmark', nargs='?', default='all', choices=['all', 'latency', 'framer', 'parser', 'baud', 'writes'],
+                        help='Benchmark to run (default: all)')
+    parser.add_argument('--port', help='Real serial device for the baud benchmark (default: simulated device)')
+    args = parser.parse_args()
+
+    if args.benchmark in ('all', 'latency'):
+        run_latency_benchmark()
+    if args.benchmark in ('all', 'framer'):
+        run_framer_benchmark()
+    if args.benchmark in ('all', 'parser'):
+        run_parser_benchmark()
+    if args.benchmark in ('all', 'baud'):
+        run_baud_benchmark(args.port)
+    if args.benchmark in ('all', 'writes'):
+        run_write_benchmark()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Server Runner Benchmark for Quiz Buzzer System
+Compares the Werkzeug dev server with --serve production: time until the port accepts
+connections, and requests/sec for the main page and the Socket.IO handshake over
+concurrent keep-alive connections
+"""
+
+import ssl
+import time
+import argparse
+import threading
+import http.client
+
+from benchmark_fanout import free_port, start_server, stop_server, percentile
+
+SERVE_MODES = ('dev', 'production')
+ENDPOINTS = {
+    'page': '/',
+    'handshake': '/socket.io/?EIO=4&transport=polling',
+}
+
+
+def hammer(port, path, connections, duration, https=False):
+    """Issue GETs on `connections` persistent connections for `duration` seconds"""
+    latencies = []
+    errors = []
+    reconnects = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def new_connection():
+        if https:
+            context = ssl._create_unverified_context()
+            return http.client.HTTPSConnection('127.0.0.1', port, timeout=10, context=context)
+        return http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+
+    def worker():
+        conn = new_connection()
+        local, opened = [], 0
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.will_close:
+                    # No keep-alive: the next request pays for a new TCP (and TLS) connection
+                    conn.close()
+                    conn = new_connection()
+                    opened += 1
+                local.append((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                conn.close()
+                conn = new_connection()
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            reconnects.append(opened)
+
+    threads = [threading.Thread(target=worker) for _ in range(connections)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.50) if latencies else None,
+        'p99': percentile(latencies, 0.99) if latencies else None,
+        'errors': len(errors),
+        'keep_alive': sum(reconnects) == 0,
+    }
+
+
+def main():
+    """Run the server runner comparison"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer server runner benchmark')
+    parser.add_argument('serve', nargs='?', default='all', choices=('all',) + SERVE_MODES,
+                        help='Server runner to benchmark (default: all)')
+    parser.add_argument('--connections', type=int, default=100, help='Concurrent keep-alive connections (default: 100)')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per endpoint (default: 5)')
+    parser.add_argument('--https', action='store_true', help='Benchmark over TLS with the self-signed certificate')
+    args = parser.parse_args()
+
+    print("🚀 Server Runner Benchmark")
+    print("=" * 70)
+    for serve in SERVE_MODES if args.serve == 'all' else (args.serve,):
+        port = free_port()
+        extra = ['--serve', serve] + (['--https'] if args.https else [])
+        try:
+            process, startup = start_server(port, extra)
+        except RuntimeError as e:
+            print(f"❌ {serve}: {e}")
+            continue
+        try:
+            print(f"⚙️  {serve}: accepting connections after {startup:.2f}s")
+            for name, path in ENDPOINTS.items():
+                result = hammer(port, path, args.connections, args.duration, args.https)
+                if result['p50'] is None:
+                    print(f"   {name:<9}: no successful requests ({result['errors']} errors)")
+                    continue
+                print(f"📊 {name:<9}: {result['rps']:8.0f} req/s | p50 {result['p50']:7.2f} ms | "
+                      f"p99 {result['p99']:8.2f} ms | errors {result['errors']} | "
+                      f"keep-alive {'yes' if result['keep_alive'] else 'no'}")
+        finally:
+            stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
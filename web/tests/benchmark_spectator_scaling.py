@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Spectator Scaling Benchmark for Quiz Buzzer System
+Measures a console's buzzer_pressed latency with 0, 50, 100 and 200 SSE spectators
+connected. The default run is multi-process (--workers 2, spectators split across
+owner and worker), so every spectator event also crosses the message queue. The buzz
+path must stay flat: exits non-zero if p50 at the most spectators is more than
+--max-ratio times the p50 with none (plus 2 ms of slack for a quiet machine).
+"""
+
+import sys
+import time
+import argparse
+import threading
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server, percentile
+from benchmark_spectators import SpectatorPool
+from benchmark_workers import port_free, wait_for_port
+
+SPECTATOR_STEPS = (0, 50, 100, 200)
+
+
+def buzz_latencies(console, arrival, pools, rounds):
+    latencies = []
+    for round_number in range(rounds):
+        arrival.clear()
+        for pool in pools:
+            pool.start_round()
+        sent_at = time.perf_counter()
+        console.emit('simulate_buzzer', {'teamId': round_number % 6 + 1})
+        # Spectator streams are read after the console frame: parsing them here would hold
+        # this process's GIL and delay the console reader, not the server
+        if arrival['event'].wait(5):
+            latencies.append((arrival['t'] - sent_at) * 1000)
+        console.emit('clear_buzzers')
+        for pool in pools:
+            pool.poll(time.perf_counter() + 0.05)  # Drain, so spectators don't fall behind
+    return sorted(latencies)
+
+
+class Arrival(dict):
+    """First buzzer_pressed frame time at the console"""
+
+    def __init__(self):
+        super().__init__(event=threading.Event())
+
+    def clear(self):
+        self.pop('t', None)
+        self['event'].clear()
+
+    def on_event(self, client, name, data, received_at):
+        if 't' not in self:
+            self['t'] = received_at
+            self['event'].set()
+
+
+def main():
+    """Check that console buzz latency does not grow with the number of spectators"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer spectator scaling benchmark')
+    parser.add_argument('--spectators', type=int, nargs='+', default=list(SPECTATOR_STEPS),
+                        help='Spectator counts (default: 0 50 100 200)')
+    parser.add_argument('--workers', type=int, default=2, help='Server processes (default: 2)')
+    parser.add_argument('--rounds', type=int, default=30, help='Buzzes per step (default: 30)')
+    parser.add_argument('--max-ratio', type=float, default=2.0,
+                        help='Allowed p50 growth from no spectators to the most (default: 2.0)')
+    args = parser.parse_args()
+
+    port = free_port()
+    while any(not port_free(port + index) for index in range(args.workers)):
+        port = free_port()
+    process, _ = start_server(port, ['--workers', str(args.workers)] if args.workers > 1 else [])
+    for worker_port in range(port + 1, port + args.workers):
+        wait_for_port(worker_port)
+    ports = [port + index for index in range(args.workers)]
+
+    print(f"🚀 Spectator Scaling Benchmark ({args.workers} process(es), {args.rounds} buzzes per step)")
+    print("=" * 70)
+    arrival = Arrival()
+    console = RawSocketIOClient(f"http://127.0.0.1:{port}", auth={'role': 'console'}, on_event=arrival.on_event)
+    pools = [SpectatorPool(spectator_port) for spectator_port in ports]
+    results = []
+    try:
+        console.connected.wait(5)
+        connected = 0
+        for count in sorted(args.spectators):
+            for index in range(connected, count):
+                pools[index % len(pools)].open(1)
+            connected = max(connected, count)
+            deadline = time.perf_counter() + 30
+            while sum(pool.ready() for pool in pools) < connected and time.perf_counter() < deadline:
+                for pool in pools:
+                    pool.poll(time.perf_counter() + 0.05)
+            latencies = buzz_latencies(console, arrival, pools, args.rounds)
+            p50 = percentile(latencies, 0.5) if latencies else float('inf')
+            results.append((connected, p50))
+            print(f"📊 {connected:>4} spectators ({sum(pool.ready() for pool in pools)} streaming): "
+                  f"console buzz p50 {p50:7.2f} ms | p99 "
+                  f"{percentile(latencies, 0.99) if latencies else float('inf'):7.2f} ms")
+    finally:
+        console.close()
+        for pool in pools:
+            pool.close()
+        stop_server(process)
+
+    baseline, worst = results[0][1], results[-1][1]
+    if worst > baseline * args.max_ratio + 2:
+        print(f"❌ Buzz path grows with spectators: p50 {baseline:.2f} ms -> {worst:.2f} ms")
+        sys.exit(1)
+    print(f"✅ Buzz path flat: p50 {baseline:.2f} ms -> {worst:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
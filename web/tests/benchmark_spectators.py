@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Spectator Feed Load Generator for Quiz Buzzer System
+Holds 1000 Server-Sent Events connections to /spectate/events from a single selector
+loop, fires buzzes from a console client and reports how long buzzer_pressed takes to
+reach every spectator - and whether the console's own buzz latency suffers for it
+"""
+
+import time
+import socket
+import argparse
+import selectors
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server, percentile
+
+MARKER = b'event: buzzer_pressed'
+
+
+class SpectatorPool:
+    """Many raw SSE connections read by one selector; counts marker arrivals per connection"""
+
+    def __init__(self, port):
+        self.port = port
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}  # socket -> {'tail': bytes, 'ready': bool, 'arrived': time or None}
+
+    def open(self, count):
+        request = (f"GET /spectate/events HTTP/1.1\r\nHost: 127.0.0.1:{self.port}\r\n"
+                   f"Accept: text/event-stream\r\n\r\n").encode()
+        for _ in range(count):
+            sock = socket.create_connection(('127.0.0.1', self.port))
+            sock.sendall(request)
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ)
+            self.connections[sock] = {'tail': b'', 'ready': False, 'arrived': None}
+
+    def poll(self, until):
+        """Read whatever arrived until the deadline"""
+        while time.perf_counter() < until:
+            for key, _ in self.selector.select(timeout=max(0, until - time.perf_counter())):
+                received_at = time.perf_counter()
+                try:
+                    data = key.fileobj.recv(65536)
+                except BlockingIOError:
+                    continue
+                connection = self.connections[key.fileobj]
+                if not data:
+                    self.selector.unregister(key.fileobj)
+                    continue
+                buffer = connection['tail'] + data
+                if not connection['ready'] and b'event: snapshot' in buffer:
+                    connection['ready'] = True
+                if connection['arrived'] is None and MARKER in buffer:
+                    connection['arrived'] = received_at
+                connection['tail'] = buffer[-len(MARKER):]
+
+    def ready(self):
+        return sum(connection['ready'] for connection in self.connections.values())
+
+    def start_round(self):
+        for connection in self.connections.values():
+            connection['arrived'] = None
+
+    def arrivals(self):
+        return [connection['arrived'] for connection in self.connections.values() if connection['arrived']]
+
+    def close(self):
+        for sock in self.connections:
+            sock.close()
+        self.selector.close()
+
+
+def main():
+    """Run the spectator fan-out load test"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer spectator feed load generator')
+    parser.add_argument('--spectators', type=int, default=1000, help='SSE connections to hold (default: 1000)')
+    parser.add_argument('--rounds', type=int, default=20, help='Buzzes to measure (default: 20)')
+    parser.add_argument('--async-mode', default='threading', choices=('threading', 'eventlet', 'gevent'),
+                        help='Server async mode (default: threading)')
+    args = parser.parse_args()
+
+    print(f"🚀 Spectator Feed Load Test ({args.spectators} SSE connections, {args.async_mode})")
+    print("=" * 70)
+    port = free_port()
+    process, _ = start_server(port, ['--async-mode', args.async_mode])
+    console_latencies, spectator_latencies = [], []
+    console_arrival = {}
+    pool = SpectatorPool(port)
+    console = RawSocketIOClient(f"http://127.0.0.1:{port}", auth={'role': 'console'},
+                                on_event=lambda client, name, data, received_at: console_arrival.setdefault('t', received_at))
+    try:
+        console.connected.wait(5)
+        started = time.perf_counter()
+        pool.open(args.spectators)
+        while pool.ready() < args.spectators and time.perf_counter() - started < 60:
+            pool.poll(time.perf_counter() + 0.1)
+        print(f"👥 {pool.ready()}/{args.spectators} spectators streaming after {time.perf_counter() - started:.1f}s")
+
+        missed = 0
+        for round_number in range(args.rounds):
+            pool.start_round()
+            console_arrival.clear()
+            sent_at = time.perf_counter()
+            console.emit('simulate_buzzer', {'teamId': round_number % 6 + 1})
+            deadline = sent_at + 5
+            while len(pool.arrivals()) < pool.ready() and time.perf_counter() < deadline:
+                pool.poll(min(deadline, time.perf_counter() + 0.05))
+            arrivals = pool.arrivals()
+            missed += pool.ready() - len(arrivals)
+            spectator_latencies.extend((arrived - sent_at) * 1000 for arrived in arrivals)
+            if 't' in console_arrival:
+                console_latencies.append((console_arrival['t'] - sent_at) * 1000)
+            console.emit('clear_buzzers')
+            pool.poll(time.perf_counter() + 0.1)
+
+        spectator_latencies.sort()
+        console_latencies.sort()
+        if spectator_latencies:
+            print(f"📊 spectators: p50 {percentile(spectator_latencies, 0.5):8.2f} ms | "
+                  f"p99 {percentile(spectator_latencies, 0.99):8.2f} ms | "
+                  f"max {spectator_latencies[-1]:8.2f} ms | missed {missed}")
+        if console_latencies:
+            print(f"📊 console:    p50 {percentile(console_latencies, 0.5):8.2f} ms | "
+                  f"p99 {percentile(console_latencies, 0.99):8.2f} ms")
+    finally:
+        console.close()
+        pool.close()
+        stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
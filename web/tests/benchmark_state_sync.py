@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+State Sync Benchmark for Quiz Buzzer System
+Compares how many bytes a reconnecting client downloads with the legacy full
+server_state_response versus the versioned state_sync (deltas since last seen version)
+"""
+
+import json
+import time
+import argparse
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server
+
+MISSED_CHANGES = (1, 10, 100, 1000)
+
+
+class Collector:
+    """Keeps the last payload of each watched event"""
+
+    def __init__(self):
+        self.payloads = {}
+
+    def on_event(self, client, name, data, received_at):
+        self.payloads[name] = data
+
+    def request(self, client, event, data, timeout=5):
+        self.payloads.pop(event, None)
+        client.emit('get_server_state', data)
+        deadline = time.perf_counter() + timeout
+        while event not in self.payloads and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        return self.payloads.get(event)
+
+
+def main():
+    """Measure reconnect payload sizes after a number of missed score changes"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer state sync benchmark')
+    parser.add_argument('--missed', type=int, nargs='+', default=list(MISSED_CHANGES),
+                        help='Missed changes per measurement (default: 1 10 100 1000)')
+    args = parser.parse_args()
+
+    print("🚀 State Sync Benchmark (reconnect payload size)")
+    print("=" * 70)
+    port = free_port()
+    process, _ = start_server(port)
+    url = f"http://127.0.0.1:{port}"
+    collector = Collector()
+    client = RawSocketIOClient(url, watch=('state_sync', 'server_state_response'), on_event=collector.on_event)
+    try:
+        client.connected.wait(5)
+        for missed in sorted(args.missed):
+            synced = collector.request(client, 'state_sync', {'since': 0, 'epoch': None})
+            since, epoch = synced['version'], synced['epoch']
+
+            # Changes made by other clients while this one is "offline"
+            for i in range(missed):
+                client.emit('score_update', {'teamId': i % 6 + 1, 'score': i, 'adjustment': 1})
+            time.sleep(0.2 + missed * 0.002)
+
+            legacy = collector.request(client, 'server_state_response', {})
+            resumed = collector.request(client, 'state_sync', {'since': since, 'epoch': epoch})
+            legacy_bytes = len(json.dumps(legacy))
+            resumed_bytes = len(json.dumps(resumed))
+            kind = 'snapshot' if 'snapshot' in resumed else f"{len(resumed['deltas'])} deltas"
+            print(f"📊 {missed:>5} missed: legacy {legacy_bytes:>7} B | state_sync {resumed_bytes:>7} B ({kind})")
+    finally:
+        client.close()
+        stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
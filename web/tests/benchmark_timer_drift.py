@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Timer Drift Harness for Quiz Buzzer System
+Runs a full-length countdown (default: a 1-hour match) on the deadline-based timer
+engine next to the old loop that slept one second and then decremented the value, under
+a steady load of console commands. Reports how long the first second lasted after a
+mid-second start, how far each displayed second drifted from the wall clock, and how
+late timer_ended fired.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dev_server  # noqa: E402
+
+logging.getLogger('dev_server').setLevel(logging.ERROR)
+
+MATCH_ID = 'drift'
+
+
+class TimerRecorder:
+    """Replaces socketio.emit; timestamps the timer events the displays of one match receive"""
+
+    def __init__(self, match_id):
+        self.room = dev_server.role_room('display', match_id)
+        self.updates = []  # (time, value)
+        self.ended = None
+
+    def __call__(self, event, *args, **kwargs):
+        at = time.perf_counter()
+        if kwargs.get('to') != self.room:
+            return  # The other role rooms get the same events
+        for name, *data in (args[0] if event == dev_server.BATCH_EVENT else [[event, *args]]):
+            if name == 'timer_update':
+                self.updates.append((at, data[0]['value']))
+            elif name == 'timer_ended':
+                self.ended = at
+
+
+class LegacyTimer:
+    """The old engine: a free-running thread that sleeps a second, then decrements the value"""
+
+    def __init__(self, store, seconds):
+        self.store = store
+        self.state = {'value': seconds, 'running': False}
+        self.updates = []
+        self.ended = None
+
+    def run(self):
+        while self.ended is None:
+            time.sleep(1)
+            self.store.submit(self.tick)
+
+    def tick(self, tx):
+        state = self.state
+        if state['running'] and state['value'] > 0:
+            state['value'] -= 1
+            self.updates.append((time.perf_counter(), state['value']))
+            if state['value'] == 0:
+                state['running'] = False
+                self.ended = time.perf_counter()
+
+    def start(self, tx):
+        self.state['running'] = True
+
+
+def generate_load(store, rate, stop):
+    """Console traffic on the same match: rate score updates per second"""
+    index = 0
+    while not stop.is_set():
+        store.submit(dev_server.update_score, index % 6 + 1, index, 1, True, False)
+        index += 1
+        time.sleep(1 / rate)
+
+
+def summarize(name, updates, ended, started, seconds):
+    updates = [(at, value) for at, value in updates if value < seconds]  # Ticks only, not set_timer's echo
+    drifts = [(at - (started + seconds - value)) * 1000 for at, value in updates]
+    first_second = updates[0][0] - started if updates else float('nan')
+    creep = drifts[-1] - drifts[0] if drifts else float('nan')
+    ended_late = (ended - (started + seconds)) * 1000 if ended else float('nan')
+    print(f"📊 {name:<16}: first second {first_second:6.3f} s | drift creep {creep:8.1f} ms | "
+          f"max |drift| {max(map(abs, drifts), default=float('nan')):8.1f} ms | timer_ended {ended_late:+8.1f} ms")
+
+
+def main():
+    """Measure countdown drift of the deadline engine and the old sleep loop"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer countdown drift harness')
+    parser.add_argument('--minutes', type=float, default=60, help='Countdown length (default: 60, a full match)')
+    parser.add_argument('--load', type=float, default=50, help='Score updates per second on the match (default: 50)')
+    args = parser.parse_args()
+    seconds = max(2, round(args.minutes * 60))
+
+    recorder = TimerRecorder(MATCH_ID)
+    dev_server.socketio.emit = recorder
+    dev_server.timer_updates = 'ticks'  # Broadcast every second, so each displayed second can be timed
+    match = dev_server.get_match(MATCH_ID, create=True)
+    legacy = LegacyTimer(match.store, seconds)
+    threading.Thread(target=legacy.run, daemon=True).start()
+
+    stop = threading.Event()
+    if args.load:
+        threading.Thread(target=generate_load, args=(match.store, args.load, stop), daemon=True).start()
+
+    print(f"🚀 Timer Drift Harness ({seconds} s countdown, {args.load:g} commands/s of load)")
+    print("=" * 78)
+    time.sleep(1 + random.random())  # Press start somewhere mid-second, as an operator would
+    match.store.call(dev_server.set_timer, seconds)
+    started = time.perf_counter()
+    match.store.submit(dev_server.run_timer, True, "Timer started")
+    match.store.submit(legacy.start)
+
+    checkpoint = max(1, seconds // 10)
+    next_report = started + checkpoint
+    while (recorder.ended is None or legacy.ended is None) and time.perf_counter() < started + seconds + 60:
+        time.sleep(0.1)
+        if time.perf_counter() < next_report:
+            continue
+        next_report += checkpoint
+        elapsed = time.perf_counter() - started
+        if recorder.updates and legacy.updates and elapsed < seconds:
+            new_at, new_value = recorder.updates[-1]
+            old_at, old_value = legacy.updates[-1]
+            print(f"⏱️  {elapsed:7.0f} s: deadline engine {(new_at - (started + seconds - new_value)) * 1000:+8.1f} ms | "
+                  f"sleep loop {(old_at - (started + seconds - old_value)) * 1000:+8.1f} ms")
+    stop.set()
+
+    print("=" * 78)
+    summarize('deadline engine', recorder.updates, recorder.ended, started, seconds)
+    summarize('sleep(1) loop', legacy.updates, legacy.ended, started, seconds)
+
+
+if __name__ == '__main__':
+    main()
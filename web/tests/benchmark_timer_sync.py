@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Timer Sync Benchmark for Quiz Buzzer System
+Runs a countdown in front of 20 display clients, once with --timer-updates ticks (a
+timer_update broadcast every second) and once with deadline events rendered locally.
+Each client gets its own clock error and measures its offset with time_sync, as the
+pages do. Reports the timer messages and bytes each client receives during the
+countdown and the display skew: how far apart the clients show each new second (a
+packet's arrival for ticks; for deadlines the moment the page's CountdownRenderer
+computes, before browser timer jitter). Score updates keep the server busy meanwhile.
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server, percentile
+
+WATCHED = ('timer_update', 'timer_ended', 'batch', 'state_delta', 'log_update', 'time_sync')
+SYNC_SAMPLES = 5
+
+
+class DisplayClient:
+    """A screen whose clock is off by skew_ms; records when it would show each second"""
+
+    def __init__(self, url, skew_ms):
+        self.skew = skew_ms
+        self.lock = threading.Lock()
+        self.best_rtt = float('inf')
+        self.offset = 0.0  # Estimated server clock minus local clock
+        self.updates = []  # (true arrival ms, payload)
+        self.timer_messages = 0  # timer_update / timer_ended and state deltas of the timer
+        self.timer_bytes = 0
+        self.client = RawSocketIOClient(url, watch=WATCHED, on_event=self.on_event, auth={'role': 'display'})
+
+    def local_now(self):
+        return time.time() * 1000 + self.skew
+
+    def on_event(self, client, name, data, received_at):
+        arrived = time.time() * 1000
+        with self.lock:
+            for event, *args in (data if name == 'batch' else [[name, data]]):
+                if event == 'time_sync':
+                    rtt = arrived + self.skew - args[0]['clientTime']
+                    if rtt < self.best_rtt:
+                        self.best_rtt = rtt
+                        self.offset = args[0]['serverTime'] - (args[0]['clientTime'] + rtt / 2)
+                    continue
+                if event == 'timer_update':
+                    self.updates.append((arrived, args[0]))
+                if event in ('timer_update', 'timer_ended') or (
+                        event == 'state_delta' and any(path[0] == 'timer' for _, path, _ in args[0]['c'])):
+                    self.timer_messages += 1
+                    self.timer_bytes += len(json.dumps([event, *args]))
+
+    def sync(self):
+        for _ in range(SYNC_SAMPLES):
+            self.client.emit('time_sync', {'clientTime': self.local_now()})
+            time.sleep(0.02)
+
+    def shown_at(self, mode, value):
+        """True time (ms) this client starts showing value"""
+        with self.lock:
+            if mode == 'ticks':
+                return next((arrived for arrived, data in self.updates if data['value'] == value), None)
+            deadline = next((data['deadline'] for _, data in self.updates if data.get('deadline')), None)
+        if deadline is None:
+            return None
+        local_time = deadline - value * 1000 - self.offset  # What the page's CountdownRenderer computes
+        return local_time - self.skew
+
+    def take_counts(self):
+        with self.lock:
+            counts = (self.timer_messages, self.timer_bytes)
+            self.timer_messages = self.timer_bytes = 0
+            return counts
+
+
+def measure(mode, clients, seconds, load):
+    port = free_port()
+    process, _ = start_server(port, ['--timer-updates', mode])
+    url = f"http://127.0.0.1:{port}"
+    console = RawSocketIOClient(url, watch=(), auth={'role': 'console'})
+    displays = [DisplayClient(url, random.uniform(-3000, 3000)) for _ in range(clients)]
+    try:
+        console.connected.wait(5)
+        for display in displays:
+            display.client.connected.wait(5)
+            display.client.emit('get_server_state', {'since': 0, 'epoch': None})  # Live state deltas, as the pages get
+            display.sync()
+        console.emit('set_timer', {'value': seconds})
+        time.sleep(0.5)
+        for display in displays:
+            display.take_counts()
+            display.updates.clear()
+
+        console.emit('start_timer')
+        ends_at = time.perf_counter() + seconds + 0.5
+        index = 0
+        while time.perf_counter() < ends_at:
+            if load:
+                console.emit('score_update', {'teamId': index % 6 + 1, 'score': index, 'adjustment': 1})
+                index += 1
+            time.sleep(1 / load if load else 0.1)
+
+        counts = [display.take_counts() for display in displays]
+        messages = sum(count[0] for count in counts) / clients
+        sizes = sum(count[1] for count in counts) / clients
+        deadline = next(data['deadline'] for _, data in displays[0].updates if data.get('deadline'))
+        skews, errors = [], []
+        for value in range(seconds - 1, 0, -1):
+            shown = [display.shown_at(mode, value) for display in displays]
+            shown = [at for at in shown if at is not None]
+            if shown:
+                skews.append(max(shown) - min(shown))
+                errors.extend(abs(at - (deadline - value * 1000)) for at in shown)
+    finally:
+        console.close()
+        for display in displays:
+            display.client.close()
+        stop_server(process)
+    return messages, sizes, sorted(skews), sorted(errors)
+
+
+def main():
+    """Compare per-second timer broadcasts with deadline events"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer timer sync benchmark')
+    parser.add_argument('--clients', type=int, default=20, help='Display clients (default: 20)')
+    parser.add_argument('--seconds', type=int, default=10, help='Countdown length (default: 10)')
+    parser.add_argument('--load', type=float, default=20, help='Score updates per second during the countdown (default: 20)')
+    args = parser.parse_args()
+
+    print(f"🚀 Timer Sync Benchmark ({args.clients} displays, {args.seconds} s countdown, "
+          f"{args.load:g} score updates/s)")
+    print("=" * 78)
+    for mode in ('ticks', 'deadline'):
+        messages, sizes, skews, errors = measure(mode, args.clients, args.seconds, args.load)
+        print(f"⚙️  --timer-updates {mode}")
+        print(f"📊 per client : {messages:6.1f} timer messages | {sizes:6.0f} B during the countdown")
+        if skews:
+            print(f"📊 skew       : p50 {percentile(skews, 0.5):7.2f} ms | max {skews[-1]:7.2f} ms between clients")
+            print(f"📊 vs deadline: p50 {percentile(errors, 0.5):7.2f} ms | max {errors[-1]:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Named Timers Benchmark for Quiz Buzzer System
+Starts many named countdowns at once, spread over several matches: per-question,
+devil-challenge and similar clocks with random lengths. Some are paused or reset part
+way through. Reports how late countdown_ended fires after each deadline, that paused
+countdowns never fire, how many heap entries the scheduler skipped as stale, and that
+the process gains no threads however many countdowns run.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dev_server  # noqa: E402
+
+from benchmark_fanout import percentile  # noqa: E402
+
+logging.getLogger('dev_server').setLevel(logging.ERROR)
+
+
+class EndRecorder:
+    """Replaces socketio.emit; timestamps countdown_ended per (match, countdown)"""
+
+    def __init__(self):
+        self.ended = {}
+
+    def __call__(self, event, *args, **kwargs):
+        at = time.monotonic()
+        room = kwargs.get('to')
+        if not isinstance(room, str) or not room.endswith('/role:display'):
+            return  # The other role rooms get the same events
+        for name, *data in (args[0] if event == dev_server.BATCH_EVENT else [[event, *args]]):
+            if name == 'countdown_ended':
+                self.ended[room.split('/')[0][len('match:'):], data[0]['name']] = at
+
+
+def main():
+    """Run many named countdowns on one scheduler thread and measure when they end"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer named timers benchmark')
+    parser.add_argument('--matches', type=int, default=dev_server.MAX_MATCHES - 1,
+                        help=f'Matches to run (default: {dev_server.MAX_MATCHES - 1})')
+    parser.add_argument('--timers', type=int, default=dev_server.MAX_TIMERS,
+                        help=f'Named countdowns per match (default: {dev_server.MAX_TIMERS})')
+    parser.add_argument('--seconds', type=float, default=10, help='Longest countdown (default: 10)')
+    parser.add_argument('--paused', type=float, default=0.1, help='Share of countdowns paused half way (default: 0.1)')
+    args = parser.parse_args()
+
+    recorder = EndRecorder()
+    dev_server.socketio.emit = recorder
+    matches = [dev_server.get_match(f'bench{index}', create=True) for index in range(args.matches)]
+    threads_before = threading.active_count()
+
+    print(f"🚀 Named Timers Benchmark ({len(matches)} matches x {args.timers} countdowns, up to {args.seconds:g} s)")
+    print("=" * 78)
+    for match in matches:
+        for index in range(args.timers):
+            name = random.choice(('question', 'devil', 'followup', 'bonus')) + str(index)
+            match.store.submit(dev_server.set_countdown, name, round(random.uniform(1, args.seconds), 3), True)
+    for match in matches:
+        match.store.call(dev_server.snapshot_state)  # Every countdown has started
+    threads_running = threading.active_count()
+    deadlines = {(match.id, name): countdown.deadline for match in matches for name, countdown in match.timers.items()}
+
+    time.sleep(args.seconds / 2)
+    pending = sorted(key for key, deadline in deadlines.items() if deadline > time.monotonic() + 0.5)
+    random.shuffle(pending)
+    count = round(len(deadlines) * args.paused)
+    paused, resets = set(pending[:count]), pending[count:count * 2]
+    for match_id, name in paused:
+        dev_server.get_match(match_id).store.submit(dev_server.run_countdown, name, False)
+    for match_id, name in resets:  # Set again mid-run: the old heap entry goes stale
+        dev_server.get_match(match_id).store.submit(dev_server.set_countdown, name, 1, True)
+    for match in matches:
+        match.store.call(dev_server.snapshot_state)
+    for match_id, name in resets:
+        deadlines[match_id, name] = dev_server.get_match(match_id).timers[name].deadline
+    time.sleep(args.seconds / 2 + 1.5)
+
+    expected = {key: deadline for key, deadline in deadlines.items() if key not in paused}
+    lateness = sorted((recorder.ended[key] - deadline) * 1000 for key, deadline in expected.items()
+                      if key in recorder.ended)
+    missed = sum(key not in recorder.ended for key in expected)
+    wrongly_ended = sum(key in recorder.ended for key in paused)
+    stats = dev_server.timer_scheduler.stats
+    print(f"📊 countdown_ended: p50 {percentile(lateness, 0.5):6.2f} ms | p99 {percentile(lateness, 0.99):6.2f} ms | "
+          f"max {lateness[-1]:6.2f} ms late ({len(lateness)}/{len(expected)} ended, {missed} missed)")
+    print(f"📊 paused         : {len(paused)} countdowns, {wrongly_ended} ended anyway")
+    print(f"📊 scheduler      : {stats['scheduled']} scheduled | {stats['ticks']} ticks | {stats['stale']} stale skipped")
+    print(f"📊 threads        : {threads_before} before the countdowns, {threads_running} with "
+          f"{len(deadlines)} running")
+
+
+if __name__ == '__main__':
+    main()
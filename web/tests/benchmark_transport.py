@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Socket.IO Transport Benchmark for Quiz Buzzer System
+Compares the classic long-polling start (handshake, connect and upgrade over HTTP) with
+connecting straight over WebSocket: time until the client is connected, and the server's
+memory and thread count per connected client
+"""
+
+import json
+import time
+import argparse
+import threading
+import http.client
+import statistics
+
+import simple_websocket
+
+from benchmark_fanout import RawSocketIOClient, free_port, start_server, stop_server, percentile
+
+ENGINE_PATH = '/socket.io/?EIO=4&transport='
+POLICIES = ('polling', 'websocket-only')
+
+
+def polling_request(port, method, query, body=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        conn.request(method, ENGINE_PATH + query, body=body)
+        return conn.getresponse().read().decode('utf-8')
+    finally:
+        conn.close()
+
+
+class PollingUpgradeClient:
+    """Connects the way socket.io-client does by default: open over polling, then upgrade"""
+
+    def __init__(self, port):
+        started = time.perf_counter()
+        handshake = polling_request(port, 'GET', 'polling')
+        sid = json.loads(handshake[1:])['sid']
+        polling_request(port, 'POST', f'polling&sid={sid}', body='40')
+        while '40' not in polling_request(port, 'GET', f'polling&sid={sid}'):
+            pass
+        self.connected_after = time.perf_counter() - started
+
+        self.ws = simple_websocket.Client(f"ws://127.0.0.1:{port}{ENGINE_PATH}websocket&sid={sid}")
+        self.ws.send('2probe')
+        while self.ws.receive(timeout=10) != '3probe':
+            pass
+        self.ws.send('5')
+        self.upgraded_after = time.perf_counter() - started
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def _drain(self):
+        try:
+            while True:
+                packet = self.ws.receive()
+                if packet is None:
+                    break
+                if packet == '2':
+                    self.ws.send('3')
+        except Exception:
+            pass
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+class WebSocketClient(RawSocketIOClient):
+    def __init__(self, port):
+        started = time.perf_counter()
+        super().__init__(f"http://127.0.0.1:{port}", watch=())
+        if not self.connected.wait(10):
+            raise RuntimeError("WebSocket connect timed out")
+        self.connected_after = self.upgraded_after = time.perf_counter() - started
+
+
+def server_status(pid):
+    """VmRSS in KiB and thread count of the server process (Linux /proc)"""
+    values = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            values[key] = value.split()
+    return int(values['VmRSS'][0]), int(values['Threads'][0])
+
+
+def measure_policy(policy, samples, clients, async_mode):
+    client_class = PollingUpgradeClient if policy == 'polling' else WebSocketClient
+    port = free_port()
+    process, _ = start_server(port, ['--transport-policy', policy, '--async-mode', async_mode])
+    connected = []
+    try:
+        # Connect latency: one client at a time
+        connect_ms, upgrade_ms = [], []
+        for _ in range(samples):
+            client = client_class(port)
+            connect_ms.append(client.connected_after * 1000)
+            upgrade_ms.append(client.upgraded_after * 1000)
+            client.close()
+        time.sleep(0.5)
+
+        # Memory: hold `clients` connections open at once
+        rss_before, threads_before = server_status(process.pid)
+        lock = threading.Lock()
+
+        def connect_one():
+            client = client_class(port)
+            with lock:
+                connected.append(client)
+
+        while len(connected) < clients:
+            batch = [threading.Thread(target=connect_one) for _ in range(min(25, clients - len(connected)))]
+            for thread in batch:
+                thread.start()
+            for thread in batch:
+                thread.join()
+        time.sleep(1.0)
+        rss_after, threads_after = server_status(process.pid)
+    finally:
+        for client in connected:
+            client.close()
+        stop_server(process)
+
+    connect_ms.sort()
+    upgrade_ms.sort()
+    return {
+        'connect_p50': statistics.median(connect_ms),
+        'connect_p99': percentile(connect_ms, 0.99),
+        'websocket_p50': statistics.median(upgrade_ms),
+        'kib_per_client': (rss_after - rss_before) / clients,
+        'threads_per_client': (threads_after - threads_before) / clients,
+    }
+
+
+def main():
+    """Run the transport comparison"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer Socket.IO transport benchmark')
+    parser.add_argument('--samples', type=int, default=50, help='Sequential connects to time (default: 50)')
+    parser.add_argument('--clients', type=int, default=200, help='Concurrent clients for the memory sample (default: 200)')
+    parser.add_argument('--async-mode', default='threading', help='Server async mode (default: threading)')
+    args = parser.parse_args()
+
+    print(f"🚀 Socket.IO Transport Benchmark ({args.async_mode} server)")
+    print("=" * 70)
+    for policy in POLICIES:
+        result = measure_policy(policy, args.samples, args.clients, args.async_mode)
+        print(f"📊 {policy:<15}: connected p50 {result['connect_p50']:6.2f} ms, p99 {result['connect_p99']:6.2f} ms | "
+              f"on WebSocket p50 {result['websocket_p50']:6.2f} ms")
+        print(f"   {'':<15}  server memory {result['kib_per_client']:6.1f} KiB/client | "
+              f"threads {result['threads_per_client']:.2f}/client")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Worker Scaling Benchmark for Quiz Buzzer System
+Runs dev_server.py with --workers 1, 2, 4, spreads WebSocket clients round-robin over
+the worker ports (what the load balancer would do) and finds how many clients still get
+a buzzer_pressed broadcast within the latency budget. Scaling needs one core per worker.
+For each worker count it also checks an emit that skips one client: a console on every
+port sends admin_reset and must still get its own frame (buzzers_armed) without
+game_state_reset, while a console on another port gets game_state_reset. Exits non-zero
+if that check fails.
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+
+from benchmark_fanout import FanoutProbe, RawSocketIOClient, free_port, percentile, start_server, stop_server
+
+WORKER_COUNTS = (1, 2, 4)
+CLIENT_STEPS = (250, 500, 1000, 2000)
+
+
+def connect_round_robin(urls, count, probe, clients):
+    """Grow the client pool to count, assigning clients to ports in turn"""
+    failures = []
+
+    def connect_one(url):
+        try:
+            client = RawSocketIOClient(url, on_event=probe.on_event)
+            if client.connected.wait(15):
+                clients.append(client)
+            else:
+                failures.append('timeout')
+        except Exception as e:
+            failures.append(str(e))
+
+    while len(clients) < count and len(failures) < count:
+        first = len(clients) + len(failures)
+        threads = [threading.Thread(target=connect_one, args=(urls[(first + i) % len(urls)],))
+                   for i in range(min(count - len(clients), 50))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return failures
+
+
+def port_free(port):
+    with socket.socket() as sock:
+        try:
+            sock.bind(('127.0.0.1', port))
+            return True
+        except OSError:
+            return False
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Worker on port {port} did not start")
+
+
+class EventLog:
+    """Event names a client received, with batches unpacked"""
+
+    def __init__(self):
+        self.names = []
+
+    def on_event(self, client, name, data, received_at):
+        self.names.extend([event for event, *_ in data] if name == 'batch' else [name])
+
+
+def check_reset_initiators(urls):
+    """admin_reset from a console on each port: the initiator gets its frame minus game_state_reset"""
+    watch = ('game_state_reset', 'buzzers_armed', 'batch')
+    failures = []
+    for index, url in enumerate(urls):
+        initiator_log, other_log = EventLog(), EventLog()
+        initiator = RawSocketIOClient(url, watch=watch, on_event=initiator_log.on_event, auth={'role': 'console'})
+        other = RawSocketIOClient(urls[(index + 1) % len(urls)], watch=watch, on_event=other_log.on_event,
+                                  auth={'role': 'console'})
+        try:
+            initiator.connected.wait(10)
+            other.connected.wait(10)
+            time.sleep(0.5)
+            initiator.emit('admin_reset')
+            time.sleep(1)
+        finally:
+            initiator.close()
+            other.close()
+        if 'buzzers_armed' not in initiator_log.names or 'game_state_reset' in initiator_log.names:
+            failures.append(f"initiator on port {url.rsplit(':', 1)[1]} got {initiator_log.names}")
+        if 'game_state_reset' not in other_log.names:
+            failures.append(f"console on port {urls[(index + 1) % len(urls)].rsplit(':', 1)[1]} got {other_log.names}")
+    return failures
+
+
+def measure_workers(workers, steps, rounds, budget_ms, async_mode):
+    port = free_port()
+    while any(not port_free(port + index) for index in range(workers)):
+        port = free_port()
+    process, _ = start_server(port, ['--workers', str(workers), '--async-mode', async_mode])
+    urls = [f"http://127.0.0.1:{port + index}" for index in range(workers)]
+    for worker_port in range(port + 1, port + workers):
+        wait_for_port(worker_port)  # Workers start once the owner is up
+    probe = FanoutProbe()
+    clients = []
+    results = []
+    try:
+        reset_failures = check_reset_initiators(urls)
+        driver = RawSocketIOClient(urls[0], watch=())
+        driver.connected.wait(10)
+        for count in steps:
+            started = time.perf_counter()
+            failures = connect_round_robin(urls, count, probe, clients)
+            connect_s = time.perf_counter() - started
+            time.sleep(1)
+            latencies, missed = [], 0
+            for round_number in range(rounds):
+                probe.start_round(len(clients))
+                sent_at = time.perf_counter()
+                driver.emit('simulate_buzzer', {'teamId': round_number % 6 + 1})
+                if not probe.done.wait(10):
+                    missed += len(clients) - len(probe.arrivals)
+                with probe.lock:
+                    latencies.extend((arrived - sent_at) * 1000 for arrived in probe.arrivals)
+                time.sleep(0.05)
+            latencies.sort()
+            p99 = percentile(latencies, 0.99) if latencies else float('inf')
+            results.append({'clients': len(clients), 'failed': len(failures), 'connect_s': connect_s,
+                            'p50': percentile(latencies, 0.5) if latencies else float('inf'), 'p99': p99,
+                            'missed': missed, 'ok': not failures and not missed and p99 <= budget_ms})
+            if not results[-1]['ok']:
+                break  # Past capacity
+        driver.close()
+    finally:
+        for client in clients:
+            client.close()
+        stop_server(process)
+    return results, reset_failures
+
+
+def main():
+    """Find the connected-client capacity for each worker count"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer worker scaling benchmark')
+    parser.add_argument('--workers', type=int, nargs='+', default=list(WORKER_COUNTS),
+                        help='Worker counts to compare (default: 1 2 4)')
+    parser.add_argument('--clients', type=int, nargs='+', default=list(CLIENT_STEPS),
+                        help='Client steps (default: 250 500 1000 2000)')
+    parser.add_argument('--rounds', type=int, default=10, help='Broadcasts per step (default: 10)')
+    parser.add_argument('--budget-ms', type=float, default=250, help='p99 broadcast latency budget (default: 250)')
+    parser.add_argument('--async-mode', default='threading', choices=('threading', 'eventlet', 'gevent'),
+                        help='Server async mode (default: threading)')
+    args = parser.parse_args()
+
+    print(f"🚀 Worker Scaling Benchmark ({os.cpu_count()} CPU cores, {args.async_mode}, "
+          f"p99 budget {args.budget_ms:g} ms)")
+    print("=" * 70)
+    failed = False
+    for workers in args.workers:
+        results, reset_failures = measure_workers(workers, sorted(args.clients), args.rounds, args.budget_ms,
+                                                  args.async_mode)
+        capacity = max((result['clients'] for result in results if result['ok']), default=0)
+        print(f"⚙️  {workers} worker(s): capacity {capacity} clients")
+        for failure in reset_failures:
+            print(f"❌ admin_reset: {failure}")
+        if not reset_failures:
+            print("✅ admin_reset: every initiating console got its frame without game_state_reset")
+        failed = failed or bool(reset_failures)
+        for result in results:
+            print(f"📊 {result['clients']:>5} clients: connect {result['connect_s']:6.1f}s | "
+                  f"p50 {result['p50']:8.2f} ms | p99 {result['p99']:8.2f} ms | "
+                  f"missed {result['missed']} | connect failures {result['failed']}"
+                  f"{'' if result['ok'] else ' ❌'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
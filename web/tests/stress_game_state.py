@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Game State Concurrency Stress Test for Quiz Buzzer System
+Hammers the single-writer state store from many threads at once - racing buzzes and
+concurrent score updates, while the match clock ticks through short countdowns - and
+checks that exactly one team wins each round, no update is lost, every countdown ends
+once, and versions and emits come out in order. The buzzes and score updates are also
+run against the old unsynchronized dict for comparison.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dev_server  # noqa: E402
+
+logging.getLogger('dev_server').setLevel(logging.ERROR)
+
+
+class EmitRecorder:
+    """Replaces socketio.emit; remembers each event a synced display receives with the store version at the time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.rooms = {dev_server.role_room('display'), dev_server.main_match.sync_room}
+
+    def __call__(self, event, *args, **kwargs):
+        rooms = kwargs.get('to')
+        if not self.rooms.intersection(rooms if isinstance(rooms, (list, tuple)) else (rooms,)):
+            return  # The same events also go to the other role rooms, one frame each
+        version = dev_server.state_store.version
+        with self.lock:
+            for name, *data in (args[0] if event == dev_server.BATCH_EVENT else [[event, *args]]):
+                self.events.append((name, version, data[0] if data else None))
+
+    def count(self, event):
+        with self.lock:
+            return sum(1 for name, _, _ in self.events if name == event)
+
+
+def add_points(tx, team_id, delta):
+    score = tx.state['teams'][team_id]['score']
+    tx.set(('teams', team_id, 'score'), score + delta)
+
+
+def run_in_threads(count, target):
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def stress_buzzes(rounds, threads, recorder):
+    """Every round, all six teams (times threads/6) buzz at once; exactly one may win"""
+    store = dev_server.state_store
+    latencies = []
+    lock = threading.Lock()
+    bad_rounds = 0
+    for _ in range(rounds):
+        store.call(dev_server.arm_buzzers, {'armed': True, 'source': 'stress'})
+        before = recorder.count('buzzer_pressed')
+
+        def buzz(index):
+            started = time.perf_counter()
+            store.call(dev_server.claim_buzz, index % 6 + 1)
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        run_in_threads(threads, buzz)
+        if recorder.count('buzzer_pressed') - before != 1:
+            bad_rounds += 1
+    latencies.sort()
+    return bad_rounds, latencies
+
+
+def legacy_buzzes(rounds, threads):
+    """The old check-then-set on the shared dict, as _on_winner and the handlers did it"""
+    state = {'winner': None}
+    bad_rounds = 0
+    for _ in range(rounds):
+        state['winner'] = None
+        winners = []
+
+        def buzz(index):
+            team = index % 6 + 1
+            if state['winner'] is None:
+                logging.getLogger('dev_server').info(f"🏆 Team {team} wins!")
+                state['winner'] = team
+                winners.append(team)
+
+        run_in_threads(threads, buzz)
+        if len(winners) != 1:
+            bad_rounds += 1
+    return bad_rounds
+
+
+def stress_scores(threads, increments):
+    """Concurrent read-modify-write score updates must all land"""
+    store = dev_server.state_store
+    store.call(dev_server.set_state, ('teams', 1, 'score'), 0)
+    started = time.perf_counter()
+
+    def increment(index):
+        for _ in range(increments):
+            store.submit(add_points, 1, 1)
+
+    run_in_threads(threads, increment)
+    final = store.call(lambda tx: tx.state['teams'][1]['score'])
+    return final, threads * increments / (time.perf_counter() - started)
+
+
+class TimerDriver(threading.Thread):
+    """Keeps the match clock counting down in short runs while the other stress runs
+
+    The scheduler ticks each run and ends it; extra ticks for the running countdown are
+    submitted in between, so tick commands keep racing the buzzes and score updates.
+    """
+
+    def __init__(self, seconds=0.25):
+        super().__init__(daemon=True)
+        self.seconds = seconds
+        self.stop = threading.Event()
+        self.runs = 0
+        self.ticks = 0
+
+    def run(self):
+        store = dev_server.state_store
+        countdown = dev_server.main_match.countdown
+        while not self.stop.is_set():
+            store.call(dev_server.reset_timer, self.seconds)
+            store.call(dev_server.run_timer, True, 'Stress countdown')
+            self.runs += 1
+            token = countdown.token
+            while countdown.running and countdown.token == token:
+                store.submit(dev_server.tick_timer, countdown, token)
+                self.ticks += 1
+                time.sleep(0.002)
+
+    def finish(self):
+        self.stop.set()
+        self.join()
+        time.sleep(self.seconds + 0.2)  # Let the last run end
+
+
+def legacy_scores(threads, increments):
+    teams = {1: {'score': 0}}
+
+    def increment(index):
+        for _ in range(increments):
+            score = teams[1]['score']
+            teams[1]['score'] = score + 1
+
+    run_in_threads(threads, increment)
+    return teams[1]['score']
+
+
+def main():
+    """Run the stress test; exits non-zero if the state store lost or reordered anything"""
+    parser = argparse.ArgumentParser(description='Quiz Buzzer game state concurrency stress test')
+    parser.add_argument('--rounds', type=int, default=200, help='Buzz rounds (default: 200)')
+    parser.add_argument('--threads', type=int, default=24, help='Concurrent threads (default: 24)')
+    parser.add_argument('--increments', type=int, default=2000, help='Score updates per thread (default: 2000)')
+    args = parser.parse_args()
+
+    # Switch threads as often as possible so races that are rare in production show up here
+    sys.setswitchinterval(1e-6)
+
+    recorder = EmitRecorder()
+    dev_server.socketio.emit = recorder
+    versions = []
+    dev_server.state_store.listeners.append(lambda version, changes: versions.append(version))
+
+    print("🚀 Game State Concurrency Stress Test")
+    print("=" * 70)
+    failures = []
+    dev_server.timer_updates = 'ticks'  # The clock also emits timer_update as it counts down
+    timer = TimerDriver()
+    timer.start()
+
+    bad_rounds, latencies = stress_buzzes(args.rounds, args.threads, recorder)
+    legacy_bad = legacy_buzzes(args.rounds, args.threads)
+    print(f"📊 Buzz race    : {bad_rounds}/{args.rounds} rounds without exactly one winner "
+          f"(legacy dict: {legacy_bad}/{args.rounds})")
+    print(f"   claim latency p50 {statistics.median(latencies):.3f} ms | "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.3f} ms")
+    if bad_rounds:
+        failures.append('buzz race')
+
+    expected = args.threads * args.increments
+    final, rate = stress_scores(args.threads, args.increments)
+    legacy_final = legacy_scores(args.threads, args.increments)
+    print(f"📊 Score updates: {final}/{expected} applied at {rate:,.0f} commands/s "
+          f"(legacy dict: {legacy_final}/{expected})")
+    if final != expected:
+        failures.append('lost score updates')
+
+    timer.finish()
+    ended = recorder.count('timer_ended')
+    print(f"📊 Timer ticks  : {timer.runs} countdowns with {timer.ticks} extra ticks, {ended} ended")
+    if ended != timer.runs:
+        failures.append('timer')
+
+    gaps = sum(1 for previous, current in zip(versions, versions[1:]) if current != previous + 1)
+    emit_versions = [version for _, version, _ in recorder.events]
+    reordered = sum(1 for previous, current in zip(emit_versions, emit_versions[1:]) if current < previous)
+    print(f"📊 Ordering     : {len(versions)} versions, {gaps} gaps | {len(emit_versions)} emits, {reordered} out of order")
+    if gaps or reordered:
+        failures.append('ordering')
+
+    print("=" * 70)
+    if failures:
+        print(f"❌ FAILED: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ State store stayed consistent under load")
+
+
+if __name__ == '__main__':
+    main()